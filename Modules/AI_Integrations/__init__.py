@@ -1 +1,6 @@
-# Python package for AI_Integrations
\ No newline at end of file
+# Python package for AI_Integrations
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["guild_messages", "message_content"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
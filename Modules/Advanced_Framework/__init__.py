@@ -1 +1,6 @@
-# Python package for Advanced_Framework
\ No newline at end of file
+# Python package for Advanced_Framework
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["integrations", "webhooks"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
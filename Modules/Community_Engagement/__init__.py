@@ -1 +1,6 @@
-# Python package for Community_Engagement
\ No newline at end of file
+# Python package for Community_Engagement
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["members", "guild_reactions", "invites"]
+MEMBER_CACHE_FLAGS = ["joined"]
+CHUNK_GUILDS_AT_STARTUP = False
@@ -1 +1,6 @@
-# Python package for Customization
\ No newline at end of file
+# Python package for Customization
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["emojis_and_stickers"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
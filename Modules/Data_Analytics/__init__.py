@@ -1 +1,6 @@
-# Python package for Data_Analytics
\ No newline at end of file
+# Python package for Data_Analytics
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["members", "guild_reactions"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
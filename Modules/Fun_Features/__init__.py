@@ -1 +1,6 @@
-# Python package for Fun_Features
\ No newline at end of file
+# Python package for Fun_Features
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["guild_reactions"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
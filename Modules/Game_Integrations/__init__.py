@@ -1 +1,6 @@
-# Python package for Game_Integrations
\ No newline at end of file
+# Python package for Game_Integrations
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["members", "presences"]
+MEMBER_CACHE_FLAGS = ["joined"]
+CHUNK_GUILDS_AT_STARTUP = False
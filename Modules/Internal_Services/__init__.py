@@ -1 +1,6 @@
-# Python package for Internal_Services
\ No newline at end of file
+# Python package for Internal_Services
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = []
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
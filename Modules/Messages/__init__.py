@@ -1 +1,6 @@
-# Python package for Messages
\ No newline at end of file
+# Python package for Messages
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["guild_reactions", "dm_reactions"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
@@ -1 +1,6 @@
-# Python package for Moderation
\ No newline at end of file
+# Python package for Moderation
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["members", "moderation", "auto_moderation_execution"]
+MEMBER_CACHE_FLAGS = ["joined"]
+CHUNK_GUILDS_AT_STARTUP = False
@@ -1 +1,6 @@
-# Python package for Security_Suite
\ No newline at end of file
+# Python package for Security_Suite
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["members", "moderation", "invites", "webhooks"]
+MEMBER_CACHE_FLAGS = ["joined"]
+CHUNK_GUILDS_AT_STARTUP = True
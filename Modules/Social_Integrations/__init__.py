@@ -1 +1,6 @@
-# Python package for Social_Integrations
\ No newline at end of file
+# Python package for Social_Integrations
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["webhooks", "integrations"]
+MEMBER_CACHE_FLAGS = []
+CHUNK_GUILDS_AT_STARTUP = False
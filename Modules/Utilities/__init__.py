@@ -1 +1,6 @@
-# Python package for Utilities
\ No newline at end of file
+# Python package for Utilities
+
+# Gateway data this category needs; see framework/intents.py.
+REQUIRED_INTENTS = ["voice_states"]
+MEMBER_CACHE_FLAGS = ["voice"]
+CHUNK_GUILDS_AT_STARTUP = False
@@ -1 +1 @@
-# This makes ModulesPremium a Python package.
\ No newline at end of file
+# This makes Modules a Python package.
\ No newline at end of file
@@ -6,70 +6,722 @@ from dotenv import load_dotenv
 import logging
 import json
 import random
+import signal
 import sys
+import time
+
+from framework import ExtensionManifest, get_section, load_settings, logpipeline, resolve_path
+from framework.cluster import ClusterContext
+from framework.cache import CacheBudget, adopt_class as adopt_bounded_cache_class, adopt_module as adopt_bounded_cache
+from framework.embed_cache import EmbedCache, adopt_module as adopt_cached_embeds
+from framework.cooldowns import CooldownEngine, adopt_cog as adopt_shared_cooldowns
+from framework.outbound import BACKGROUND, OutboundDispatcher, RateLimitObserver
+from framework.metrics import MetricsRegistry, MetricsServer
+from framework.tracing import tracer
+from framework.components import ComponentRegistry
+from framework.initializer import ComponentInitializer
+from framework.eventbus import EventBus, adopt_module as adopt_event_bus, command_module, connect_components, forward_message
+from framework.config_store import ConfigStore, adopt_module, config_namespace
+from framework.persistence import WriteBehindWriter
+from framework.router import CommandRouter, PrefixCache
+from framework.hot_reload import ReloadPlan, ReloadReport
+from framework.intents import compute_gateway_plan, format_savings_report
+from framework.lazy import LazyExtensionRegistry
+from framework.logpolicy import LogPolicyFilter
+from framework.loader import ParallelExtensionLoader, deactivate_extension
+from framework.snapshot import SnapshotStore, collect_state
+from framework.scheduler import CentralScheduler, adopt_module as adopt_scheduler
+from framework.startup import StartupPipeline
+from framework.watchdog import LAG_BUCKETS, LoopWatchdog
 
 # Load environment variables securely from .env file
 load_dotenv()
 
+# Set by launcher.py when this process is one worker of a shard cluster.
+cluster_context = ClusterContext.from_env()
+
 # --- Logging Configuration ---
 # Ensure logs directory exists
 log_dir = os.path.join(os.path.dirname(__file__), "logs")
 os.makedirs(log_dir, exist_ok=True)
 
+log_file = os.path.join(log_dir, f"bot_main.cluster{cluster_context.cluster_id}.log" if cluster_context else "bot_main.log")
+logging_settings = get_section("logging", {
+    "queue": True,
+    "level": "INFO",
+    "module_level": None,
+    "json_lines": False,
+    "console": True,
+    "batch_size": 256,
+    "flush_interval_seconds": 1.0,
+    "max_bytes": 10485760,
+    "rotate_interval_seconds": 86400,
+    "backup_count": 5,
+    "policy_exempt_level": "WARNING",
+    "policies": {},
+})
+
+# Sampling and rate limits for noisy subsystems, applied before records are queued (queue pipeline only).
+log_policy = LogPolicyFilter(logging_settings["policies"], exempt_level=logging_settings["policy_exempt_level"])
+
 # Main bot logger
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
-                    handlers=[
-                        logging.StreamHandler(sys.stdout), # Log to console
-                        logging.FileHandler(os.path.join(log_dir, "bot_main.log"), encoding='utf-8') # Log to file
-                    ])
+if logging_settings["queue"]:
+    # Handlers run on a listener thread; the event loop only enqueues records.
+    log_pipeline = logpipeline.install(log_file, level=logging_settings["level"],
+                                       json_lines=logging_settings["json_lines"],
+                                       console=logging_settings["console"],
+                                       batch_size=logging_settings["batch_size"],
+                                       flush_interval=logging_settings["flush_interval_seconds"],
+                                       max_bytes=logging_settings["max_bytes"],
+                                       rotate_interval=logging_settings["rotate_interval_seconds"],
+                                       backup_count=logging_settings["backup_count"],
+                                       filters=[log_policy])
+else:
+    log_pipeline = None
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+                        handlers=[
+                            logging.StreamHandler(sys.stdout), # Log to console
+                            logging.FileHandler(log_file, encoding='utf-8') # Log to file
+                        ])
 log = logging.getLogger('bot.main')
-log.info("Bot main process started.")
+log.info(f"Bot main process started{f' as {cluster_context!r}' if cluster_context else ''}.")
+
+# --- Extension Manifest ---
+loader_settings = get_section("extension_loader", {
+    "package": "Modules",
+    "manifest_path": "data/extension_manifest.json",
+    "max_workers": 8,
+    "timing_table_limit": None,
+})
+lazy_settings = get_section("lazy_loading", {
+    "enabled": False,
+    "eager_categories": ["Core"],
+    "idle_unload_seconds": 1800,
+    "sweep_interval_seconds": 60,
+})
+repo_root = os.path.dirname(os.path.abspath(__file__))
+
+def cluster_path(path: str) -> str:
+    """Resolves a settings path; cluster workers each get their own copy of the file."""
+    path = resolve_path(path)
+    return cluster_context.scoped_path(path) if cluster_context else path
+
+extension_manifest = ExtensionManifest(repo_root, loader_settings["package"], resolve_path(loader_settings["manifest_path"]))
+
+def persist_extension_manifest():
+    """Saves the manifest. In a cluster only cluster 0 writes it; the launcher saved it before spawning."""
+    if cluster_context is not None and not cluster_context.owns_shared_files:
+        return
+    try:
+        extension_manifest.save()
+    except OSError as e:
+        # The in-memory manifest is current; the next boot simply rescans.
+        log.error(f"Failed to save the extension manifest to '{extension_manifest.path}': {e}")
+
+startup_settings = get_section("startup", {
+    "core_categories": ["Core", "Moderation", "Utilities"],
+    "optional_categories": None,
+    "enabled_categories": None,
+    "gate_commands": True,
+})
+
+# The event loop is not running yet, so the initial scan can block; it is
+# needed here because gateway intents depend on which extensions exist.
+extension_manifest.load()
+if any(extension_manifest.refresh().values()):
+    persist_extension_manifest()
+routing_settings = get_section("routing", {
+    "namespaces": {},
+    "legacy_prefix_file": "data/guild_prefixes.json",
+    "prefix_sync_interval_seconds": 30,
+})
+command_router = CommandRouter(extension_manifest, routing_settings["namespaces"])
+command_router.build_index()
+enabled_categories = startup_settings["enabled_categories"] or sorted(
+    {entry["category"] for entry in extension_manifest.entries.values() if entry["category"]})
+
+# --- Config Store ---
+config_settings = get_section("config_store", {
+    "path": "data/config_store.sqlite3",
+    "migrate_legacy_files": True,
+    "write_behind_window_seconds": 2.0,
+})
+config_store = ConfigStore(resolve_path(config_settings["path"]))
+config_store.load() # One bulk query, before the event loop starts
+config_writer = WriteBehindWriter(config_store, window=config_settings["write_behind_window_seconds"])
+config_store.attach_writer(config_writer)
+if config_settings["migrate_legacy_files"]:
+    config_store.import_legacy_files(os.path.join(repo_root, "data"), {
+        entry["config_file"]: config_namespace(entry["module"])
+        for entry in extension_manifest.entries.values() if entry.get("config_file")
+    })
+
+# Per-guild prefixes live in the config store, so every cluster worker sees the same overrides.
+prefix_cache = PrefixCache(load_settings().get("global_prefix", "!"), config_store)
+if config_settings["migrate_legacy_files"]:
+    prefix_cache.import_legacy_file(resolve_path(routing_settings["legacy_prefix_file"]))
+prefix_cache.load()
+
+async def sync_guild_prefixes():
+    changed = await prefix_cache.sync()
+    if changed:
+        log.debug(f"Picked up {changed} guild prefix changes from other workers.")
+
+def adopt_config_store(name, lib):
+    """Loader hook: serve the cogs' _load_config/_save_config from the config store."""
+    entry = extension_manifest.get(name)
+    adopt_module(lib, config_store, config_namespace(name), entry.get("config_defaults") if entry else None)
+
+# --- Central Scheduler ---
+scheduler_settings = get_section("scheduler", {
+    "enabled": True,
+    "tick_seconds": 1.0,
+    "max_concurrency": 32,
+    "refresh_min_interval_seconds": 30.0,
+})
+central_scheduler = CentralScheduler(tick_seconds=scheduler_settings["tick_seconds"],
+                                     max_concurrency=scheduler_settings["max_concurrency"],
+                                     refresh_min_interval=scheduler_settings["refresh_min_interval_seconds"])
+
+if cluster_context:
+    # Other workers' !prefix changes; a standalone process is the only writer.
+    central_scheduler.register("framework.router.sync_prefixes", routing_settings["prefix_sync_interval_seconds"],
+                               sync_guild_prefixes)
+
+def adopt_central_scheduler(name, lib):
+    """Loader hook: run the cogs' tasks.loop jobs on the shared timing wheel."""
+    adopt_scheduler(lib, central_scheduler)
+
+# --- Bounded Caches ---
+cache_settings = get_section("cache", {
+    "enabled": True,
+    "total_bytes": 268435456,
+    "category_shares": {},
+    "max_entries": 1024,
+    "ttl_seconds": 3600,
+    "purge_interval_seconds": 300,
+})
+cache_budget = CacheBudget(cache_settings["total_bytes"], enabled_categories, cache_settings["category_shares"],
+                           max_entries=cache_settings["max_entries"], ttl=cache_settings["ttl_seconds"])
+
+def adopt_cache_budget(name, lib):
+    """Loader hook: replace the cogs' unbounded _cache/_local_cache dicts with bounded caches."""
+    adopt_bounded_cache(lib, cache_budget, extension_manifest.category_of(name))
+
+# Prebuilt status/info embeds, shared across guilds.
+embed_cache_settings = get_section("embed_cache", {"enabled": True})
+embed_cache = EmbedCache()
+
+def adopt_embed_cache(name, lib):
+    """Loader hook: serve the cogs' status/info replies from prebuilt embeds."""
+    adopt_cached_embeds(lib, embed_cache)
+
+async def purge_expired_cache_entries():
+    purged = cache_budget.purge_expired()
+    if purged:
+        log.debug(f"Purged {purged} expired cache entries.")
+
+# --- Components ---
+component_settings = get_section("components", {
+    "enabled": True,
+    "max_concurrency": 256,
+    "ready_timeout_seconds": 30.0,
+})
+component_registry = ComponentRegistry(ready_timeout=component_settings["ready_timeout_seconds"])
+component_class_hooks = []
+if cache_settings["enabled"]:
+    component_class_hooks.append(
+        lambda cls, name: adopt_bounded_cache_class(cls, cache_budget, extension_manifest.category_of(name)))
+component_initializer = ComponentInitializer(component_registry, max_concurrency=component_settings["max_concurrency"],
+                                             class_hooks=component_class_hooks)
+
+# --- Event Bus ---
+event_bus_settings = get_section("event_bus", {
+    "enabled": True,
+    "default_maxsize": 1000,
+    "default_policy": "drop_oldest",
+    "component_batch_size": 64,
+})
+event_bus = EventBus(default_maxsize=event_bus_settings["default_maxsize"],
+                     default_policy=event_bus_settings["default_policy"])
+
+# Gateway messages are published once and shared by every subscriber.
+event_bus.topic("gateway.message", discord.Message)
+
+def adopt_cog_event_bus(name, lib):
+    """Loader hook: give the cogs a publish_event() bound to their topic."""
+    adopt_event_bus(lib, event_bus)
+
+async def initialize_components(names=None):
+    """
+    Startup warmer: import the enabled categories' components (or just the
+    modules in `names`) and initialize them concurrently.
+    """
+    if names is None:
+        categories = set(enabled_categories)
+        names = sorted(entry["module"] for entry in extension_manifest.entries.values()
+                       if not entry["is_extension"] and entry["category"] in categories)
+    known = set(component_initializer.components)
+    discovered = await asyncio.get_running_loop().run_in_executor(None, component_initializer.discover, names)
+    log.info(f"Discovered {discovered} components in {len(names)} modules.")
+    added = {key: component for key, component in component_initializer.components.items() if key not in known}
+    for key, component in added.items():
+        restore_warm_state(f"component:{key}", component, "_local_cache")
+    if event_bus_settings["enabled"]:
+        extension_modules = [entry["module"] for entry in extension_manifest.entries.values() if entry["is_extension"]]
+        connected = connect_components(event_bus, added, extension_modules, event_bus_settings["component_batch_size"])
+        log.info(f"Subscribed {connected} components to their cogs' event topics.")
+    report = await component_initializer.initialize_all()
+    log.info(report.format_summary())
+    return report
+
+def drop_components(module_names) -> list:
+    """Forgets the components of `module_names` so they can be imported again. Returns their keys."""
+    removed = component_initializer.forget(module_names)
+    for key in removed:
+        event_bus.unsubscribe_subscriber(key)
+    for module_name in module_names:
+        sys.modules.pop(module_name, None)
+    return removed
+
+# --- Shared Cooldowns ---
+cooldown_settings = get_section("cooldowns", {
+    "enabled": True,
+    "tick_seconds": 1.0,
+    "user_budget": None, # e.g. {"rate": 30, "per": 60}: commands per user across all cogs
+    "guild_budget": None,
+})
+
+def _budget(setting):
+    return (setting["rate"], setting["per"]) if setting else None
+
+cooldown_engine = CooldownEngine(tick=cooldown_settings["tick_seconds"],
+                                 user_budget=_budget(cooldown_settings["user_budget"]),
+                                 guild_budget=_budget(cooldown_settings["guild_budget"]),
+                                 # Without the central scheduler nothing runs the expire job below.
+                                 expire_on_acquire=not scheduler_settings["enabled"])
+
+async def expire_cooldowns():
+    cooldown_engine.expire()
+
+if cooldown_settings["enabled"] and scheduler_settings["enabled"]:
+    central_scheduler.register("framework.cooldowns.expire", cooldown_settings["tick_seconds"], expire_cooldowns)
+
+# --- Loop Watchdog ---
+watchdog_settings = get_section("watchdog", {
+    "enabled": True,
+    "threshold_seconds": 0.25,
+    "interval_seconds": 0.1,
+    "history": 100,
+})
+loop_watchdog = LoopWatchdog(threshold=watchdog_settings["threshold_seconds"],
+                             interval=watchdog_settings["interval_seconds"],
+                             history=watchdog_settings["history"])
+
+# --- Warm-Restart Snapshot ---
+snapshot_settings = get_section("snapshot", {
+    "enabled": True,
+    "path": "data/warm_snapshot.bin",
+    "max_age_seconds": 900,
+})
+# Per cluster: every worker is stopped at once on a rolling deploy and restores only its own guilds' state.
+warm_snapshot = SnapshotStore(cluster_path(snapshot_settings["path"]), max_age=snapshot_settings["max_age_seconds"])
+if snapshot_settings["enabled"]:
+    warm_snapshot.load() # Entries are restored one by one as cogs and components are created
+
+def capture_warm_state() -> dict:
+    """Snapshot entries for every loaded cog's _cache and component's _local_cache."""
+    cogs = {f"cog:{type(cog).__module__}": cog for cog in bot.cogs.values()}
+    components = {f"component:{key}": component for key, component in component_initializer.components.items()}
+    return {**collect_state(cogs, "_cache", extension_manifest),
+            **collect_state(components, "_local_cache", extension_manifest)}
+
+def restore_warm_state(key: str, obj, attribute: str):
+    entry = extension_manifest.get(type(obj).__module__)
+    if entry is not None and len(warm_snapshot):
+        warm_snapshot.restore_into(getattr(obj, attribute, None), key, entry["hash"])
+
+def save_warm_snapshot():
+    if not snapshot_settings["enabled"]:
+        return
+    try:
+        warm_snapshot.save(capture_warm_state())
+    except Exception as e:
+        log.error(f"Failed to save warm-restart snapshot: {type(e).__name__}: {e}", exc_info=True)
+
+# --- Loader Hooks ---
+def adopt_module_logging(name, lib):
+    """Loader hook: drop the per-module StreamHandler so records go through the log queue."""
+    logpipeline.adopt_module(lib, logging_settings["module_level"])
+
+module_hooks = [adopt_config_store]
+if event_bus_settings["enabled"]:
+    module_hooks.append(adopt_cog_event_bus)
+if cache_settings["enabled"]:
+    module_hooks.append(adopt_cache_budget)
+    central_scheduler.register("framework.cache.purge_expired", cache_settings["purge_interval_seconds"],
+                               purge_expired_cache_entries)
+if embed_cache_settings["enabled"]:
+    module_hooks.append(adopt_embed_cache)
+if log_pipeline is not None:
+    module_hooks.append(adopt_module_logging)
+if scheduler_settings["enabled"]:
+    module_hooks.append(adopt_central_scheduler)
 
 # --- Bot Intents ---
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.presences = True
-intents.guilds = True
-intents.reactions = True
-intents.voice_states = True
-intents.emojis_and_stickers = True
-intents.integrations = True
-intents.webhooks = True # For webhook management
-intents.invites = True # For invite tracking
-intents.moderation = True # For moderation events
+gateway_settings = get_section("gateway", {
+    "compute_minimal_intents": True,
+    "report_guilds": 1000,
+    "report_average_members": 1000,
+})
+if gateway_settings["compute_minimal_intents"]:
+    # Only request the gateway data the enabled categories declared they need.
+    gateway_plan = compute_gateway_plan(repo_root, loader_settings["package"], enabled_categories, extension_manifest)
+    intents, member_cache_flags, chunk_guilds_at_startup = gateway_plan.to_discord()
+    log.info("Computed gateway requirements:\n" + format_savings_report(
+        gateway_plan, gateway_settings["report_average_members"], gateway_settings["report_guilds"]))
+else:
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    intents.presences = True
+    intents.guilds = True
+    intents.reactions = True
+    intents.voice_states = True
+    intents.emojis_and_stickers = True
+    intents.integrations = True
+    intents.webhooks = True # For webhook management
+    intents.invites = True # For invite tracking
+    intents.moderation = True # For moderation events
+    member_cache_flags = discord.MemberCacheFlags.from_intents(intents)
+    chunk_guilds_at_startup = True
+
+# --- Outbound Messages ---
+outbound_settings = get_section("outbound", {
+    "enabled": True,
+    "channel_rate": 5,
+    "channel_per_seconds": 5.0,
+    "global_rate": 50,
+    "coalesce_window_seconds": 0.5,
+    "prune_interval_seconds": 60,
+})
+outbound_dispatcher = OutboundDispatcher(rate=outbound_settings["channel_rate"], per=outbound_settings["channel_per_seconds"],
+                                         global_rate=outbound_settings["global_rate"],
+                                         coalesce_window=outbound_settings["coalesce_window_seconds"])
+# discord.py logs every 429 it retries; count them and pause the affected channel.
+logging.getLogger("discord.http").addFilter(RateLimitObserver(outbound_dispatcher))
+
+async def prune_outbound_queues():
+    outbound_dispatcher.prune()
+
+if outbound_settings["enabled"]:
+    central_scheduler.register("framework.outbound.prune", outbound_settings["prune_interval_seconds"],
+                               prune_outbound_queues)
+
+class QueuedContext(commands.Context):
+    """Context whose replies go through the outbound dispatcher as interactive messages."""
+    async def send(self, content=None, **kwargs):
+        if self.interaction is not None:
+            # Interaction responses have their own deadline and are not channel messages.
+            return await super().send(content, **kwargs)
+        with tracer.span("outbound.send"):
+            return await outbound_dispatcher.submit(self.channel.id, super().send, content, **kwargs)
+
+# --- Metrics ---
+metrics_settings = get_section("metrics", {
+    "enabled": True,
+    "host": "127.0.0.1",
+    "port": 9108,
+})
+metrics = MetricsRegistry("vynobot")
+command_latency = metrics.histogram("command_latency_seconds", "Command invocation time, including checks.",
+                                    ("category", "command"))
+command_errors = metrics.counter("command_errors_total", "Command invocations that raised.", ("category", "command", "error"))
+periodic_task_seconds = metrics.histogram("periodic_task_seconds", "Run time of scheduled periodic jobs.", ("category", "task"))
+event_loop_lag = metrics.histogram("event_loop_lag_seconds", "Delay of the watchdog beat.", buckets=LAG_BUCKETS)
+metrics_port = metrics_settings["port"]
+if cluster_context and metrics_port:
+    # Cluster N serves on port + N, like the IPC ports, so every worker can be scraped.
+    metrics_port += cluster_context.cluster_id
+metrics_server = MetricsServer(metrics, metrics_settings["host"], metrics_port)
+
+def command_category(command) -> str:
+    """Module category a command belongs to; lazy stubs count toward the module they load."""
+    module = getattr(command, "extras", {}).get("lazy_module") or command.module
+    return extension_manifest.category_of(module) or "bot"
+
+def observe_periodic_task(job, seconds):
+    task = job.name.rsplit(".", 1)[-1]
+    periodic_task_seconds.labels(extension_manifest.category_of(job.name) or "bot", task).observe(seconds)
+
+cache_lookups = metrics.counter("cache_lookups_total", "Bounded cache lookups.", ("category", "result"))
+cache_bytes = metrics.gauge("cache_bytes", "Bytes held by bounded caches.", ("category",))
+cache_evictions = metrics.counter("cache_evictions_total", "Entries evicted for the byte budget.", ("category",))
+embed_cache_replies = metrics.counter("embed_cache_replies_total", "Status/info replies.", ("result",))
+bus_events = metrics.counter("event_bus_events_total", "Event bus payloads.", ("outcome",))
+outbound_queued = metrics.gauge("outbound_queued_messages", "Messages waiting in outbound channel queues.")
+outbound_messages = metrics.counter("outbound_messages_total", "Outbound messages.", ("outcome",))
+rate_limited = metrics.counter("rate_limited_total", "429 responses reported by discord.py.", ("route",))
+cooldown_windows = metrics.gauge("cooldown_windows", "Open cooldown windows.")
+cooldown_bytes = metrics.gauge("cooldown_bytes", "Approximate memory of the cooldown engine.")
+cooldown_rejections = metrics.counter("cooldown_rejections_total", "Uses refused by cooldowns and budgets.")
+scheduled_jobs = metrics.gauge("scheduled_jobs", "Registered periodic jobs.")
+config_write_queue = metrics.gauge("config_write_queue_depth", "Config saves waiting for the write-behind writer.")
+log_records_dropped = metrics.counter("log_records_dropped_total", "Log records dropped by the logging policies.", ("reason",))
+
+def collect_service_metrics():
+    """Scrape-time copy of the counters the services already keep."""
+    for category, stats in cache_budget.stats().items():
+        cache_lookups.labels(category, "hit").set(stats["hits"])
+        cache_lookups.labels(category, "miss").set(stats["misses"])
+        cache_bytes.labels(category).set(stats["used_bytes"])
+        cache_evictions.labels(category).set(stats["evictions"])
+    embed_cache_replies.labels("hit").set(embed_cache.hits)
+    embed_cache_replies.labels("build").set(embed_cache.builds)
+    bus_stats = event_bus.stats().values()
+    for outcome in ("published", "delivered", "dropped", "errors"):
+        bus_events.labels(outcome).set(sum(stats[outcome] for stats in bus_stats))
+    outbound_queued.labels().set(outbound_dispatcher.depth)
+    outbound_messages.labels("sent").set(outbound_dispatcher.sent)
+    outbound_messages.labels("merged").set(outbound_dispatcher.merged)
+    for route, count in outbound_dispatcher.rate_limits.items():
+        rate_limited.labels(route).set(count)
+    cooldown_windows.labels().set(len(cooldown_engine))
+    cooldown_bytes.labels().set(cooldown_engine.memory_bytes())
+    cooldown_rejections.labels().set(cooldown_engine.rejected)
+    scheduled_jobs.labels().set(len(central_scheduler.jobs))
+    config_write_queue.labels().set(config_writer.queue_depth)
+    log_stats = log_policy.stats()
+    log_records_dropped.labels("sampled_out").set(log_stats["sampled_out"])
+    log_records_dropped.labels("rate_limited").set(log_stats["rate_limited"])
+
+if metrics_settings["enabled"]:
+    central_scheduler.run_observers.append(observe_periodic_task)
+    loop_watchdog.lag_observers.append(event_loop_lag.labels().observe)
+    metrics.add_collector(collect_service_metrics)
+
+# --- Tracing ---
+tracing_settings = get_section("tracing", {
+    "enabled": True,
+    "sample_rate": 0.01,
+    "slow_threshold_seconds": 1.0,
+    "capacity": 256,
+    "export_path": "data/traces.json",
+})
+tracer.configure(enabled=tracing_settings["enabled"], sample_rate=tracing_settings["sample_rate"],
+                 slow_threshold=tracing_settings["slow_threshold_seconds"], capacity=tracing_settings["capacity"])
 
 # --- Bot Initialization ---
-bot = commands.Bot(command_prefix="!", intents=intents, help_command=None) # Custom help command assumed
+# Cluster workers shard automatically over their assigned contiguous shard range.
+class VynoBot(commands.AutoShardedBot if cluster_context else commands.Bot):
+    """Bot whose extensions are loaded by the staged startup pipeline."""
+    async def setup_hook(self):
+        await run_startup_pipeline()
+
+    async def close(self):
+        # Snapshot while the cogs and components still hold their state.
+        save_warm_snapshot()
+        central_scheduler.stop()
+        event_bus.close()
+        loop_watchdog.stop()
+        metrics_server.stop()
+        # Persist coalesced config saves before the loop goes away.
+        await config_writer.close()
+        await super().close()
+
+    async def get_context(self, origin, *, cls=None):
+        if cls is None and outbound_settings["enabled"]:
+            cls = QueuedContext
+        return await super().get_context(origin, cls=cls or commands.Context)
+
+    async def announce(self, channel, content=None, **kwargs):
+        """Sends a background message; queued behind interactive replies on the same channel."""
+        if not outbound_settings["enabled"]:
+            return await channel.send(content, **kwargs)
+        return await outbound_dispatcher.submit(channel.id, channel.send, content, priority=BACKGROUND, **kwargs)
+
+    async def process_commands(self, message):
+        if message.author.bot:
+            return
+        with tracer.trace("gateway.message", guild=message.guild.id if message.guild else None):
+            with tracer.span("prefix.parse"):
+                ctx = await self.get_context(message)
+            if ctx.command is None:
+                tracer.drop() # Not a command; nothing worth keeping, and later spans become no-ops.
+            elif event_bus_settings["enabled"]:
+                # The components of the cog that owns the command consume the message.
+                forward_message(event_bus, command_module(ctx.command), message)
+            name = ctx.command.qualified_name if ctx.command else None
+            with tracer.span(f"command {name}", cog=type(ctx.cog).__name__ if ctx.cog else None):
+                await self.invoke(ctx)
+
+    async def invoke(self, ctx):
+        if ctx.command is not None and startup_settings["gate_commands"] and not startup_pipeline.command_ready(ctx):
+            # Answered here instead of failing a check, which the cogs' error handlers would report as unexpected.
+            await ctx.send("This feature is still starting up. Please try again in a moment.")
+            log.info(f"Command {ctx.command.name} rejected for {ctx.author}: category {startup_pipeline.command_category(ctx)} not ready.")
+            return
+        if ctx.command is None or not metrics_settings["enabled"]:
+            return await super().invoke(ctx)
+        started = time.perf_counter()
+        try:
+            await super().invoke(ctx)
+        finally:
+            command_latency.labels(command_category(ctx.command), ctx.command.qualified_name).observe(time.perf_counter() - started)
+
+    async def add_cog(self, cog, **kwargs):
+        # Resolve name/alias conflicts before discord.py rejects the cog.
+        command_router.prepare_cog(self, cog)
+        if cooldown_settings["enabled"]:
+            # After routing, so the shared limits are keyed by the final command names.
+            adopt_shared_cooldowns(cog, cooldown_engine)
+        restore_warm_state(f"cog:{type(cog).__module__}", cog, "_cache")
+        await super().add_cog(cog, **kwargs)
+
+shard_kwargs = {"shard_ids": cluster_context.shard_ids, "shard_count": cluster_context.shard_count} if cluster_context else {}
+bot = VynoBot(command_prefix=prefix_cache, intents=intents, member_cache_flags=member_cache_flags,
+              chunk_guilds_at_startup=chunk_guilds_at_startup, help_command=None, **shard_kwargs) # Custom help command assumed
+
+# --- Extension Loading ---
+extension_loader = ParallelExtensionLoader(bot, extension_manifest, max_workers=loader_settings["max_workers"],
+                                           module_hooks=module_hooks)
+lazy_registry = None
+
+async def refresh_extension_manifest() -> dict:
+    """Rescans the module tree (stat-only for unchanged files) and persists the manifest."""
+    loop = asyncio.get_running_loop()
+    def _refresh():
+        if not extension_manifest.entries:
+            extension_manifest.load()
+        changes = extension_manifest.refresh()
+        if any(changes.values()):
+            persist_extension_manifest()
+        return changes
+    return await loop.run_in_executor(None, _refresh)
+
+async def load_extensions(categories=None, names=None):
+    """Loads (or stubs, in lazy mode) every manifest extension in `categories`, or just `names`."""
+    global lazy_registry
+    if names is None:
+        names = extension_manifest.extensions(categories)
+    if lazy_settings["enabled"]:
+        # Only eager categories are imported now; everything else gets command stubs.
+        if lazy_registry is None:
+            lazy_registry = LazyExtensionRegistry(bot, extension_manifest, extension_loader,
+                                                  idle_unload_seconds=lazy_settings["idle_unload_seconds"],
+                                                  sweep_interval=lazy_settings["sweep_interval_seconds"],
+                                                  router=command_router)
+        eager_categories = set(lazy_settings["eager_categories"])
+        lazy_registry.register([name for name in names if extension_manifest.category_of(name) not in eager_categories])
+        names = [name for name in names if extension_manifest.category_of(name) in eager_categories]
+    report = await extension_loader.load(names)
+    log.info("Extension load timings:\n" + report.format_table(loader_settings["timing_table_limit"]))
+    log.info(f"Cog loading complete for {', '.join(sorted(categories)) if categories else 'all categories'}. Loaded: {report.loaded}, Failed: {report.failed}.")
+    log.info(command_router.format_report(limit=5))
+    return report
+
+async def prepare_extension_manifest() -> bool:
+    """Refreshes the manifest. Returns False when the module tree is missing."""
+    package_path = os.path.join(repo_root, loader_settings["package"])
+    if not os.path.exists(package_path):
+        log.critical(f"{loader_settings['package']} directory not found at: {package_path}. Cogs cannot be loaded.")
+        return False
+    changes = await refresh_extension_manifest()
+    log.info(f"Extension manifest refreshed. Added: {len(changes['added'])}, Changed: {len(changes['changed'])}, Removed: {len(changes['removed'])}.")
+    if any(changes.values()):
+        command_router.build_index()
+    return True
+
+async def reload_changed_modules() -> ReloadReport:
+    """
+    Reloads only the extensions and component modules whose source hash
+    changed since the last manifest refresh. Untouched cogs keep running,
+    with their caches intact.
+    """
+    report = ReloadReport()
+    changes = await refresh_extension_manifest()
+    plan = ReloadPlan.from_changes(extension_manifest, changes, bot.extensions, set(enabled_categories),
+                                   stubbed=lazy_registry.stubbed if lazy_registry is not None else ())
+    log.info(f"Incremental reload plan: {plan.describe()}.")
+    if not plan:
+        return report
+    command_router.build_index()
+
+    unload_times = {}
+    for name in plan.unload + plan.reload:
+        started = time.perf_counter()
+        try:
+            await deactivate_extension(bot, name) # Also stops the extension's scheduled jobs
+        except Exception as e:
+            report.record(name, "unload", time.perf_counter() - started, f"UNLOAD FAILED: {type(e).__name__}")
+            log.error(f"Failed to unload {name}. Error: {type(e).__name__}: {e}")
+            continue
+        if name in plan.unload:
+            report.record(name, "unload", time.perf_counter() - started)
+        else:
+            unload_times[name] = time.perf_counter() - started
+    if lazy_registry is not None:
+        lazy_registry.refresh(plan.restub)
+
+    if unload_times or plan.load:
+        load_report = await load_extensions(names=list(unload_times) + plan.load)
+        for module, import_s, setup_s, status in load_report.rows:
+            action = "reload" if module in unload_times else "load"
+            report.record(module, action, unload_times.get(module, 0.0) + import_s + setup_s, status)
+
+    if component_settings["enabled"]:
+        drop_components(plan.dropped_components)
+        for module in plan.components:
+            started = time.perf_counter()
+            dropped = drop_components([module])
+            init_report = await initialize_components([module])
+            failed = [key for key in init_report.failed if key.rsplit(".", 1)[0] == module]
+            report.record(module, "component", time.perf_counter() - started,
+                          f"FAILED: {len(failed)} components" if failed else "OK")
+            log.debug(f"Reloaded component module {module} ({len(dropped)} components replaced).")
+
+    report.elapsed = time.perf_counter() - report.started
+    return report
 
 async def load_all_cogs_recursive():
-    """Recursively loads all cogs from the ModulesPremium directory."""
-    modules_premium_path = os.path.join(os.path.dirname(__file__), "ModulesPremium")
-    if not os.path.exists(modules_premium_path):
-        log.critical(f"ModulesPremium directory not found at: {modules_premium_path}. Cogs cannot be loaded.")
-        return
+    """Loads every extension listed in the manifest using the parallel loader."""
+    log.info("Starting manifest-driven cog loading process...")
+    if await prepare_extension_manifest():
+        await load_extensions(set(enabled_categories))
+
+# --- Staged Startup ---
+startup_pipeline = StartupPipeline(bot, extension_manifest, load_extensions,
+                                   core_categories=startup_settings["core_categories"],
+                                   optional_categories=startup_settings["optional_categories"],
+                                   enabled_categories=enabled_categories)
+if component_settings["enabled"]:
+    startup_pipeline.add_warmer(initialize_components)
 
-    loaded_count = 0
-    failed_count = 0
-    log.info("Starting recursive cog loading process...")
-    for root, dirs, files in os.walk(modules_premium_path):
-        # Filter out __pycache__ directories to prevent issues
-        dirs[:] = [d for d in dirs if d != '__pycache__']
-        for file in files:
-            if file.endswith(".py") and not file.startswith("__"):
-                relative_path = os.path.relpath(os.path.join(root, file), os.path.dirname(__file__))
-                module_name = relative_path.replace(os.sep, ".")[:-3] # Convert to Python import path
-                try:
-                    await bot.load_extension(module_name)
-                    log.info(f"Successfully loaded: {module_name}")
-                    loaded_count += 1
-                except commands.ExtensionAlreadyLoaded:
-                    log.debug(f"Extension already loaded, skipping: {module_name}")
-                except Exception as e:
-                    log.error(f"Failed to load {module_name}. Error: {type(e).__name__}: {e}")
-                    failed_count += 1
-    log.info(f"Cog loading complete. Loaded: {loaded_count}, Failed: {failed_count}.")
+async def run_startup_pipeline():
+    """Runs once per process before the gateway connects; reconnects never re-enter it."""
+    log.info("Starting staged startup pipeline...")
+    if watchdog_settings["enabled"]:
+        # Started first so stalls during extension loading are caught too.
+        loop_watchdog.start(asyncio.get_running_loop())
+    try:
+        # Rolling deploys stop workers with SIGTERM; close() saves the snapshot.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(bot.close()))
+    except (NotImplementedError, RuntimeError):
+        log.debug("SIGTERM handler not supported on this platform.")
+    if cluster_context:
+        # Imported only here: standalone processes never need the IPC dependencies.
+        from framework.cluster_ipc import ClusterIPCCog
+        await bot.add_cog(ClusterIPCCog(bot, cluster_context, secret_key=os.getenv("VYNO_IPC_SECRET")))
+    if scheduler_settings["enabled"]:
+        central_scheduler.start(wait_until=bot.wait_until_ready)
+    if metrics_settings["enabled"]:
+        try:
+            await metrics_server.start()
+        except OSError as e:
+            log.error(f"Could not start the metrics endpoint on {metrics_settings['host']}:{metrics_port}: {e}")
+    if await prepare_extension_manifest():
+        await startup_pipeline.start()
 
 # --- Bot Events ---
 @bot.event
@@ -80,21 +732,31 @@ async def on_ready():
     log.info(f'Discord.py version: {discord.__version__}')
     log.info(f'Python version: {sys.version.split(" ")[0]}')
     log.info('------')
-    await load_all_cogs_recursive()
-    log.info('------')
-    log.info('All cog loading attempts finalized.')
-    log.info('Bot is now fully operational and serving commands across guilds.')
+    # Extensions are loaded by setup_hook; on_ready fires again after every
+    # reconnect and must stay cheap.
+    if startup_pipeline.fully_loaded.is_set():
+        log.info('Bot is now fully operational and serving commands across guilds.')
+    else:
+        log.info('Bot is connected; optional module categories are still loading in the background.')
     # Set a default bot presence
     await bot.change_presence(activity=discord.Game(name="Managing your server"))
 
+@bot.listen("on_message")
+async def publish_gateway_message(message):
+    """Fans incoming messages out to the subscribers of the gateway.message topic."""
+    if event_bus.has_subscribers("gateway.message"):
+        event_bus.publish_nowait("gateway.message", message)
+
 @bot.event
 async def on_command_error(ctx, error):
     """Global error handler for commands."""
+    if ctx.command is not None and metrics_settings["enabled"]:
+        command_errors.labels(command_category(ctx.command), ctx.command.qualified_name, type(error).__name__).inc()
     if isinstance(error, commands.CommandNotFound):
         # await ctx.send("Sorry, that command doesn't exist. Use `!help` for a list of commands.")
         log.debug(f"Command not found: '{ctx.message.content}' by {ctx.author} (ID: {ctx.author.id}) in guild '{ctx.guild.name}' (ID: {ctx.guild.id})")
     elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"Missing arguments. Please check the command usage. Correct usage: `!{ctx.command.name} {ctx.command.signature}`")
+        await ctx.send(f"Missing arguments. Please check the command usage. Correct usage: `{ctx.clean_prefix}{ctx.command.name} {ctx.command.signature}`")
         log.warning(f"Missing arguments for command {ctx.command.name} by {ctx.author}: {error}")
     elif isinstance(error, commands.MissingPermissions):
         await ctx.send("You don't have the necessary permissions to use this command.")
@@ -126,18 +788,103 @@ async def ping(ctx):
     await ctx.send(f'Pong! My latency is {latency_ms}ms.')
     log.info(f"Ping command called by {ctx.author}. Latency: {latency_ms}ms.")
 
+@bot.command(name="stalls")
+@commands.is_owner()
+async def stalls_command(ctx):
+    """Shows the event-loop lag histogram and the modules that stalled the loop."""
+    await ctx.send(f"```\n{loop_watchdog.format_report()}\n```")
+
+@bot.command(name="prefix")
+@commands.guild_only()
+@commands.has_permissions(manage_guild=True)
+async def prefix_command(ctx, new_prefix: str = None):
+    """Shows or changes the command prefix for this server."""
+    if new_prefix is None:
+        await ctx.send(f"The command prefix for this server is `{prefix_cache.get(ctx.guild.id)}`.")
+        return
+    prefix_cache.set(ctx.guild.id, new_prefix)
+    await ctx.send(f"Command prefix changed to `{new_prefix}`.")
+    log.info(f"Prefix for guild {ctx.guild.id} changed to '{new_prefix}' by {ctx.author}.")
+
+@bot.command(name="command_conflicts")
+@commands.is_owner()
+async def command_conflicts_command(ctx):
+    """Reports command names and aliases the router had to namespace or drop."""
+    await ctx.send(f"```\n{command_router.format_report()}\n```")
+
+@bot.command(name="scheduler_stats")
+@commands.is_owner()
+async def scheduler_stats_command(ctx):
+    """Shows the central scheduler's job counts and the most expensive periodic jobs."""
+    await ctx.send(f"```\n{central_scheduler.format_stats()}\n```")
+
+@bot.command(name="log_stats")
+@commands.is_owner()
+async def log_stats_command(ctx):
+    """Shows how many log records the sampling and rate-limit policies dropped."""
+    await ctx.send(f"```\n{log_policy.format_report()}\n```")
+
+@bot.command(name="cooldown_stats")
+@commands.is_owner()
+async def cooldown_stats_command(ctx):
+    """Shows the shared cooldown engine's size and memory footprint."""
+    await ctx.send(f"```\n{cooldown_engine.format_report()}\n```")
+
+@bot.command(name="outbound_stats")
+@commands.is_owner()
+async def outbound_stats_command(ctx):
+    """Shows outbound queue depths, merged messages and 429s per route."""
+    await ctx.send(f"```\n{outbound_dispatcher.format_report()}\n```")
+
+@bot.command(name="traces")
+@commands.is_owner()
+async def traces_command(ctx, action: str = None):
+    """Shows the slowest buffered traces; `!traces export` writes them as Chrome trace JSON."""
+    if action == "export":
+        path = cluster_path(tracing_settings["export_path"])
+        written = await asyncio.get_running_loop().run_in_executor(None, tracer.export, path)
+        await ctx.send(f"Exported {written} traces to `{path}` (open in chrome://tracing or Perfetto).")
+        return
+    await ctx.send(f"```\n{tracer.format_report()}\n```")
+
+@bot.command(name="cache_stats")
+@commands.is_owner()
+async def cache_stats_command(ctx):
+    """Shows per-category cache usage against the memory budget."""
+    snapshot_line = f"Warm-restart snapshot: {warm_snapshot.restored} entries restored, {warm_snapshot.discarded} discarded as stale."
+    await ctx.send(f"```\n{cache_budget.format_report()}\n{embed_cache.format_report()}\n{snapshot_line}\n```")
+
+@bot.command(name="bus_stats")
+@commands.is_owner()
+async def bus_stats_command(ctx):
+    """Shows per-topic throughput, drops and delivery lag of the event bus."""
+    await ctx.send(f"```\n{event_bus.format_report()}\n```")
+
 @bot.command(name="reload_all_modules")
 @commands.is_owner() # Only bot owner can use this command
-async def reload_all_modules_command(ctx):
-    """Reloads all loaded cogs (modules) from the ModulesPremium directory."""
+async def reload_all_modules_command(ctx, mode: str = None):
+    """
+    Reloads the modules whose source changed since the last reload.
+    `!reload_all_modules full` unloads and reloads every cog instead.
+    """
+    if mode != "full":
+        log.info(f"Incremental module reload initiated by owner {ctx.author} (ID: {ctx.author.id}).")
+        report = await reload_changed_modules()
+        log.info("Incremental reload summary:\n" + report.format_summary())
+        await ctx.send(f"```\n{report.format_summary(limit=15)}\n```")
+        return
+
     log.info(f"Reloading all modules initiated by owner {ctx.author} (ID: {ctx.author.id}).")
     initial_loaded_cogs = list(bot.extensions.keys())
+    if snapshot_settings["enabled"]:
+        # Reloaded cogs pick their cache back up in add_cog.
+        warm_snapshot.stash(capture_warm_state())
     
     unloaded_count = 0
     failed_unload_count = 0
     for ext in initial_loaded_cogs:
         try:
-            await bot.unload_extension(ext)
+            await deactivate_extension(bot, ext) # Also stops the extension's scheduled jobs
             log.info(f"Unloaded: {ext}")
             unloaded_count += 1
         except Exception as e:
@@ -0,0 +1,4 @@
+# Shared runtime services for the bot and the Modules tree.
+from .settings import load_settings, get_section, resolve_path, write_atomic
+from .manifest import ExtensionManifest
+from .config_store import ConfigStore
@@ -0,0 +1,280 @@
+"""
+    Bounded Caches
+    --------------
+
+    Dict-compatible LRU/TTL caches to replace the unbounded `_cache` and
+    `_local_cache` dicts of the handler cogs and components.
+
+    Each cache has its own entry limit and TTL and belongs to a per-category
+    group that enforces that category's share of a global byte budget.
+    When a group is over budget, entries are evicted least recently used
+    first, starting with the cache being written to; the entry being
+    written is never the one evicted. An entry larger than its group's
+    whole budget is rejected (not stored) instead. Byte sizes are
+    estimates (`sys.getsizeof` of the entry and its direct contents).
+
+    `adopt_module` swaps the dicts for bounded caches right after the cog
+    or component constructor runs, so no call site changes.
+    """
+
+import collections
+import logging
+import sys
+import time
+import weakref
+from collections.abc import MutableMapping
+
+log = logging.getLogger(__name__)
+
+CACHE_ATTRIBUTES = ("_cache", "_local_cache")
+
+
+def approx_size(obj) -> int:
+    """Shallow size of `obj` plus the shallow size of its direct contents."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    return size
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "evictions", "expirations", "rejected")
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.expirations = self.rejected = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CacheGroup:
+    """
+    Byte budget shared by the caches of one category.
+
+    Attributes:
+        name (str): Category name.
+        max_bytes (int): Budget of the group (0 disables byte accounting).
+        used_bytes (int): Estimated bytes held by all caches of the group.
+    """
+    def __init__(self, name: str, max_bytes: int = 0):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        # Keyed by id(): mappings compare by content and are unhashable.
+        self._caches = weakref.WeakValueDictionary()
+
+    @property
+    def caches(self) -> list:
+        return list(self._caches.values())
+
+    def add(self, cache):
+        self._caches[id(cache)] = cache
+
+    def _reclaim(self, cache):
+        """
+        Evicts until the group fits its budget. `cache` was just written to;
+        its newest entry is its most recently used one, so it only gives up
+        entries while it holds others.
+        """
+        while self.max_bytes and self.used_bytes > self.max_bytes:
+            if len(cache) > 1:
+                victim = cache
+            else:
+                victim = max((other for other in self.caches if other is not cache and len(other)),
+                             key=lambda other: other.size_bytes, default=None)
+            if victim is None:
+                return
+            victim.evict_one()
+
+    def stats(self) -> dict:
+        totals = CacheStats()
+        entries = 0
+        for cache in self.caches:
+            entries += len(cache)
+            for name in CacheStats.__slots__:
+                setattr(totals, name, getattr(totals, name) + getattr(cache.stats, name))
+        return {"caches": len(self.caches), "entries": entries, "used_bytes": self.used_bytes,
+                "max_bytes": self.max_bytes, **totals.as_dict()}
+
+
+class BoundedCache(MutableMapping):
+    """
+    LRU cache with optional TTL that behaves like a dict.
+
+    Attributes:
+        name (str): Identifier used in stats.
+        max_entries (int): Entry limit (0 for none).
+        ttl (float): Seconds an entry stays valid after it is written (0 for none).
+        group (CacheGroup): Shared byte budget, if any.
+        stats (CacheStats): Hit/miss/eviction counters.
+    """
+    def __init__(self, name: str = "cache", max_entries: int = 0, ttl: float = 0, group: CacheGroup = None,
+                 sizeof=approx_size, clock=time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.group = group
+        self.stats = CacheStats()
+        self.size_bytes = 0
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data = collections.OrderedDict()  # key -> (value, expires_at, size)
+        if group is not None:
+            group.add(self)
+
+    def __getitem__(self, key):
+        try:
+            value, expires_at, _ = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            raise
+        if expires_at and expires_at <= self._clock():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._remove(key)
+        size = self._sizeof(key) + self._sizeof(value) if self.group is not None and self.group.max_bytes else 0
+        if size and size > self.group.max_bytes:
+            self.stats.rejected += 1
+            log.warning(f"Not caching {key!r} in {self.name}: ~{size} bytes exceed the "
+                        f"{self.group.name} budget of {self.group.max_bytes} bytes.")
+            return
+        self._data[key] = (value, self._clock() + self.ttl if self.ttl else 0, size)
+        self._account(size)
+        while self.max_entries and len(self._data) > self.max_entries:
+            self.evict_one()
+        if size:
+            self.group._reclaim(self)
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._remove(key)
+
+    def __contains__(self, key) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not (entry[1] and entry[1] <= self._clock())
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr({key: entry[0] for key, entry in self._data.items()})
+
+    def __del__(self):
+        # Return the bytes to the group when the owning cog or component goes away.
+        if self.group is not None:
+            self.group.used_bytes -= self.size_bytes
+
+    def _account(self, size: int):
+        self.size_bytes += size
+        if self.group is not None:
+            self.group.used_bytes += size
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._account(-size)
+
+    def evict_one(self):
+        """Drops the least recently used entry."""
+        key = next(iter(self._data))
+        self._remove(key)
+        self.stats.evictions += 1
+
+    def export(self) -> dict:
+        """Live entries as a plain dict, without touching recency or stats."""
+        now = self._clock()
+        return {key: value for key, (value, expires_at, _) in self._data.items() if not expires_at or expires_at > now}
+
+    def purge_expired(self) -> int:
+        now = self._clock()
+        expired = [key for key, (_, expires_at, _) in self._data.items() if expires_at and expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.stats.expirations += len(expired)
+        return len(expired)
+
+
+class CacheBudget:
+    """
+    Splits a global byte budget across categories and creates their caches.
+
+    Attributes:
+        total_bytes (int): Global budget.
+        max_entries (int): Default entry limit of new caches.
+        ttl (float): Default TTL of new caches.
+        groups (dict): Category -> CacheGroup.
+    """
+    def __init__(self, total_bytes: int, categories: list, shares: dict = None, max_entries: int = 0, ttl: float = 0):
+        self.total_bytes = total_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        weights = {category: 1.0 for category in categories}
+        weights.update(shares or {})
+        total_weight = sum(weights.values()) or 1.0
+        self.groups = {category: CacheGroup(category, int(total_bytes * weight / total_weight))
+                       for category, weight in weights.items()}
+
+    def cache(self, category: str, name: str, initial: dict = None) -> BoundedCache:
+        group = self.groups.get(category)
+        if group is None:
+            # Categories without a share get their own unbudgeted group, still entry-bounded.
+            group = self.groups[category] = CacheGroup(category, 0)
+        cache = BoundedCache(name, self.max_entries, self.ttl, group)
+        cache.update(initial or {})
+        return cache
+
+    def purge_expired(self) -> int:
+        return sum(cache.purge_expired() for group in self.groups.values() for cache in group.caches)
+
+    def stats(self) -> dict:
+        return {category: group.stats() for category, group in self.groups.items()}
+
+    def format_report(self) -> str:
+        lines = []
+        for category, stats in sorted(self.stats().items()):
+            if not stats["caches"]:
+                continue
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+            lines.append(f"{category}: {stats['caches']} caches, {stats['entries']} entries, "
+                         f"{stats['used_bytes'] / 1024:.0f}/{stats['max_bytes'] / 1024:.0f} KiB, "
+                         f"hit rate {hit_rate:.1f}%, {stats['evictions']} evicted, {stats['expirations']} expired, "
+                         f"{stats['rejected']} rejected")
+        return "\n".join(lines) or "No bounded caches in use."
+
+
+def adopt_class(cls, budget: CacheBudget, category: str):
+    """Makes instances of `cls` replace their cache dicts with bounded caches after `__init__`."""
+    if getattr(cls, "_bounded_cache_adopted", False):
+        return
+    original_init = cls.__init__
+
+    def __init__(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        for attr in CACHE_ATTRIBUTES:
+            current = getattr(self, attr, None)
+            if type(current) is dict:
+                setattr(self, attr, budget.cache(category, f"{cls.__module__}.{cls.__qualname__}.{attr}", current))
+
+    cls.__init__ = __init__
+    cls._bounded_cache_adopted = True
+
+
+def adopt_module(lib, budget: CacheBudget, category: str):
+    """Adopts every class defined in `lib` (cogs and components)."""
+    for obj in list(vars(lib).values()):
+        if isinstance(obj, type) and obj.__module__ == lib.__name__ and "__init__" in vars(obj):
+            adopt_class(obj, budget, category)
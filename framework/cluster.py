@@ -0,0 +1,173 @@
+"""
+    Shard Cluster Launcher
+    ----------------------
+
+    Splits `shard_count` from the settings into contiguous shard ranges and
+    runs one `bot.py` worker process per range. Workers learn their range
+    from environment variables (see `ClusterContext`) and talk to each other
+    over discord-ext-ipc (see `framework.cluster_ipc`). The launcher
+    restarts crashed workers with exponential backoff and forwards
+    shutdown signals.
+    """
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+log = logging.getLogger(__name__)
+
+ENV_CLUSTER_ID = "VYNO_CLUSTER_ID"
+ENV_CLUSTER_COUNT = "VYNO_CLUSTER_COUNT"
+ENV_SHARD_IDS = "VYNO_SHARD_IDS"
+ENV_SHARD_COUNT = "VYNO_SHARD_COUNT"
+ENV_IPC_BASE_PORT = "VYNO_IPC_BASE_PORT"
+
+
+def compute_shard_ranges(shard_count: int, cluster_count: int) -> list:
+    """Splits shards 0..shard_count-1 into `cluster_count` contiguous, near-equal ranges."""
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1.")
+    cluster_count = max(1, min(cluster_count, shard_count))
+    base, extra = divmod(shard_count, cluster_count)
+    ranges, start = [], 0
+    for cluster_id in range(cluster_count):
+        size = base + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class ClusterContext:
+    """
+    Describes the cluster the current worker process belongs to.
+
+    Attributes:
+        cluster_id (int): Index of this worker.
+        cluster_count (int): Total number of workers.
+        shard_ids (list): Shards this worker connects.
+        shard_count (int): Total shards across all workers.
+        ipc_base_port (int): IPC port of cluster 0; cluster N listens on base + N.
+    """
+    def __init__(self, cluster_id: int, cluster_count: int, shard_ids: list, shard_count: int, ipc_base_port: int):
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.ipc_base_port = ipc_base_port
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Returns the context set by the launcher, or None for a standalone process."""
+        if ENV_SHARD_IDS not in environ:
+            return None
+        return cls(
+            cluster_id=int(environ[ENV_CLUSTER_ID]),
+            cluster_count=int(environ[ENV_CLUSTER_COUNT]),
+            shard_ids=[int(shard) for shard in environ[ENV_SHARD_IDS].split(",")],
+            shard_count=int(environ[ENV_SHARD_COUNT]),
+            ipc_base_port=int(environ[ENV_IPC_BASE_PORT]),
+        )
+
+    def to_env(self) -> dict:
+        return {
+            ENV_CLUSTER_ID: str(self.cluster_id),
+            ENV_CLUSTER_COUNT: str(self.cluster_count),
+            ENV_SHARD_IDS: ",".join(str(shard) for shard in self.shard_ids),
+            ENV_SHARD_COUNT: str(self.shard_count),
+            ENV_IPC_BASE_PORT: str(self.ipc_base_port),
+        }
+
+    def ipc_port(self, cluster_id: int = None) -> int:
+        return self.ipc_base_port + (self.cluster_id if cluster_id is None else cluster_id)
+
+    def scoped_path(self, path: str) -> str:
+        """This worker's copy of a per-process file, e.g. `data/traces.cluster1.json`."""
+        root, ext = os.path.splitext(path)
+        return f"{root}.cluster{self.cluster_id}{ext}"
+
+    @property
+    def owns_shared_files(self) -> bool:
+        """Only cluster 0 persists files every worker reads, such as the extension manifest."""
+        return self.cluster_id == 0
+
+    def __repr__(self):
+        return f"<ClusterContext {self.cluster_id}/{self.cluster_count} shards={self.shard_ids[0]}-{self.shard_ids[-1]} of {self.shard_count}>"
+
+
+class ClusterLauncher:
+    """
+    Spawns and supervises one worker process per shard range.
+
+    Attributes:
+        contexts (list): One ClusterContext per worker.
+        command (list): Command line used to start a worker.
+        max_backoff (float): Upper bound for the restart delay of a crashing worker.
+    """
+    def __init__(self, shard_count: int, cluster_count: int, ipc_base_port: int, command: list, max_backoff: float = 60.0):
+        ranges = compute_shard_ranges(shard_count, cluster_count)
+        self.contexts = [ClusterContext(i, len(ranges), shard_ids, shard_count, ipc_base_port) for i, shard_ids in enumerate(ranges)]
+        self.command = command
+        self.max_backoff = max_backoff
+        self._processes = {}
+        self._backoff = {}
+        self._restart_at = {}
+        self._started_at = {}
+        self._stopping = False
+
+    def _spawn(self, context: ClusterContext):
+        env = dict(os.environ)
+        env.update(context.to_env())
+        self._processes[context.cluster_id] = subprocess.Popen(self.command, env=env)
+        self._started_at[context.cluster_id] = time.monotonic()
+        log.info(f"Started cluster {context.cluster_id} (PID {self._processes[context.cluster_id].pid}) for shards {context.shard_ids}.")
+
+    def _handle_signal(self, signum, frame):
+        log.info(f"Received signal {signum}. Stopping all clusters...")
+        self._stopping = True
+
+    def run(self, poll_interval: float = 1.0):
+        """Starts every worker and supervises them until a shutdown signal arrives."""
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        for context in self.contexts:
+            self._spawn(context)
+
+        while not self._stopping:
+            time.sleep(poll_interval)
+            now = time.monotonic()
+            for context in self.contexts:
+                cluster_id = context.cluster_id
+                process = self._processes.get(cluster_id)
+                if process is not None and process.poll() is not None:
+                    if now - self._started_at[cluster_id] > self.max_backoff:
+                        # The worker was healthy for a while; this is not a crash loop.
+                        self._backoff[cluster_id] = 1.0
+                    delay = self._backoff.get(cluster_id, 1.0)
+                    log.error(f"Cluster {cluster_id} exited with code {process.returncode}. Restarting in {delay:.0f}s.")
+                    self._processes[cluster_id] = None
+                    self._restart_at[cluster_id] = now + delay
+                    self._backoff[cluster_id] = min(delay * 2, self.max_backoff)
+                elif process is None and now >= self._restart_at.get(cluster_id, 0):
+                    self._spawn(context)
+        self.stop()
+
+    def stop(self, timeout: float = 30.0):
+        """Terminates all workers, killing any that do not exit within `timeout`."""
+        running = [p for p in self._processes.values() if p is not None and p.poll() is None]
+        for process in running:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in running:
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                log.warning(f"Worker PID {process.pid} did not exit in time. Killing it.")
+                process.kill()
+        log.info("All clusters stopped.")
+
+
+def default_worker_command(repo_root: str) -> list:
+    return [sys.executable, os.path.join(repo_root, "bot.py")]
@@ -0,0 +1,139 @@
+"""
+    Cluster IPC
+    -----------
+
+    Cross-cluster queries over discord-ext-ipc 2.1. Every worker runs an
+    IPC server on `ClusterContext.ipc_port()` exposing its local
+    statistics; `ClusterIPCCog.gather_stats` asks every peer and merges the
+    answers, e.g. for a global guild count. When discord-ext-ipc is not
+    installed the cog degrades to local-only numbers.
+
+    `Server.start()` in discord-ext-ipc drives the loop with
+    `run_until_complete`, which cannot run inside discord.py 2's running
+    loop, and the server has no way to stop. The cog therefore mounts the
+    server's `handle_accept` on its own aiohttp runner, which it can also
+    tear down on unload. Multicast is not used; peers are addressed by port.
+    """
+
+import asyncio
+import logging
+
+from discord.ext import commands
+
+try:
+    import aiohttp.web
+    from discord.ext.ipc import Client, Server
+except ImportError:  # Optional dependency; only needed for multi-process deployments.
+    Client = Server = None
+
+log = logging.getLogger(__name__)
+
+STATS_ENDPOINT = "cluster_stats"
+
+
+class ClusterIPCCog(commands.Cog, name="ClusterIPC"):
+    """
+    Serves and aggregates per-cluster statistics.
+
+    Attributes:
+        bot (commands.Bot): The worker's bot.
+        context (ClusterContext): This worker's cluster description.
+        secret_key (str): Shared IPC secret.
+        timeout (float): Seconds to wait for each peer.
+    """
+    def __init__(self, bot: commands.Bot, context, secret_key: str, timeout: float = 5.0, host: str = "127.0.0.1"):
+        self.bot = bot
+        self.context = context
+        self.secret_key = secret_key
+        self.timeout = timeout
+        self.host = host
+        self.server = None
+        self._runner = None
+        if Server is None:
+            log.warning("discord-ext-ipc is not installed. Cross-cluster queries will only report this cluster.")
+
+    async def cog_load(self):
+        if Server is None:
+            return
+        # Built here rather than in __init__: Server reads `bot.loop`, which
+        # discord.py 2 only allows inside the running loop.
+        self.server = Server(self.bot, host=self.host, port=self.context.ipc_port(), secret_key=self.secret_key,
+                             do_multicast=False)
+        # The server passes the cog looked up by the endpoint's class name as
+        # an extra first argument; the cog is registered as "ClusterIPC", so a
+        # bound method is called with the request only.
+        self.server.route(STATS_ENDPOINT)(self.stats_endpoint)
+        application = aiohttp.web.Application()
+        application.router.add_route("GET", "/", self.server.handle_accept)
+        self._runner = aiohttp.web.AppRunner(application)
+        await self._runner.setup()
+        await aiohttp.web.TCPSite(self._runner, self.host, self.context.ipc_port()).start()
+        log.info(f"IPC server for cluster {self.context.cluster_id} listening on port {self.context.ipc_port()}.")
+
+    async def cog_unload(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def local_stats(self) -> dict:
+        return {
+            "cluster_id": self.context.cluster_id,
+            "shards": self.context.shard_ids,
+            "guilds": len(self.bot.guilds),
+            "users": sum(guild.member_count or 0 for guild in self.bot.guilds),
+            "latency_ms": round(self.bot.latency * 1000),
+        }
+
+    async def stats_endpoint(self, data) -> dict:
+        """IPC endpoint returning this cluster's statistics."""
+        return self.local_stats()
+
+    async def _query_peer(self, cluster_id: int):
+        client = Client(host=self.host, port=self.context.ipc_port(cluster_id), secret_key=self.secret_key)
+        try:
+            response = await asyncio.wait_for(client.request(STATS_ENDPOINT), self.timeout)
+            if "error" in response:
+                raise RuntimeError(f"{response['error']} (code {response.get('code')})")
+            return response
+        except Exception as e:
+            log.warning(f"Cluster {cluster_id} did not answer the stats query: {type(e).__name__}: {e}")
+            return None
+        finally:
+            # Client opens its session on the first request and never closes it.
+            if client.session is not None:
+                await client.session.close()
+
+    async def gather_stats(self) -> dict:
+        """
+        Collects statistics from every cluster.
+
+        Returns:
+            dict: `clusters` (list of per-cluster dicts, None for unreachable
+            clusters), `guilds` (global guild count) and `reachable` count.
+        """
+        peers = [cid for cid in range(self.context.cluster_count) if cid != self.context.cluster_id]
+        results = {self.context.cluster_id: self.local_stats()}
+        if Client is not None and peers:
+            answers = await asyncio.gather(*(self._query_peer(cid) for cid in peers))
+            results.update(zip(peers, answers))
+        clusters = [results.get(cid) for cid in range(self.context.cluster_count)]
+        reachable = [stats for stats in clusters if stats]
+        return {
+            "clusters": clusters,
+            "guilds": sum(stats["guilds"] for stats in reachable),
+            "reachable": len(reachable),
+        }
+
+    @commands.command(name="cluster_stats")
+    @commands.is_owner()
+    async def cluster_stats_command(self, ctx):
+        """Shows per-cluster and global guild counts."""
+        stats = await self.gather_stats()
+        lines = []
+        for cid, cluster in enumerate(stats["clusters"]):
+            if cluster is None:
+                lines.append(f"Cluster {cid}: unreachable")
+            else:
+                lines.append(f"Cluster {cid}: shards {cluster['shards'][0]}-{cluster['shards'][-1]}, {cluster['guilds']} guilds, {cluster['latency_ms']}ms")
+        lines.append(f"Total: {stats['guilds']} guilds across {stats['reachable']}/{len(stats['clusters'])} clusters.")
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
@@ -0,0 +1,400 @@
+"""
+    Compact Components
+    ------------------
+
+    The generated `*Component` classes are plain objects: every instance
+    carries a `__dict__`, its own copy of the parent config and its own
+    flags. `ComponentRegistry.adopt()` rebuilds such a class on top of
+    `ComponentBase`, which has `__slots__` and no instance dict:
+
+    * `_parent_config` becomes a read-only `MappingProxyType` interned by
+      content, so instances created from equal configs share one view;
+    * `_initialized` lives in a registry-wide `bytearray`, one byte per
+      instance, indexed by the instance's slot number;
+    * `_local_cache` stays per instance (and can still be bounded by the
+      cache budget).
+
+    The class body (methods, docstrings, module) is reused as is, except
+    for `process_data_stream`; the generated methods only ever touch these
+    three attributes.
+
+    Adopted components also get `process_batch()`/`stream_batch()` for
+    bursts of records. Both they and `process_data_stream` run one
+    per-record core, `_process_record()`, which replaces the generated
+    body: each record is serialised canonically once and checksummed with
+    blake2b, which unlike the salted `hash()` of the generated code is
+    stable across processes. Only the deterministic part of a result
+    (component id, checksum, version) is memoized by checksum, as a
+    read-only view; the operation status and timestamp are produced for
+    every record, and every caller gets its own result dict.
+
+    Every adopted instance has a readiness future that resolves when its
+    `initialize()` sets `_initialized`. With `ready_timeout` set on the
+    registry, `process_data_stream` and `stream_batch` wait for readiness
+    instead of dropping the data with the "not initialized" warning.
+
+    Usage:
+        python -m framework.components [--instances 3] [--limit 500]
+    """
+
+import argparse
+import asyncio
+import datetime
+import functools
+import gc
+import hashlib
+import importlib
+import json
+import logging
+import random
+import re
+import time
+import tracemalloc
+import types
+
+from .cache import BoundedCache
+from .settings import REPO_ROOT
+from .tracing import tracer
+
+log = logging.getLogger(__name__)
+
+_EMPTY_CONFIG = types.MappingProxyType({})
+# Literals of the generated process_data_stream bodies.
+_COMPONENT_ID_RE = re.compile(r"^[a-z0-9]+-\d+$")
+_VERSION_RE = re.compile(r"^\d+\.\d+\.\d+$")
+
+
+def canonical_bytes(record) -> bytes:
+    """Serialisation that is identical for equal records, whatever their key order."""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def stable_checksum(record) -> str:
+    """Process-independent checksum of `record`."""
+    return hashlib.blake2b(canonical_bytes(record), digest_size=16).hexdigest()
+
+
+def _stream_literals(func) -> tuple:
+    """Reads the component id and version literals from a generated process_data_stream."""
+    consts = [const for const in func.__code__.co_consts if isinstance(const, str)]
+    component_id = next((const for const in consts if _COMPONENT_ID_RE.match(const)), None)
+    version = next((const for const in consts if _VERSION_RE.match(const)), None)
+    return component_id, version
+
+
+class ComponentBase:
+    """
+    Slotted base of adopted component classes.
+
+    Attributes:
+        _parent_config (MappingProxyType): Shared read-only parent config.
+        _local_cache (dict): Per-instance cache.
+        _initialized (bool): Backed by the registry's flag array.
+        component_id (str): Id reported in processing results.
+        component_version (str): Version reported in processing results.
+        batch_memo_size (int): Deterministic result parts memoized per instance by checksum.
+    """
+    __slots__ = ("_config_view", "_local_cache", "_slot", "_batch_memo")
+    _registry = None
+    component_id = None
+    component_version = None
+    batch_memo_size = 4096
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls)
+        self._config_view = _EMPTY_CONFIG
+        self._slot = cls._registry._allocate()
+        return self
+
+    def __del__(self):
+        try:
+            self._registry._release(self._slot)
+        except AttributeError:
+            # Interpreter shutdown, or __new__ never completed.
+            pass
+
+    @property
+    def _parent_config(self):
+        return self._config_view
+
+    @_parent_config.setter
+    def _parent_config(self, value):
+        self._config_view = self._registry.shared_config(value)
+
+    @property
+    def _initialized(self) -> bool:
+        return bool(self._registry._flags[self._slot])
+
+    @_initialized.setter
+    def _initialized(self, value: bool):
+        self._registry._flags[self._slot] = 1 if value else 0
+        if value:
+            self._registry._resolve(self._slot, True)
+
+    async def wait_ready(self, timeout: float = None) -> bool:
+        """Waits until the component is initialized. False on timeout or failed initialization."""
+        if self._initialized:
+            return True
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._registry.readiness(self)), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    async def _await_ready(self):
+        # Give a component that is still starting a chance before the generated "not initialized" path.
+        if not self._initialized and self._registry.ready_timeout:
+            await self.wait_ready(self._registry.ready_timeout)
+
+    def _record_output(self, checksum: str) -> types.MappingProxyType:
+        """Deterministic part of the result for a record, memoized by checksum."""
+        try:
+            memo = self._batch_memo
+        except AttributeError:
+            memo = self._batch_memo = BoundedCache(f"{type(self).__qualname__}.batch", self.batch_memo_size)
+        output = memo.get(checksum)
+        if output is None:
+            output = memo[checksum] = types.MappingProxyType({
+                "component_id": self.component_id or type(self).__name__.lower(),
+                "data_checksum": checksum,
+                "version": self.component_version,
+            })
+        return output
+
+    def _process_record(self, record, received_at: str = None) -> dict:
+        """Per-record core of `process_data_stream` and `stream_batch`. Returns a new result dict."""
+        output = self._record_output(stable_checksum(record))
+        return {
+            "component_id": output["component_id"],
+            "received_at": received_at or datetime.datetime.now().isoformat(),
+            "data_checksum": output["data_checksum"],
+            "operation_status": "SUCCESS" if random.random() > 0.1 else "FAILURE",
+            "meta": {"version": output["version"]},
+        }
+
+    async def stream_batch(self, records, chunk_size: int = 256):
+        """
+        Async generator over the results for `records`, in order. Yields to
+        the event loop every `chunk_size` records instead of sleeping per
+        record.
+        """
+        component_log = logging.getLogger(type(self).__module__)
+        await self._await_ready()
+        if not self._initialized:
+            component_log.warning(f"{type(self).__name__} not initialized. Skipping batch processing.")
+            return
+        processed = failed = 0
+        received_at = datetime.datetime.now().isoformat()
+        for index, record in enumerate(records, 1):
+            result = self._process_record(record, received_at)
+            processed += 1
+            failed += result["operation_status"] == "FAILURE"
+            yield result
+            if index % chunk_size == 0:
+                await asyncio.sleep(0)
+                received_at = datetime.datetime.now().isoformat()
+        if processed:
+            self._local_cache['last_processed'] = received_at
+            component_log.info(f"Batch processed in {type(self).__name__}: {processed} records, {failed} failed.")
+
+    async def process_batch(self, records, chunk_size: int = 256) -> list:
+        """Processes many records in one call and returns their results in order."""
+        with tracer.span(f"component {type(self).__qualname__}"):
+            return [result async for result in self.stream_batch(records, chunk_size)]
+
+
+class ComponentRegistry:
+    """
+    Adopts component classes and holds their shared state.
+
+    Attributes:
+        classes (dict): Qualified name of the original class -> adopted class.
+        live (int): Adopted component instances currently alive.
+        ready_timeout (float): Seconds data processing waits for an
+            uninitialized component (None or 0 to not wait).
+    """
+    def __init__(self, ready_timeout: float = None):
+        self.classes = {}
+        self.live = 0
+        self.ready_timeout = ready_timeout
+        self._flags = bytearray()
+        self._free = []
+        self._configs = {}
+        self._ready = {}  # slot -> Future, created on first wait
+
+    def _allocate(self) -> int:
+        self.live += 1
+        if self._free:
+            slot = self._free.pop()
+            self._flags[slot] = 0
+            return slot
+        self._flags.append(0)
+        return len(self._flags) - 1
+
+    def _release(self, slot: int):
+        self.live -= 1
+        self._flags[slot] = 0
+        self._free.append(slot)
+        future = self._ready.pop(slot, None)
+        if future is not None and not future.done():
+            future.set_result(False)
+
+    def readiness(self, component) -> asyncio.Future:
+        """Future resolving to True once `component` is initialized (False if it failed)."""
+        future = self._ready.get(component._slot)
+        if future is None:
+            future = self._ready[component._slot] = asyncio.get_running_loop().create_future()
+            if component._initialized:
+                future.set_result(True)
+        return future
+
+    def _resolve(self, slot: int, ready: bool):
+        future = self._ready.get(slot)
+        if future is not None and not future.done():
+            future.set_result(ready)
+
+    def mark_failed(self, component):
+        """Releases waiters of a component whose initialization failed."""
+        self._resolve(component._slot, False)
+
+    def shared_config(self, config) -> types.MappingProxyType:
+        """Returns the interned read-only view of `config`."""
+        if not config:
+            return _EMPTY_CONFIG
+        if isinstance(config, types.MappingProxyType):
+            return config
+        try:
+            key = json.dumps(config, sort_keys=True)
+        except (TypeError, ValueError):
+            # Not interned, but still read-only.
+            return types.MappingProxyType(dict(config))
+        view = self._configs.get(key)
+        if view is None:
+            view = self._configs[key] = types.MappingProxyType(json.loads(key))
+        return view
+
+    def adopt(self, cls) -> type:
+        """Returns the slotted equivalent of component class `cls`."""
+        if isinstance(cls, type) and issubclass(cls, ComponentBase):
+            return cls
+        qualified = f"{cls.__module__}.{cls.__qualname__}"
+        adopted = self.classes.get(qualified)
+        if adopted is None:
+            namespace = {name: value for name, value in vars(cls).items() if name not in ("__dict__", "__weakref__")}
+            namespace["__slots__"] = ()
+            namespace["_registry"] = self
+            stream = namespace.get("process_data_stream")
+            if stream is not None:
+                namespace["component_id"], namespace["component_version"] = _stream_literals(stream)
+                namespace["process_data_stream"] = _adopt_stream(stream)
+            adopted = type(cls.__name__, (ComponentBase,), namespace)
+            adopted.__qualname__ = cls.__qualname__
+            self.classes[qualified] = adopted
+        return adopted
+
+    def adopt_module(self, lib) -> list:
+        """Replaces every `*Component` class defined in `lib` with its slotted equivalent."""
+        adopted = []
+        for name, obj in list(vars(lib).items()):
+            if isinstance(obj, type) and obj.__module__ == lib.__name__ and name.endswith("Component"):
+                setattr(lib, name, self.adopt(obj))
+                adopted.append(getattr(lib, name))
+        return adopted
+
+    def forget_module(self, module_name: str) -> int:
+        """Drops the adopted classes of `module_name` so a reloaded module is adopted afresh."""
+        stale = [qualified for qualified, cls in self.classes.items() if cls.__module__ == module_name]
+        for qualified in stale:
+            del self.classes[qualified]
+        return len(stale)
+
+    def load_module(self, module_name: str) -> list:
+        """Imports a component module and adopts its classes. Returns the adopted classes."""
+        return self.adopt_module(importlib.import_module(module_name))
+
+    def stats(self) -> dict:
+        ready = sum(self._flags)
+        return {"classes": len(self.classes), "live": self.live, "initialized": ready,
+                "flag_bytes": len(self._flags), "shared_configs": len(self._configs)}
+
+
+def _adopt_stream(stream):
+    """
+    Replaces a generated `process_data_stream`, whose checksum would
+    serialise every record a second time, with the shared per-record core.
+    """
+    @functools.wraps(stream)
+    async def process_data_stream(self, data: dict):
+        component_log = logging.getLogger(type(self).__module__)
+        with tracer.span(f"component {type(self).__qualname__}"):
+            await self._await_ready()
+            if not self._initialized:
+                component_log.warning(f"{type(self).__name__} not initialized. Skipping data stream processing.")
+                return None
+            result = self._process_record(data)
+        self._local_cache['last_processed'] = result['received_at']
+        component_log.info(f"Finished processing in {type(self).__name__}. Status: {result['operation_status']}")
+        return result
+    return process_data_stream
+
+
+def _measure(classes: list, instances: int, config: dict) -> tuple:
+    """Allocates `instances` objects per class; returns (bytes, count, objects)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Each instance gets its own dict, as callers of the generated classes do.
+    objects = [cls(dict(config)) for cls in classes for _ in range(instances)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, len(objects), objects
+
+
+def benchmark(classes: list, instances: int = 3, config: dict = None) -> dict:
+    """Compares the footprint of `classes` before and after adoption."""
+    config = config if config is not None else {"api_key": "dummy_api_key", "threshold": 0.75, "enabled": True}
+    registry = ComponentRegistry()
+    adopted = [registry.adopt(cls) for cls in classes]
+    logging.disable(logging.INFO)
+    try:
+        old_bytes, count, old_objects = _measure(classes, instances, config)
+        new_bytes, _, new_objects = _measure(adopted, instances, config)
+    finally:
+        logging.disable(logging.NOTSET)
+    del old_objects, new_objects
+    return {"instances": count, "old_bytes": old_bytes, "new_bytes": new_bytes,
+            "old_per_instance": old_bytes / count if count else 0.0,
+            "new_per_instance": new_bytes / count if count else 0.0}
+
+
+def main():
+    from .manifest import ExtensionManifest
+
+    parser = argparse.ArgumentParser(description="Memory footprint of plain vs slotted components.")
+    parser.add_argument("--instances", type=int, default=3, help="Instances per component class.")
+    parser.add_argument("--limit", type=int, default=0, help="Only load this many component modules (0 for all).")
+    args = parser.parse_args()
+
+    manifest = ExtensionManifest(REPO_ROOT)
+    manifest.load()
+    manifest.refresh()
+    names = sorted(entry["module"] for entry in manifest.entries.values() if not entry["is_extension"])
+    if args.limit:
+        names = names[:args.limit]
+    started = time.perf_counter()
+    logging.disable(logging.INFO)
+    classes = []
+    for name in names:
+        lib = importlib.import_module(name)
+        classes.extend(obj for key, obj in vars(lib).items()
+                       if isinstance(obj, type) and obj.__module__ == name and key.endswith("Component"))
+    logging.disable(logging.NOTSET)
+    print(f"Imported {len(classes)} component classes from {len(names)} modules in {time.perf_counter() - started:.2f}s.")
+    result = benchmark(classes, args.instances)
+    saved = 1 - result["new_bytes"] / result["old_bytes"] if result["old_bytes"] else 0.0
+    print(f"{result['instances']} instances: {result['old_bytes'] / 1024:.0f} KiB plain "
+          f"({result['old_per_instance']:.0f} B each) vs {result['new_bytes'] / 1024:.0f} KiB slotted "
+          f"({result['new_per_instance']:.0f} B each), {saved:.0%} smaller.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+    Consolidated Config Store
+    -------------------------
+
+    One SQLite file replaces the per-cog `data/<handler>_config.json` files.
+    All rows are read with a single query at startup and served from
+    memory; cogs get their config dict through `namespace()` without any
+    file system access.
+
+    Keys are namespaced by module path below `Modules`, e.g.
+    `Moderation.moderation_Eqafif_3.module_Ixa_0.handler_Imadibeq_2`, so a
+    whole category or module can be exported or imported by prefix.
+
+    Usage:
+        python -m framework.config_store export backup.json [--prefix Moderation]
+        python -m framework.config_store import backup.json
+    """
+
+import argparse
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .settings import get_section, resolve_path
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS config (namespace TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+
+
+def config_namespace(module_name: str, package: str = "Modules") -> str:
+    """Returns the store key of the extension `module_name`."""
+    prefix = f"{package}."
+    return module_name[len(prefix):] if module_name.startswith(prefix) else module_name
+
+
+class ConfigStore:
+    """
+    In-memory view over the SQLite config table.
+
+    Attributes:
+        path (str): Location of the SQLite database.
+
+    Writes from `set()` are synchronous unless a `WriteBehindWriter` is
+    attached, in which case they are coalesced and done off the event loop.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._data = {}
+        self._conn = None
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def attach_writer(self, writer):
+        """Routes `set()` through a write-behind writer instead of writing synchronously."""
+        self._writer = writer
+
+    def load(self) -> int:
+        """Opens the database and reads every row in bulk. Returns the row count."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Writes may come from worker threads; access is serialised by self._lock.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            rows = self._conn.execute("SELECT namespace, value FROM config").fetchall()
+        self._data = {namespace: json.loads(value) for namespace, value in rows}
+        log.info(f"Config store loaded {len(self._data)} entries from '{self.path}'.")
+        return len(self._data)
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+    def namespace(self, key: str, defaults: dict = None) -> dict:
+        """
+        Returns the live config dict for `key`, seeded from `defaults` when the
+        key has never been saved. Defaults are not persisted until `set()`.
+        """
+        if key not in self._data:
+            self._data[key] = copy.deepcopy(defaults) if defaults is not None else {}
+        return self._data[key]
+
+    def keys(self, prefix: str = "") -> list:
+        return sorted(key for key in self._data if key.startswith(prefix))
+
+    def set(self, key: str, value: dict):
+        """Updates `key` in memory and persists it (write-behind when a writer is attached)."""
+        self._data[key] = value
+        if self._writer is not None:
+            self._writer.enqueue(key, value)
+        else:
+            self.write_many({key: value})
+
+    def write_many(self, items: dict):
+        """Persists several entries in one transaction."""
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO config (namespace, value, updated_at) VALUES (?, ?, ?)", rows)
+
+    def read_changed(self, prefix: str, since: float = 0.0) -> list:
+        """
+        Reads the rows under `prefix` written after `since` by any process,
+        as `(key, value, updated_at)`. Blocking; call it from a worker thread.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, value, updated_at FROM config WHERE substr(namespace, 1, ?) = ? AND updated_at > ?",
+                (len(prefix), prefix, since)).fetchall()
+        return [(key, json.loads(value), updated_at) for key, value, updated_at in rows]
+
+    def merge_rows(self, rows: list) -> list:
+        """
+        Applies rows from `read_changed()` to the in-memory view, skipping keys
+        with a local save still queued. Replaces values wholesale, so use it
+        for plain values, not the live dicts handed out by `namespace()`.
+        Returns the keys whose value changed.
+        """
+        changed = []
+        for key, value, _ in rows:
+            if self._writer is not None and self._writer.pending(key):
+                continue
+            if key not in self._data or self._data[key] != value:
+                self._data[key] = value
+                changed.append(key)
+        return changed
+
+    def export_all(self, prefix: str = "") -> dict:
+        """Returns a deep copy of every entry whose key starts with `prefix`."""
+        return {key: copy.deepcopy(self._data[key]) for key in self.keys(prefix)}
+
+    def import_all(self, entries: dict, overwrite: bool = True) -> int:
+        """Bulk-imports `entries` in a single transaction. Returns the number written."""
+        if not overwrite:
+            entries = {key: value for key, value in entries.items() if key not in self._data}
+        for key, value in entries.items():
+            self._data[key] = value
+        if entries:
+            self.write_many(entries)
+        return len(entries)
+
+    def export_json(self, path: str, prefix: str = ""):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.export_all(prefix), f, indent=4)
+
+    def import_json(self, path: str, overwrite: bool = True) -> int:
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.import_all(json.load(f), overwrite)
+
+    def import_legacy_files(self, data_dir: str, file_keys: dict) -> int:
+        """
+        Migrates `data/<file_key>_config.json` files into the store.
+
+        Args:
+            data_dir (str): Directory holding the legacy files.
+            file_keys (dict): Legacy file key (e.g. "handlerajiweviya1") -> store key.
+        """
+        try:
+            present = set(os.listdir(data_dir))
+        except FileNotFoundError:
+            return 0
+        entries = {}
+        for file_key, key in file_keys.items():
+            file_name = f"{file_key}_config.json"
+            # Keys already in the store were migrated on an earlier boot.
+            if key in self._data or file_name not in present:
+                continue
+            try:
+                with open(os.path.join(data_dir, file_name), 'r', encoding='utf-8') as f:
+                    entries[key] = json.load(f)
+            except json.JSONDecodeError as e:
+                log.error(f"Skipping corrupt legacy config '{file_name}': {e}")
+        imported = self.import_all(entries, overwrite=False)
+        if imported:
+            log.info(f"Migrated {imported} legacy config files into the config store.")
+        return imported
+
+
+def adopt_module(lib, store: ConfigStore, key: str, defaults: dict = None):
+    """
+    Points the `_load_config`/`_save_config` of every cog class defined in
+    `lib` at the store. Runs after the module is imported and before its
+    `setup()`, so the generated cog code needs no changes. Without indexed
+    defaults the original loader still provides them on first use.
+    """
+    for obj in list(vars(lib).values()):
+        if not isinstance(obj, type) or obj.__module__ != lib.__name__ or "_load_config" not in vars(obj):
+            continue
+        original_load = obj._load_config
+
+        def _load_config(self, _original=original_load):
+            if key in store or defaults is not None:
+                return store.namespace(key, defaults)
+            return store.namespace(key, _original(self))
+
+        async def _save_config(self):
+            store.set(key, self._config)
+            log.debug(f"Saved config for {key} to the config store.")
+
+        obj._load_config = _load_config
+        obj._save_config = _save_config
+
+
+def main():
+    settings = get_section("config_store", {"path": "data/config_store.sqlite3"})
+    parser = argparse.ArgumentParser(description="Bulk export/import of the consolidated config store.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("file", help="JSON file to write or read.")
+    parser.add_argument("--prefix", default="", help="Only export keys starting with this namespace.")
+    parser.add_argument("--keep-existing", action="store_true", help="On import, do not overwrite existing keys.")
+    args = parser.parse_args()
+
+    store = ConfigStore(resolve_path(settings["path"]))
+    store.load()
+    if args.action == "export":
+        store.export_json(args.file, args.prefix)
+        print(f"Exported {len(store.keys(args.prefix))} entries to {args.file}.")
+    else:
+        print(f"Imported {store.import_json(args.file, overwrite=not args.keep_existing)} entries from {args.file}.")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+    Shared Cooldown Engine
+    ----------------------
+
+    Replaces the per-command `CooldownMapping`s (one per `main_command`,
+    each with its own lazily cleaned bucket dict) with one service:
+
+    * every (command, bucket key) window lives in a single dict keyed by
+      one packed integer, with a second dict holding use counts only for
+      the few limits whose rate is above 1;
+    * windows are dropped when they end, driven by a timing wheel, so the
+      bookkeeping shrinks back as users go quiet. The wheel is advanced by
+      a periodic `expire()` job, or on each `acquire()` when the engine is
+      built with `expire_on_acquire` (no scheduler to run the job);
+    * optional global per-user and per-guild budgets apply on top of the
+      per-command cooldowns. A use is only counted when every applicable
+      limit allows it.
+
+    Windows follow discord.py's fixed-window semantics: the first use
+    opens a window of `per` seconds in which `rate` uses are allowed.
+    The engine itself is independent of discord.py; `adopt_cog` moves a
+    cog's commands onto it and enforces it through a command check that
+    raises the usual `CommandOnCooldown`.
+    """
+
+import logging
+import math
+import sys
+import time
+
+from .cache import approx_size
+from .timing_wheel import TimingWheel
+
+log = logging.getLogger(__name__)
+
+_KEY_BITS = 64
+
+
+class Limit:
+    """A registered cooldown or budget."""
+    __slots__ = ("name", "rate", "per", "bucket")
+
+    def __init__(self, name: str, rate: int, per: float, bucket: str):
+        self.name = name
+        self.rate = rate
+        self.per = per
+        self.bucket = bucket
+
+
+class CooldownEngine:
+    """
+    Compact fixed-window cooldown store.
+
+    Attributes:
+        tick (float): Timing wheel resolution in seconds.
+        limits (list): Limit per limit id.
+        user_budget (int): Limit id of the per-user budget, or None.
+        guild_budget (int): Limit id of the per-guild budget, or None.
+        rejected (int): Uses refused so far.
+        expire_on_acquire (bool): Advance the wheel on every `acquire()`
+            instead of relying on periodic `expire()` calls.
+    """
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, user_budget: tuple = None,
+                 guild_budget: tuple = None, clock=time.monotonic, expire_on_acquire: bool = False):
+        self.tick = tick
+        self.expire_on_acquire = expire_on_acquire
+        self.limits = []
+        self.rejected = 0
+        self._ids = {}
+        self._windows = {}  # packed key -> window end
+        self._counts = {}   # packed key -> uses, only for limits with rate > 1
+        self._wheel = TimingWheel(slots, levels)
+        self._clock = clock
+        self._origin = clock()
+        self._check = None
+        self.user_budget = self.register("<user budget>", *user_budget, "user") if user_budget else None
+        self.guild_budget = self.register("<guild budget>", *guild_budget, "guild") if guild_budget else None
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def register(self, name: str, rate: int, per: float, bucket: str = "user") -> int:
+        """Registers (or updates) the limit `name` and returns its id."""
+        limit_id = self._ids.get(name)
+        if limit_id is None:
+            limit_id = self._ids[name] = len(self.limits)
+            self.limits.append(Limit(name, rate, per, bucket))
+        else:
+            limit = self.limits[limit_id]
+            limit.rate, limit.per, limit.bucket = rate, per, bucket
+        return limit_id
+
+    def lookup(self, name: str) -> int:
+        return self._ids.get(name)
+
+    @staticmethod
+    def _pack(limit_id: int, bucket_key):
+        if isinstance(bucket_key, int) and 0 <= bucket_key < 1 << _KEY_BITS:
+            return limit_id << _KEY_BITS | bucket_key
+        return (limit_id, bucket_key)
+
+    def _retry_after(self, limit: Limit, key, now: float) -> float:
+        end = self._windows.get(key)
+        if end is None or end <= now or self._counts.get(key, 1) < limit.rate:
+            return 0.0
+        return end - now
+
+    def _consume(self, limit: Limit, key, now: float):
+        end = self._windows.get(key)
+        if end is None or end <= now:
+            self._windows[key] = now + limit.per
+            if limit.rate > 1:
+                self._counts[key] = 1
+            self._wheel.schedule(key, math.ceil((now + limit.per - self._origin) / self.tick) - self._wheel.current_tick)
+        else:
+            self._counts[key] = self._counts.get(key, 1) + 1
+
+    def acquire(self, limit_id: int, bucket_key, user_id: int = None, guild_id: int = None, now: float = None) -> tuple:
+        """
+        Counts one use of `limit_id` for `bucket_key` and the optional global
+        budgets, unless one of them is exhausted.
+
+        Returns:
+            tuple: (retry_after, limit id that refused), or (0.0, None) when allowed.
+        """
+        now = self._clock() if now is None else now
+        if self.expire_on_acquire:
+            self.expire(now)
+        checks = [(limit_id, bucket_key)]
+        if self.user_budget is not None and user_id is not None:
+            checks.append((self.user_budget, user_id))
+        if self.guild_budget is not None and guild_id is not None:
+            checks.append((self.guild_budget, guild_id))
+        checks = [(self.limits[checked_id], self._pack(checked_id, key), checked_id) for checked_id, key in checks]
+        for limit, key, checked_id in checks:
+            retry_after = self._retry_after(limit, key, now)
+            if retry_after:
+                self.rejected += 1
+                return retry_after, checked_id
+        for limit, key, _ in checks:
+            self._consume(limit, key, now)
+        return 0.0, None
+
+    def expire(self, now: float = None) -> int:
+        """Advances the wheel to `now` and drops the windows that ended. Returns how many were dropped."""
+        now = self._clock() if now is None else now
+        target = int((now - self._origin) / self.tick)
+        dropped = 0
+        while self._wheel.current_tick < target:
+            for key in self._wheel.advance():
+                end = self._windows.get(key)
+                if end is not None and end <= now:
+                    del self._windows[key]
+                    self._counts.pop(key, None)
+                    dropped += 1
+        return dropped
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the windows, counts, wheel entries and limits."""
+        wheel_entry = sys.getsizeof((0, 0)) + 8
+        return (approx_size(self._windows) + approx_size(self._counts) + len(self._wheel) * wheel_entry
+                + approx_size(self._ids) + len(self.limits) * sys.getsizeof(Limit("", 1, 1.0, "user")))
+
+    def stats(self) -> dict:
+        return {"limits": len(self.limits), "windows": len(self._windows), "counted": len(self._counts),
+                "timers": len(self._wheel), "rejected": self.rejected, "bytes": self.memory_bytes()}
+
+    def format_report(self) -> str:
+        stats = self.stats()
+        return (f"Cooldowns: {stats['limits']} limits, {stats['windows']} open windows "
+                f"({stats['counted']} with counts), {stats['timers']} timers, {stats['rejected']} rejected, "
+                f"~{stats['bytes'] / 1024:.1f} KiB.")
+
+
+def adopt_cog(cog, engine: CooldownEngine) -> int:
+    """
+    Moves the cooldowns of `cog`'s commands onto `engine` and returns how
+    many were moved. Lazy-load stubs keep their own cooldown, so the real
+    command does not share (and exhaust) the stub's window.
+    """
+    from discord.ext import commands
+
+    adopted = 0
+    for command in cog.walk_commands():
+        mapping = command._buckets
+        if not mapping.valid or getattr(command, "extras", {}).get("lazy_module"):
+            continue
+        engine.register(command.qualified_name, mapping._cooldown.rate, mapping._cooldown.per, mapping.type.name)
+        command._buckets = commands.CooldownMapping(None, commands.BucketType.default)
+        check = _shared_cooldown_check(engine)
+        if check not in command.checks:
+            # A fresh list: `checks` is shared with the callback's __commands_checks__,
+            # which reloads and Command.copy() read again.
+            command.checks = [*command.checks, check]
+        adopted += 1
+    return adopted
+
+
+def _shared_cooldown_check(engine: CooldownEngine):
+    if engine._check is not None:
+        return engine._check
+    from discord.ext import commands
+
+    async def shared_cooldown(ctx) -> bool:
+        limit_id = engine.lookup(ctx.command.qualified_name)
+        if limit_id is None:
+            return True
+        bucket_type = getattr(commands.BucketType, engine.limits[limit_id].bucket)
+        retry_after, refused = engine.acquire(limit_id, bucket_type.get_key(ctx.message), ctx.author.id,
+                                              ctx.guild.id if ctx.guild else None)
+        if retry_after:
+            limit = engine.limits[refused]
+            raise commands.CommandOnCooldown(commands.Cooldown(limit.rate, limit.per), retry_after,
+                                             getattr(commands.BucketType, limit.bucket))
+        return True
+
+    engine._check = shared_cooldown
+    return shared_cooldown
@@ -0,0 +1,169 @@
+"""
+    Embed Cache
+    -----------
+
+    The `status` and `info` replies of the generated cogs' `main_command`
+    are built from static strings and `self._cache['latest_data']`. This
+    module keeps the serialized embed dict of each reply per cog and
+    shares it across guilds; it is rebuilt only when its source changes:
+
+    * `status`: when `latest_data` is replaced (an identity check; the
+      periodic update task assigns a fresh dict on every run);
+    * `info`: when the cog class changes, i.e. after a reload.
+
+    Cached embeds are sent as `discord.Embed` subclasses whose `to_dict()`
+    returns the stored dict, so a cache hit constructs and serializes
+    nothing. The dicts are shared and must not be mutated.
+    """
+
+import functools
+import logging
+import re
+
+log = logging.getLogger(__name__)
+
+COLOR_GREEN = 0x2ecc71
+COLOR_RED = 0xe74c3c
+COLOR_BLUE = 0x3498db
+
+DEFAULT_STATUS = {'status': 'UNKNOWN', 'metric_value': 'N/A'}
+KINDS = ("status", "info")
+
+_VERSION_RE = re.compile(r"v\d+(?:\.\d+)+")
+
+
+def _field(name: str, value) -> dict:
+    return {"name": name, "value": str(value), "inline": True}
+
+
+def status_embed(cog_name: str, data: dict) -> dict:
+    """Embed dict of the `status` reply for `data` (the cog's `latest_data`)."""
+    return {
+        "type": "rich",
+        "title": f"{cog_name} Status",
+        "description": f"Current module health: **{data['status']}**",
+        "color": COLOR_GREEN if data['status'] == 'HEALTHY' else COLOR_RED,
+        "fields": [_field("Last Updated", data.get('timestamp', 'N/A')),
+                   _field("Metric Value", data.get('metric_value', 'N/A'))],
+    }
+
+
+def info_embed(cog_name: str, version: str, command_name: str) -> dict:
+    """Embed dict of the `info` reply."""
+    return {
+        "type": "rich",
+        "title": f"{cog_name} Information",
+        "description": "This module manages manages features.",
+        "color": COLOR_BLUE,
+        "fields": [_field("Version", version), _field("Author", "BotDev Team")],
+        "footer": {"text": f"Powered by the Advanced Bot Framework - ID: {command_name}"},
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _frozen_embed_type():
+    import discord
+
+    class FrozenEmbed(discord.Embed):
+        """An embed whose serialized form was computed ahead of time."""
+        def to_dict(self):
+            return self._payload
+
+    return FrozenEmbed
+
+
+def frozen_embed(payload: dict):
+    """Wraps a precomputed embed dict in a `discord.Embed` that serializes to it."""
+    embed = _frozen_embed_type().from_dict(payload)
+    embed._payload = payload
+    return embed
+
+
+class EmbedCache:
+    """
+    Per-cog cache of the prebuilt `status` and `info` embeds.
+
+    Attributes:
+        freeze (callable): Turns an embed dict into what `ctx.send(embed=...)`
+            receives; `frozen_embed` in the bot, identity in tests.
+        hits (int): Replies served from the cache.
+        builds (int): Embeds (re)built because their source changed.
+    """
+    def __init__(self, freeze=frozen_embed):
+        self.freeze = freeze
+        self.hits = 0
+        self.builds = 0
+        self._entries = {}  # (cog module, kind) -> (source, frozen embed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def embed(self, cog, kind: str, command_name: str, version: str):
+        """Returns the cached embed of `cog`'s `kind` reply, rebuilding it if its source changed."""
+        if kind == "status":
+            cache = getattr(cog, "_cache", None)
+            source = cache.get('latest_data') if cache is not None else None
+        else:
+            source = type(cog)
+        key = (type(cog).__module__, kind)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is source:
+            self.hits += 1
+            return entry[1]
+        if kind == "status":
+            payload = status_embed(type(cog).__name__, source or DEFAULT_STATUS)
+        else:
+            payload = info_embed(type(cog).__name__, version, command_name)
+        embed = self.freeze(payload)
+        self._entries[key] = (source, embed)
+        self.builds += 1
+        return embed
+
+    def forget(self, module_name: str):
+        for kind in KINDS:
+            self._entries.pop((module_name, kind), None)
+
+    def format_report(self) -> str:
+        served = self.hits + self.builds
+        rate = self.hits / served * 100 if served else 0.0
+        return f"Embed cache: {len(self._entries)} embeds, {self.hits} hits, {self.builds} builds ({rate:.1f}% hit rate)."
+
+
+def command_version(callback) -> str:
+    """Reads the module version (e.g. `v2.9.72`) from the constants of a `main_command` callback."""
+    code = getattr(callback, "__code__", None)
+    for const in code.co_consts if code is not None else ():
+        if isinstance(const, str) and _VERSION_RE.fullmatch(const):
+            return const
+    return "N/A"
+
+
+def cached_main_command(callback, cache: EmbedCache):
+    """Wraps a generated `main_command` callback so `status` and `info` are served from `cache`."""
+    version = command_version(callback)
+
+    @functools.wraps(callback)
+    async def main_command(self, ctx, *, args: str = None):
+        kind = args.lower().strip() if args else None
+        # Same gates as the generated command; anything else falls through to it.
+        if kind in KINDS and self._config.get("enabled") and (
+                "moderation" not in type(self).__name__.lower() or ctx.author.guild_permissions.manage_guild):
+            await ctx.send(embed=cache.embed(self, kind, ctx.command.name, version))
+            return
+        await callback(self, ctx, args=args)
+
+    main_command.__embed_cached__ = True
+    return main_command
+
+
+def adopt_module(lib, cache: EmbedCache):
+    """Routes the `status`/`info` replies of every cog in `lib` through `cache`."""
+    cache.forget(lib.__name__)
+    for name, obj in list(vars(lib).items()):
+        if not (isinstance(obj, type) and obj.__module__ == lib.__name__ and name.endswith("Cog")):
+            continue
+        command = vars(obj).get("main_command")
+        callback = getattr(command, "callback", None)
+        if callback is None or getattr(callback, "__embed_cached__", False):
+            continue
+        command.callback = cached_main_command(callback, cache)
@@ -0,0 +1,341 @@
+"""
+    In-Process Event Bus
+    --------------------
+
+    Asyncio pub/sub between handler cogs and the components of their
+    `handler_<name>_components` packages.
+
+    * Topics are named and optionally typed; publishing a payload of the
+      wrong type raises `TypeError`.
+    * Each subscriber has a bounded queue with a policy for when it is
+      full: `block` (the publisher waits), `drop_newest` or `drop_oldest`.
+    * Fan-out enqueues the same payload object for every subscriber;
+      payloads are shared, never copied, and must be treated as read-only.
+    * Subscribers may take batches: up to `batch_size` queued payloads are
+      handed over in one call.
+    * A subscriber's delivery task only exists while its queue is
+      non-empty, so thousands of idle subscriptions cost no tasks.
+
+    Per-topic throughput, drops and delivery lag are kept in `stats()`.
+
+    Gateway messages that invoke a cog's command are forwarded to that
+    cog's topic (`forward_message`), where its components' `process_batch`
+    subscriptions pick them up.
+    """
+
+import asyncio
+import collections
+import logging
+import time
+
+from .tracing import tracer
+
+log = logging.getLogger(__name__)
+
+POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+class TopicStats:
+    __slots__ = ("published", "delivered", "dropped", "errors", "lag_total", "lag_max")
+
+    def __init__(self):
+        self.published = self.delivered = self.dropped = self.errors = 0
+        self.lag_total = self.lag_max = 0.0
+
+    @property
+    def lag_mean(self) -> float:
+        return self.lag_total / self.delivered if self.delivered else 0.0
+
+
+class Topic:
+    """
+    A named channel.
+
+    Attributes:
+        name (str): Topic name, e.g. `cog.Modules.Core.x.y.handler_z`.
+        payload_type (type): Accepted payload type, or None for any.
+        subscriptions (list): Current subscriptions.
+        stats (TopicStats): Throughput and lag counters.
+    """
+    def __init__(self, name: str, payload_type: type = None):
+        self.name = name
+        self.payload_type = payload_type
+        self.subscriptions = []
+        self.stats = TopicStats()
+
+
+class Subscription:
+    """
+    One consumer of a topic.
+
+    Attributes:
+        name (str): Identifier used in stats and logs.
+        maxsize (int): Queue bound.
+        policy (str): One of POLICIES, applied when the queue is full.
+        batch_size (int): Payloads per handler call; with 1 the handler
+            receives the payload itself, otherwise a list.
+    """
+    def __init__(self, topic: Topic, handler, name: str, maxsize: int = 1000, policy: str = "drop_oldest",
+                 batch_size: int = 1):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}'. Expected one of {POLICIES}.")
+        self.topic = topic
+        self.handler = handler
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self.handled = 0
+        self.dropped = 0
+        self.closed = False
+        self._queue = collections.deque()  # (published_at, payload, publishing span)
+        self._space = None
+        self._task = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _offer(self, item) -> bool:
+        """Enqueues without waiting. Returns False when the item was dropped."""
+        if len(self._queue) >= self.maxsize:
+            if self.policy == "drop_oldest":
+                self._queue.popleft()
+            else:
+                return False
+        self._queue.append(item)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._deliver())
+        return True
+
+    async def _put(self, item):
+        while self.policy == "block" and len(self._queue) >= self.maxsize and not self.closed:
+            if self._space is None:
+                self._space = asyncio.Event()
+            self._space.clear()
+            await self._space.wait()
+        return self._offer(item)
+
+    async def _deliver(self):
+        stats = self.topic.stats
+        try:
+            while self._queue and not self.closed:
+                count = min(self.batch_size, len(self._queue))
+                items = [self._queue.popleft() for _ in range(count)]
+                if self._space is not None:
+                    self._space.set()
+                lag = time.monotonic() - items[0][0]
+                stats.lag_total += lag * count
+                stats.lag_max = max(stats.lag_max, lag)
+                try:
+                    # Deliveries continue the publisher's trace, if any.
+                    with tracer.resume(items[0][2]), tracer.span(f"bus.deliver {self.topic.name}", subscriber=self.name):
+                        if self.batch_size == 1:
+                            await self.handler(items[0][1])
+                        else:
+                            await self.handler([payload for _, payload, _ in items])
+                except Exception as e:
+                    stats.errors += 1
+                    log.error(f"Subscriber {self.name} of {self.topic.name} failed: {type(e).__name__}: {e}", exc_info=True)
+                self.handled += count
+                stats.delivered += count
+        finally:
+            self._task = None
+
+    def close(self):
+        self.closed = True
+        self._queue.clear()
+        if self._space is not None:
+            self._space.set()
+        if self._task is not None:
+            self._task.cancel()
+
+
+class EventBus:
+    """
+    Topic registry and publisher.
+
+    Attributes:
+        topics (dict): Name -> Topic.
+        default_maxsize (int): Queue bound of new subscriptions.
+        default_policy (str): Full-queue policy of new subscriptions.
+    """
+    def __init__(self, default_maxsize: int = 1000, default_policy: str = "drop_oldest"):
+        self.topics = {}
+        self.default_maxsize = default_maxsize
+        self.default_policy = default_policy
+
+    def topic(self, name: str, payload_type: type = None) -> Topic:
+        """Returns topic `name`, creating it on first use. A type set once cannot change."""
+        topic = self.topics.get(name)
+        if topic is None:
+            topic = self.topics[name] = Topic(name, payload_type)
+        elif payload_type is not None and topic.payload_type not in (None, payload_type):
+            raise TypeError(f"Topic {name} carries {topic.payload_type.__name__}, not {payload_type.__name__}.")
+        elif payload_type is not None:
+            topic.payload_type = payload_type
+        return topic
+
+    def has_subscribers(self, name: str) -> bool:
+        topic = self.topics.get(name)
+        return topic is not None and bool(topic.subscriptions)
+
+    def subscribe(self, name: str, handler, subscriber: str = None, maxsize: int = None, policy: str = None,
+                  batch_size: int = 1, payload_type: type = None) -> Subscription:
+        """Subscribes the coroutine function `handler` to topic `name`."""
+        topic = self.topic(name, payload_type)
+        subscription = Subscription(topic, handler, subscriber or getattr(handler, "__qualname__", repr(handler)),
+                                    maxsize or self.default_maxsize, policy or self.default_policy, batch_size)
+        topic.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        if subscription in subscription.topic.subscriptions:
+            subscription.topic.subscriptions.remove(subscription)
+
+    def unsubscribe_subscriber(self, subscriber: str) -> int:
+        """Removes every subscription made under the name `subscriber`."""
+        removed = 0
+        for topic in self.topics.values():
+            for subscription in [s for s in topic.subscriptions if s.name == subscriber]:
+                self.unsubscribe(subscription)
+                removed += 1
+        return removed
+
+    def _check(self, name: str, payload) -> Topic:
+        topic = self.topic(name)
+        if topic.payload_type is not None and not isinstance(payload, topic.payload_type):
+            raise TypeError(f"Topic {name} expects {topic.payload_type.__name__}, got {type(payload).__name__}.")
+        topic.stats.published += 1
+        return topic
+
+    def publish_nowait(self, name: str, payload) -> int:
+        """Fans `payload` out without waiting; full queues apply their drop policy. Returns deliveries queued."""
+        topic = self._check(name, payload)
+        item = (time.monotonic(), payload, tracer.current())
+        queued = 0
+        for subscription in topic.subscriptions:
+            if subscription._offer(item):
+                queued += 1
+            else:
+                subscription.dropped += 1
+                topic.stats.dropped += 1
+        return queued
+
+    async def publish(self, name: str, payload) -> int:
+        """Like `publish_nowait`, but waits for space in `block` subscribers' queues."""
+        topic = self._check(name, payload)
+        item = (time.monotonic(), payload, tracer.current())
+        queued = 0
+        for subscription in list(topic.subscriptions):
+            if await subscription._put(item):
+                queued += 1
+            else:
+                subscription.dropped += 1
+                topic.stats.dropped += 1
+        return queued
+
+    def close(self):
+        for topic in self.topics.values():
+            for subscription in topic.subscriptions:
+                subscription.close()
+
+    def stats(self) -> dict:
+        return {name: {"subscribers": len(topic.subscriptions), "published": topic.stats.published,
+                       "delivered": topic.stats.delivered, "dropped": topic.stats.dropped,
+                       "errors": topic.stats.errors, "lag_mean": topic.stats.lag_mean, "lag_max": topic.stats.lag_max,
+                       "queued": sum(subscription.depth for subscription in topic.subscriptions)}
+                for name, topic in self.topics.items()}
+
+    def format_report(self, limit: int = 10) -> str:
+        stats = sorted(self.stats().items(), key=lambda item: item[1]["published"], reverse=True)
+        lines = [f"{len(self.topics)} topics, {sum(s['subscribers'] for _, s in stats)} subscriptions."]
+        for name, s in stats[:limit]:
+            lines.append(f"{name}: subs={s['subscribers']} published={s['published']} delivered={s['delivered']} "
+                         f"dropped={s['dropped']} queued={s['queued']} lag mean={s['lag_mean'] * 1000:.1f}ms "
+                         f"max={s['lag_max'] * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+def cog_topic(module_name: str) -> str:
+    """Topic a handler cog publishes on and its components subscribe to."""
+    return f"cog.{module_name}"
+
+
+def owner_module(component_module: str, extension_modules) -> str:
+    """
+    Returns the cog module owning `component_module`, e.g.
+    `...module_X.handler_abc_0_components.utility_Y` -> `...module_X.handler_Abc_0`.
+    Package names are lower-cased versions of the cog module names.
+    """
+    parts = component_module.split(".")
+    for index, part in enumerate(parts):
+        if part.endswith("_components"):
+            wanted = ".".join(parts[:index] + [part[:-len("_components")]]).lower()
+            return next((module for module in extension_modules if module.lower() == wanted), None)
+    return None
+
+
+def command_module(command) -> str:
+    """Module of the cog that owns `command`; lazy-load stubs name the module they stand in for."""
+    extras = getattr(command, "extras", None) or {}
+    if extras.get("lazy_module"):
+        return extras["lazy_module"]
+    cog = getattr(command, "cog", None)
+    return type(cog).__module__ if cog is not None else None
+
+
+def message_record(message) -> dict:
+    """JSON-serialisable summary of a gateway message, the record components receive."""
+    return {
+        "message_id": message.id,
+        "channel_id": message.channel.id,
+        "guild_id": message.guild.id if message.guild else None,
+        "author_id": message.author.id,
+        "content": message.content,
+        "created_at": message.created_at.isoformat(),
+    }
+
+
+def forward_message(bus: EventBus, module_name: str, message) -> int:
+    """
+    Publishes `message` on the topic of the cog module `module_name`, i.e.
+    to the components of the cog whose command it invoked. Nothing is built
+    when the cog has no subscribed components. Returns deliveries queued.
+    """
+    if module_name is None:
+        return 0
+    topic = cog_topic(module_name)
+    if not bus.has_subscribers(topic):
+        return 0
+    return bus.publish_nowait(topic, message_record(message))
+
+
+def adopt_module(lib, bus: EventBus):
+    """Gives the cog classes of `lib` a `publish_event(payload)` method bound to their topic."""
+    topic = cog_topic(lib.__name__)
+    for name, obj in list(vars(lib).items()):
+        if isinstance(obj, type) and obj.__module__ == lib.__name__ and name.endswith("Cog") and not hasattr(obj, "publish_event"):
+            obj.publish_event = lambda self, payload: bus.publish_nowait(topic, payload)
+
+
+def connect_components(bus: EventBus, components: dict, extension_modules: list, batch_size: int = 64) -> int:
+    """
+    Subscribes each component's `process_batch` to its owning cog's topic.
+    `components` maps component keys (`<module>.<ClassName>`) to instances.
+    Returns the number of subscriptions made.
+    """
+    by_parent = {}
+    for module in extension_modules:
+        by_parent.setdefault(module.rsplit(".", 1)[0], []).append(module)
+    connected = 0
+    for key, component in components.items():
+        module = key.rsplit(".", 1)[0]
+        parent = module.split("_components.", 1)[0].rsplit(".", 1)[0] if "_components." in module else None
+        owner = owner_module(module, by_parent.get(parent, ())) if parent else None
+        if owner is None or not hasattr(component, "process_batch"):
+            continue
+        bus.subscribe(cog_topic(owner), component.process_batch, subscriber=key, batch_size=batch_size)
+        connected += 1
+    return connected
@@ -0,0 +1,117 @@
+"""
+    Incremental Hot Reload
+    ----------------------
+
+    Turns the changes found by an `ExtensionManifest.refresh()` (content
+    hash comparison) into the smallest set of reload actions:
+
+    * changed extensions that are loaded are unloaded and loaded again;
+    * changed extensions that are only lazily stubbed get fresh stubs;
+    * new extensions in the enabled categories are loaded, and so are
+      changed ones that are neither loaded nor stubbed (e.g. a cog that
+      failed to load and has since been fixed);
+    * removed extensions are unloaded;
+    * changed, new and removed component modules are re-imported into (or
+      dropped from) the component initializer on their own; their owning
+      cog is left alone.
+
+    Everything else, and with it the cache state of untouched cogs, stays
+    as it is.
+    """
+
+import time
+
+
+class ReloadPlan:
+    """
+    Reload actions derived from a manifest refresh.
+
+    Attributes:
+        reload (list): Loaded extensions whose source changed.
+        restub (list): Changed or removed extensions that are lazily
+            stubbed and need their stubs rebuilt.
+        load (list): New extensions, and changed ones that are neither
+            loaded nor stubbed, in the enabled categories.
+        unload (list): Loaded extensions whose source was removed.
+        components (list): Changed or new component modules.
+        dropped_components (list): Removed modules that were not loaded
+            extensions; their components, if any, are dropped.
+    """
+    def __init__(self):
+        self.reload = []
+        self.restub = []
+        self.load = []
+        self.unload = []
+        self.components = []
+        self.dropped_components = []
+
+    @classmethod
+    def from_changes(cls, manifest, changes: dict, loaded, categories=None, stubbed=()) -> "ReloadPlan":
+        """
+        Args:
+            manifest (ExtensionManifest): The already refreshed manifest.
+            changes (dict): `added`, `changed` and `removed` module names.
+            loaded: Names of the currently loaded extensions.
+            categories: Categories extensions are loaded for, or None for all.
+            stubbed: Names of the extensions the lazy registry holds stubs for.
+        """
+        plan = cls()
+        loaded, stubbed = set(loaded), set(stubbed)
+        for module in sorted(changes["changed"]) + sorted(changes["added"]):
+            entry = manifest.get(module)
+            if entry is None:
+                continue
+            if not entry["is_extension"]:
+                plan.components.append(module)
+            elif module in loaded:
+                plan.reload.append(module)
+            elif module in stubbed:
+                plan.restub.append(module)
+            elif categories is None or entry["category"] in categories:
+                plan.load.append(module)
+        for module in sorted(changes["removed"]):
+            if module in loaded:
+                plan.unload.append(module)
+            else:
+                if module in stubbed:
+                    plan.restub.append(module)
+                plan.dropped_components.append(module)
+        return plan
+
+    def __bool__(self) -> bool:
+        return any((self.reload, self.restub, self.load, self.unload, self.components, self.dropped_components))
+
+    def describe(self) -> str:
+        return (f"{len(self.reload)} to reload, {len(self.load)} to load, {len(self.unload)} to unload, "
+                f"{len(self.restub)} lazy stubs, {len(self.components)} component modules, "
+                f"{len(self.dropped_components)} removed modules")
+
+
+class ReloadReport:
+    """Per-module outcome and wall time of an incremental reload."""
+    def __init__(self):
+        self.rows = []  # (module, action, seconds, status)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, module: str, action: str, seconds: float, status: str = "OK"):
+        self.rows.append((module, action, seconds, status))
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for row in self.rows if row[3] != "OK")
+
+    def format_summary(self, limit: int = None) -> str:
+        """Renders one line per module, slowest first."""
+        if not self.rows:
+            return "No changed modules; nothing was reloaded."
+        rows = sorted(self.rows, key=lambda row: row[2], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        width = max(len(row[0]) for row in rows)
+        lines = [f"{module:<{width}}  {action:<9}  {seconds * 1000:>8.1f}ms  {status}"
+                 for module, action, seconds, status in rows]
+        if limit and len(self.rows) > limit:
+            lines.append(f"... and {len(self.rows) - limit} more.")
+        lines.append(f"{len(self.rows)} modules in {self.elapsed:.2f}s, {self.failed} failed.")
+        return "\n".join(lines)
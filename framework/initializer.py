@@ -0,0 +1,182 @@
+"""
+    Component Initialization
+    ------------------------
+
+    Discovers the component modules listed in the manifest, adopts their
+    classes into the component registry, and initializes one instance of
+    each concurrently, honouring declared dependencies.
+
+    A component class (or its module) may declare `DEPENDS_ON`: a list of
+    component keys (`<module>.<ClassName>`) or bare class names. A
+    component's `initialize()` starts once all of its dependencies are
+    ready, under a global concurrency cap; everything without
+    dependencies starts right away. Cycles and failed dependencies are
+    reported and their dependents are not initialized.
+    """
+
+import asyncio
+import importlib
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class InitReport:
+    """Outcome of an initialization run."""
+    def __init__(self):
+        self.ready = 0
+        self.failed = {}  # key -> reason
+        self.elapsed = 0.0
+        self.serial_seconds = 0.0
+
+    def format_summary(self) -> str:
+        line = (f"Initialized {self.ready} components in {self.elapsed:.2f}s "
+                f"({self.serial_seconds:.2f}s of initialize() time), {len(self.failed)} failed.")
+        for key, reason in list(self.failed.items())[:10]:
+            line += f"\n- {key}: {reason}"
+        return line
+
+
+class ComponentInitializer:
+    """
+    Dependency-ordered concurrent initializer.
+
+    Attributes:
+        registry (ComponentRegistry): Adopts the discovered classes.
+        max_concurrency (int): `initialize()` calls allowed to run at once.
+        class_hooks (list): Callables `hook(cls, module_name)` run on each
+            adopted class before it is instantiated.
+        components (dict): Component key -> instance.
+        dependencies (dict): Component key -> keys it depends on.
+    """
+    def __init__(self, registry, max_concurrency: int = 256, class_hooks: list = None):
+        self.registry = registry
+        self.max_concurrency = max_concurrency
+        self.class_hooks = list(class_hooks or [])
+        self.components = {}
+        self.dependencies = {}
+        self._declared = {}
+
+    def discover(self, module_names: list) -> int:
+        """
+        Imports and adopts the component modules and creates one instance
+        per class. Pure Python; safe to run in a worker thread.
+        Returns the number of new components.
+        """
+        added = 0
+        for module_name in module_names:
+            try:
+                lib = importlib.import_module(module_name)
+            except Exception as e:
+                log.error(f"Failed to import component module {module_name}: {type(e).__name__}: {e}")
+                continue
+            for cls in self.registry.adopt_module(lib):
+                key = f"{module_name}.{cls.__name__}"
+                if key in self.components:
+                    continue
+                for hook in self.class_hooks:
+                    hook(cls, module_name)
+                self.components[key] = cls()
+                self._declared[key] = list(getattr(cls, "DEPENDS_ON", None) or getattr(lib, "DEPENDS_ON", None) or [])
+                added += 1
+        self._resolve_dependencies()
+        return added
+
+    def forget(self, module_names) -> list:
+        """
+        Drops the components of `module_names` (e.g. before they are
+        re-imported) and returns their keys.
+        """
+        module_names = set(module_names)
+        removed = [key for key in self.components if key.rsplit(".", 1)[0] in module_names]
+        for key in removed:
+            del self.components[key]
+            self.dependencies.pop(key, None)
+            self._declared.pop(key, None)
+        for module_name in module_names:
+            self.registry.forget_module(module_name)
+        self._resolve_dependencies()
+        return removed
+
+    def _resolve_dependencies(self):
+        by_class = {}
+        for key in self.components:
+            by_class.setdefault(key.rsplit(".", 1)[1], []).append(key)
+        for key, declared in self._declared.items():
+            resolved = []
+            for dependency in declared:
+                if dependency in self.components:
+                    resolved.append(dependency)
+                elif len(by_class.get(dependency, ())) == 1:
+                    resolved.append(by_class[dependency][0])
+                else:
+                    log.warning(f"Component {key} declares unknown or ambiguous dependency '{dependency}'; ignoring it.")
+            self.dependencies[key] = resolved
+
+    def find_cycles(self) -> set:
+        """Returns the keys on or behind a dependency cycle."""
+        indegree = {key: 0 for key in self.dependencies}
+        dependents = {key: [] for key in self.dependencies}
+        for key, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                indegree[key] += 1
+                dependents[dependency].append(key)
+        pending = [key for key, degree in indegree.items() if degree == 0]
+        while pending:
+            key = pending.pop()
+            for dependent in dependents[key]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    pending.append(dependent)
+        return {key for key, degree in indegree.items() if degree > 0}
+
+    async def initialize_all(self) -> InitReport:
+        """Initializes every discovered, not yet initialized component."""
+        report = InitReport()
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        cyclic = self.find_cycles()
+        for key in cyclic:
+            report.failed[key] = "dependency cycle"
+            self.registry.mark_failed(self.components[key])
+        tasks = {}
+
+        async def initialize(key: str) -> bool:
+            component = self.components[key]
+            for dependency in self.dependencies.get(key, ()):
+                if not await tasks[dependency]:
+                    report.failed[key] = f"dependency {dependency} failed"
+                    self.registry.mark_failed(component)
+                    return False
+            if component._initialized:
+                return True
+            async with semaphore:
+                init_started = time.perf_counter()
+                try:
+                    await component.initialize()
+                except Exception as e:
+                    report.failed[key] = f"{type(e).__name__}: {e}"
+                    self.registry.mark_failed(component)
+                    return False
+                finally:
+                    report.serial_seconds += time.perf_counter() - init_started
+            report.ready += 1
+            return True
+
+        for key in self.components:
+            if key in cyclic:
+                tasks[key] = asyncio.get_running_loop().create_future()
+                tasks[key].set_result(False)
+            else:
+                tasks[key] = asyncio.ensure_future(initialize(key))
+        await asyncio.gather(*tasks.values())
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def get(self, key: str):
+        return self.components.get(key)
+
+    async def wait_ready(self, key: str, timeout: float = None) -> bool:
+        """Waits for component `key` to be initialized."""
+        return await self.components[key].wait_ready(timeout)
@@ -0,0 +1,150 @@
+"""
+    Gateway Requirements
+    --------------------
+
+    Categories declare the gateway data they need in their package
+    `__init__.py`; individual extensions may add to that with the same
+    module-level names (picked up by the manifest index):
+
+        REQUIRED_INTENTS = ["members", "moderation"]
+        MEMBER_CACHE_FLAGS = ["joined"]
+        CHUNK_GUILDS_AT_STARTUP = False
+
+    `compute_gateway_plan` unions the declarations of the categories enabled
+    in a deployment. The plan is turned into `discord.Intents` and
+    `discord.MemberCacheFlags`, and `format_savings_report` estimates what
+    the intents left off save compared to enabling everything.
+    """
+
+import ast
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+# Prefix commands cannot work without these.
+BASELINE_INTENTS = {"guilds", "guild_messages", "dm_messages", "message_content"}
+
+# Intents the bot enabled unconditionally before requirements were declared.
+LEGACY_INTENTS = {
+    "guilds", "members", "moderation", "emojis_and_stickers", "integrations", "webhooks", "invites",
+    "voice_states", "presences", "guild_messages", "dm_messages", "guild_reactions", "dm_reactions",
+    "guild_typing", "dm_typing", "message_content", "guild_scheduled_events", "auto_moderation_configuration",
+    "auto_moderation_execution",
+}
+
+# Rough share of gateway dispatch volume per intent on a typical large bot,
+# and resident cost per cached member. Used for estimates only.
+EVENT_SHARE = {
+    "presences": 0.55, "guild_typing": 0.10, "guild_messages": 0.12, "members": 0.06,
+    "voice_states": 0.04, "guild_reactions": 0.05, "dm_typing": 0.01, "dm_messages": 0.01,
+    "dm_reactions": 0.005, "moderation": 0.005, "invites": 0.005, "emojis_and_stickers": 0.005,
+    "integrations": 0.005, "webhooks": 0.005, "guild_scheduled_events": 0.005, "guilds": 0.02,
+}
+PRESENCE_BYTES_PER_MEMBER = 600
+MEMBER_BYTES = 400
+_MEMBER_CACHE_REQUIRES = {"joined": "members", "voice": "voice_states"}
+
+_DECLARATIONS = ("REQUIRED_INTENTS", "MEMBER_CACHE_FLAGS", "CHUNK_GUILDS_AT_STARTUP")
+
+
+def read_declarations(source: str) -> dict:
+    """Returns the literal gateway declarations at the top level of `source`."""
+    found = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in _DECLARATIONS:
+                found[name] = ast.literal_eval(node.value)
+    return found
+
+
+def read_category_requirements(root_dir: str, package: str, category: str) -> dict:
+    """Reads the declarations from `<package>/<category>/__init__.py`."""
+    path = os.path.join(root_dir, package, category, "__init__.py")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return read_declarations(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+class GatewayPlan:
+    """Union of the gateway requirements of the enabled categories."""
+    def __init__(self):
+        self.intents = set(BASELINE_INTENTS)
+        self.member_cache = set()
+        self.chunk_guilds = False
+        self.sources = {}  # intent -> categories/extensions that asked for it
+
+    def add(self, declarations: dict, source: str):
+        for intent in declarations.get("REQUIRED_INTENTS", []):
+            self.intents.add(intent)
+            self.sources.setdefault(intent, []).append(source)
+        self.member_cache.update(declarations.get("MEMBER_CACHE_FLAGS", []))
+        self.chunk_guilds = self.chunk_guilds or bool(declarations.get("CHUNK_GUILDS_AT_STARTUP", False))
+
+    def effective_member_cache(self) -> set:
+        """Member cache flags whose backing intent is enabled (discord.py rejects the rest)."""
+        return {flag for flag in self.member_cache if _MEMBER_CACHE_REQUIRES.get(flag) in self.intents}
+
+    def to_discord(self):
+        """Returns `(discord.Intents, discord.MemberCacheFlags, chunk_guilds_at_startup)`."""
+        import discord
+        intents = discord.Intents.none()
+        for intent in self.intents:
+            setattr(intents, intent, True)
+        member_cache = discord.MemberCacheFlags.none()
+        for flag in self.effective_member_cache():
+            setattr(member_cache, flag, True)
+        # Chunking without the members intent is rejected by the gateway.
+        return intents, member_cache, self.chunk_guilds and "members" in self.intents
+
+
+def compute_gateway_plan(root_dir: str, package: str, categories: list, manifest=None) -> GatewayPlan:
+    """Builds the plan for `categories`, including per-extension declarations from `manifest`."""
+    plan = GatewayPlan()
+    for category in categories:
+        plan.add(read_category_requirements(root_dir, package, category), category)
+    if manifest is not None:
+        enabled = set(categories)
+        for entry in manifest.entries.values():
+            if entry.get("gateway") and entry["category"] in enabled:
+                plan.add(entry["gateway"], entry["module"])
+    return plan
+
+
+def format_savings_report(plan: GatewayPlan, average_members: int = 1000, guilds: int = 1000) -> str:
+    """Estimates event volume and memory saved versus the legacy all-intents configuration."""
+    dropped = sorted(LEGACY_INTENTS - plan.intents)
+    legacy_volume = sum(EVENT_SHARE.get(intent, 0.0) for intent in LEGACY_INTENTS)
+    kept_volume = sum(EVENT_SHARE.get(intent, 0.0) for intent in plan.intents & LEGACY_INTENTS)
+    event_saving = 1 - kept_volume / legacy_volume if legacy_volume else 0.0
+
+    members = average_members * guilds
+    legacy_bytes = members * (MEMBER_BYTES + PRESENCE_BYTES_PER_MEMBER)
+    kept_bytes = 0
+    if "members" in plan.intents and plan.effective_member_cache():
+        kept_bytes += members * MEMBER_BYTES
+    if "presences" in plan.intents:
+        kept_bytes += members * PRESENCE_BYTES_PER_MEMBER
+    memory_saving_mb = (legacy_bytes - kept_bytes) / (1024 * 1024)
+
+    if not plan.chunk_guilds:
+        chunking = "off"
+    elif "members" in plan.intents:
+        chunking = "on"
+    else:
+        chunking = "off (requested, but 'members' is disabled)"
+
+    lines = [
+        f"Enabled intents: {', '.join(sorted(plan.intents))}",
+        f"Disabled vs legacy: {', '.join(dropped) if dropped else 'none'}",
+        f"Member cache flags: {', '.join(sorted(plan.effective_member_cache())) or 'none'}; chunk guilds at startup: {chunking}",
+        f"Estimated gateway event volume saved: {event_saving:.0%}",
+        f"Estimated member/presence cache saved: ~{memory_saving_mb:,.0f} MB (for {guilds} guilds x {average_members} members)",
+    ]
+    for intent in ("presences", "members"):
+        if intent in plan.intents:
+            lines.append(f"'{intent}' requested by: {', '.join(sorted(set(plan.sources.get(intent, []))))}")
+    return "\n".join(lines)
@@ -0,0 +1,187 @@
+"""
+    Lazy Extension Registry
+    -----------------------
+
+    Registers lightweight command stubs (name, cooldown, guild_only) from
+    the manifest's static index instead of importing every extension at
+    boot. The real module, and with it the cog's `_load_config` and
+    `periodic_update_task`, is loaded the first time one of its commands
+    is invoked or one of its listeners is needed, and unloaded again once
+    it has been idle for `idle_unload_seconds`.
+    """
+
+import asyncio
+import logging
+import time
+
+from discord.ext import commands
+
+from .loader import deactivate_extension
+
+log = logging.getLogger(__name__)
+
+
+class LazyExtensionRegistry:
+    """
+    Tracks extensions that are represented by stubs until first use.
+
+    Attributes:
+        bot (commands.Bot): The bot stubs are registered on.
+        manifest (ExtensionManifest): Source of the static command index.
+        loader (ParallelExtensionLoader): Used to load real extensions on demand.
+        router (CommandRouter): Decides the names stubs are registered under,
+            so they match what the real cog will register. Optional.
+        idle_unload_seconds (float): Quiet period before a lazily loaded
+            extension is unloaded again. 0 disables idle unloading.
+        sweep_interval (float): Seconds between idle sweeps.
+    """
+    def __init__(self, bot: commands.Bot, manifest, loader, idle_unload_seconds: float = 1800, sweep_interval: float = 60,
+                 router=None):
+        self.bot = bot
+        self.manifest = manifest
+        self.loader = loader
+        self.router = router
+        self.idle_unload_seconds = idle_unload_seconds
+        self.sweep_interval = sweep_interval
+        self.lazy_loaded = set()
+        self._stubs = {}  # module -> stub command names
+        self._listener_modules = {}  # event -> modules waiting on it
+        self._listener_stubs = {}  # event -> stub listener
+        self._last_used = {}
+        self._loading = {}
+        self._sweeper = None
+        self.bot.add_listener(self._on_command, 'on_command')
+
+    def register(self, names: list):
+        """Registers stubs for every extension in `names` that is not loaded or stubbed yet."""
+        for name in names:
+            if name in self.bot.extensions or name in self._stubs:
+                continue
+            self.lazy_loaded.discard(name)
+            self._register_stubs(name)
+        log.info(f"Registered lazy stubs for {len(self._stubs)} extensions.")
+        if self.idle_unload_seconds and self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_idle())
+
+    def refresh(self, names: list):
+        """Rebuilds the stubs of `names` from the current manifest; removed modules just lose theirs."""
+        for name in names:
+            if name not in self._stubs:
+                continue
+            self._unregister_stubs(name)
+            if self.manifest.get(name) is not None:
+                self._register_stubs(name)
+
+    def is_stubbed(self, name: str) -> bool:
+        return name in self._stubs
+
+    @property
+    def stubbed(self):
+        """Names of the extensions currently represented by stubs."""
+        return self._stubs.keys()
+
+    def _register_stubs(self, module: str):
+        entry = self.manifest.get(module)
+        registered = []
+        for meta in entry.get("commands", []):
+            name, aliases = meta["name"], []
+            if self.router is not None:
+                name, aliases = self.router.plan(module, name, meta["aliases"], self.bot.all_commands)
+            if self.bot.get_command(name) is not None:
+                log.warning(f"Command '{name}' already registered; no stub created for {module}.")
+                continue
+            self.bot.add_command(self._make_stub(module, meta, name, aliases))
+            registered.append(name)
+        for event in entry.get("listeners", []):
+            waiting = self._listener_modules.setdefault(event, set())
+            waiting.add(module)
+            if event not in self._listener_stubs:
+                self._listener_stubs[event] = self._make_listener_stub(event)
+                self.bot.add_listener(self._listener_stubs[event], event)
+        self._stubs[module] = registered
+
+    def _unregister_stubs(self, module: str):
+        for command_name in self._stubs.pop(module, []):
+            self.bot.remove_command(command_name)
+        for event, waiting in list(self._listener_modules.items()):
+            waiting.discard(module)
+            if not waiting:
+                del self._listener_modules[event]
+                self.bot.remove_listener(self._listener_stubs.pop(event), event)
+
+    def _make_stub(self, module: str, meta: dict, name: str, aliases: list) -> commands.Command:
+        registry = self
+
+        async def lazy_stub(ctx, *, args: str = None):
+            await registry.ensure_loaded(module)
+            # Re-dispatch the original message so the real command runs its own checks and cooldowns.
+            real_ctx = await ctx.bot.get_context(ctx.message)
+            await ctx.bot.invoke(real_ctx)
+
+        command = commands.Command(lazy_stub, name=name, aliases=aliases, help=f"Loads {module} on first use.", extras={"lazy_module": module})
+        if meta.get("cooldown"):
+            rate, per, bucket = meta["cooldown"]
+            command = commands.cooldown(rate, per, getattr(commands.BucketType, bucket))(command)
+        if meta.get("guild_only"):
+            command = commands.guild_only()(command)
+        return command
+
+    def _make_listener_stub(self, event: str):
+        registry = self
+
+        async def lazy_listener(*args, **kwargs):
+            for module in list(registry._listener_modules.get(event, ())):
+                await registry.ensure_loaded(module)
+                cog = registry.bot.get_cog(registry.manifest.get(module)["cog"])
+                if cog is None:
+                    continue
+                # The real listener missed this dispatch; deliver it directly.
+                for name, method in cog.get_listeners():
+                    if name == event:
+                        await method(*args, **kwargs)
+
+        lazy_listener.__name__ = event
+        return lazy_listener
+
+    async def ensure_loaded(self, module: str):
+        """Loads `module` if it is still a stub. Concurrent callers share one load."""
+        if module in self.bot.extensions:
+            self._last_used[module] = time.monotonic()
+            return
+        task = self._loading.get(module)
+        if task is None:
+            task = asyncio.create_task(self._load(module))
+            self._loading[module] = task
+            task.add_done_callback(lambda _: self._loading.pop(module, None))
+        await asyncio.shield(task)
+
+    async def _load(self, module: str):
+        self._unregister_stubs(module)
+        report = await self.loader.load([module])
+        if report.loaded != 1:
+            self._register_stubs(module)
+            raise commands.CommandError(f"Module {module} failed to load on demand.")
+        self.lazy_loaded.add(module)
+        self._last_used[module] = time.monotonic()
+        log.info(f"Lazily loaded {module} in {report.elapsed * 1000:.1f}ms.")
+
+    async def _on_command(self, ctx):
+        if ctx.cog is not None:
+            self._last_used[type(ctx.cog).__module__] = time.monotonic()
+
+    async def _sweep_idle(self):
+        """Unloads lazily loaded extensions that have been idle past the quiet period."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            cutoff = time.monotonic() - self.idle_unload_seconds
+            for module in [m for m in self.lazy_loaded if self._last_used.get(m, 0) < cutoff]:
+                self.lazy_loaded.discard(module)
+                if module not in self.bot.extensions:
+                    continue
+                try:
+                    await deactivate_extension(self.bot, module)
+                except Exception as e:
+                    log.error(f"Failed to unload idle extension {module}. Error: {type(e).__name__}: {e}")
+                    continue
+                self._register_stubs(module)
+                log.info(f"Unloaded idle extension {module}; stubs restored.")
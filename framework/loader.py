@@ -0,0 +1,160 @@
+"""
+    Parallel Extension Loader
+    -------------------------
+
+    Replaces the serial `os.walk` + `load_extension` loop. Extension
+    modules listed in the manifest are imported concurrently in a bounded
+    thread pool; only `setup()` (and therefore `add_cog`) runs on the event
+    loop, in manifest order so command registration stays deterministic.
+    """
+
+import asyncio
+import importlib.util
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from discord.ext import commands, tasks
+
+from .scheduler import ScheduledLoop
+
+log = logging.getLogger(__name__)
+
+
+def _import_extension(name: str):
+    """Executes an extension module off the event loop. Runs in a worker thread."""
+    started = time.perf_counter()
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise commands.ExtensionNotFound(name)
+    lib = importlib.util.module_from_spec(spec)
+    sys.modules[name] = lib
+    try:
+        spec.loader.exec_module(lib)
+    except Exception as e:
+        sys.modules.pop(name, None)
+        raise commands.ExtensionFailed(name, e) from e
+    return lib, time.perf_counter() - started
+
+
+async def activate_extension(bot: commands.Bot, name: str, lib) -> None:
+    """
+    Runs `setup()` for an already imported extension module and registers it
+    with the bot, mirroring `Bot.load_extension` minus the module execution.
+    """
+    # discord.py keeps loaded extensions in a name-mangled private mapping.
+    extensions = bot._BotBase__extensions
+    if name in extensions:
+        raise commands.ExtensionAlreadyLoaded(name)
+    setup = getattr(lib, 'setup', None)
+    if setup is None:
+        sys.modules.pop(name, None)
+        raise commands.NoEntryPointError(name)
+    try:
+        await setup(bot)
+    except Exception as e:
+        sys.modules.pop(name, None)
+        await bot._remove_module_references(lib.__name__)
+        await bot._call_module_finalizers(lib, name)
+        raise commands.ExtensionFailed(name, e) from e
+    extensions[name] = lib
+
+
+async def deactivate_extension(bot: commands.Bot, name: str) -> None:
+    """
+    Unloads an extension after cancelling the background loops of its cogs.
+    Module teardowns look their cog up after it has already been removed,
+    so without this their `tasks.loop`s (or the scheduler jobs replacing
+    them) would outlive the extension.
+    """
+    for cog in list(bot.cogs.values()):
+        if type(cog).__module__ != name:
+            continue
+        for attr_name, attr in vars(type(cog)).items():
+            if isinstance(attr, (tasks.Loop, ScheduledLoop)):
+                getattr(cog, attr_name).cancel()
+    await bot.unload_extension(name)
+
+
+class LoadReport:
+    """Per-extension timings and outcome of a loader run."""
+    def __init__(self):
+        self.rows = []  # (module, import_seconds, setup_seconds, status)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, module: str, import_s: float, setup_s: float, status: str):
+        self.rows.append((module, import_s, setup_s, status))
+
+    @property
+    def loaded(self) -> int:
+        return sum(1 for row in self.rows if row[3] == "OK")
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for row in self.rows if row[3] not in ("OK", "SKIPPED"))
+
+    def format_table(self, limit: int = None) -> str:
+        """Renders the timing table, slowest extensions first."""
+        rows = sorted(self.rows, key=lambda row: row[1] + row[2], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        width = max([len("Extension")] + [len(row[0]) for row in rows])
+        lines = [f"{'Extension':<{width}}  {'Import ms':>10}  {'Setup ms':>10}  Status"]
+        lines.append("-" * len(lines[0]))
+        for module, import_s, setup_s, status in rows:
+            lines.append(f"{module:<{width}}  {import_s * 1000:>10.1f}  {setup_s * 1000:>10.1f}  {status}")
+        lines.append(f"Total wall time: {self.elapsed:.2f}s, Loaded: {self.loaded}, Failed: {self.failed}.")
+        return "\n".join(lines)
+
+
+class ParallelExtensionLoader:
+    """
+    Loads manifest extensions with concurrent imports.
+
+    Attributes:
+        bot (commands.Bot): The bot the extensions are registered on.
+        manifest (ExtensionManifest): Source of extension names.
+        max_workers (int): Size of the import thread pool.
+        module_hooks (list): Callables `hook(name, module)` run on the event
+            loop after an extension is imported and before its `setup()`.
+    """
+    def __init__(self, bot: commands.Bot, manifest, max_workers: int = 8, module_hooks: list = None):
+        self.bot = bot
+        self.manifest = manifest
+        self.max_workers = max_workers
+        self.module_hooks = list(module_hooks or [])
+
+    async def load(self, names: list) -> LoadReport:
+        """Imports `names` concurrently and activates them in the given order."""
+        report = LoadReport()
+        loop = asyncio.get_running_loop()
+        pending = [name for name in names if name not in self.bot.extensions]
+        for name in names:
+            if name in self.bot.extensions:
+                report.record(name, 0.0, 0.0, "SKIPPED")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ext-import") as pool:
+            futures = [(name, loop.run_in_executor(pool, _import_extension, name)) for name in pending]
+            for name, future in futures:
+                try:
+                    lib, import_s = await future
+                except Exception as e:
+                    report.record(name, 0.0, 0.0, f"IMPORT FAILED: {type(e).__name__}")
+                    log.error(f"Failed to import {name}. Error: {type(e).__name__}: {e}")
+                    continue
+                setup_started = time.perf_counter()
+                try:
+                    for hook in self.module_hooks:
+                        hook(name, lib)
+                    await activate_extension(self.bot, name, lib)
+                except Exception as e:
+                    report.record(name, import_s, time.perf_counter() - setup_started, f"SETUP FAILED: {type(e).__name__}")
+                    log.error(f"Failed to load {name}. Error: {type(e).__name__}: {e}")
+                    continue
+                report.record(name, import_s, time.perf_counter() - setup_started, "OK")
+                log.debug(f"Successfully loaded: {name}")
+
+        report.elapsed = time.perf_counter() - report.started
+        return report
@@ -0,0 +1,237 @@
+"""
+    Queue-Based Logging Pipeline
+    ----------------------------
+
+    Moves log I/O off the event loop. The only handler on the root logger
+    is a `QueueHandler` whose `emit()` is a queue put; the record is left
+    unformatted and every handler (console, rotating file, JSON lines) runs
+    on one listener thread. The listener drains the queue in batches and
+    each file handler writes a whole batch with a single `write()`.
+
+    The handler cogs attach their own `StreamHandler` at import time, which
+    printed every record twice and formatted it on the loop; `adopt_module`
+    strips those handlers so their records reach the queue by propagation.
+    """
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+DEFAULT_FORMAT = '%(asctime)s | %(levelname)s | %(name)s | %(message)s'
+_STOP = object()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    `QueueHandler` that enqueues the record as is. The stock `prepare()`
+    formats the message on the calling thread; here formatting (and the
+    `%`-merge of arguments) happens on the listener thread.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class BatchingFileHandler(logging.Handler):
+    """
+    File handler that buffers formatted lines until `flush()` and rotates
+    by size and by age. Used from the listener thread only.
+
+    Attributes:
+        path (str): Active log file.
+        max_bytes (int): Rotate before the file would exceed this size (0 disables).
+        rotate_interval (float): Rotate once the file has been open this many
+            seconds (0 disables). Age counts from when this handler opened
+            or created the file; ctime is not a creation time on Linux.
+        backup_count (int): Rotated files kept as `<path>.1` ... `<path>.<n>`.
+    """
+    def __init__(self, path: str, max_bytes: int = 0, rotate_interval: float = 0, backup_count: int = 5,
+                 clock=time.time):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self._buffer = []
+        self._stream = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._clock = clock
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Binary, so sizes are the encoded byte counts.
+        self._stream = open(self.path, 'ab')
+        self._size = self._stream.tell()
+        self._opened_at = self._clock()
+
+    def _rotate(self):
+        self._stream.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._stream = open(self.path, 'ab')
+        self._size = 0
+        self._opened_at = self._clock()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._buffer.append(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data, self._buffer = "".join(self._buffer).encode('utf-8'), []
+        if self._stream is None:
+            self._open()
+        too_big = self.max_bytes and self._size and self._size + len(data) > self.max_bytes
+        too_old = self.rotate_interval and self._clock() - self._opened_at >= self.rotate_interval
+        if too_big or too_old:
+            self._rotate()
+        self._stream.write(data)
+        self._stream.flush()
+        self._size += len(data)
+
+    def close(self):
+        self.flush()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+class LogPipeline:
+    """
+    Listener thread draining the log queue into the real handlers.
+
+    Attributes:
+        handlers (list): Handlers run on the listener thread.
+        batch_size (int): Records handled before the handlers are flushed.
+        flush_interval (float): Longest time a record waits in a buffer.
+        processed (int): Records handled so far.
+    """
+    def __init__(self, handlers: list, batch_size: int = 256, flush_interval: float = 1.0):
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        self.processed = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-pipeline", daemon=True)
+        self._thread.start()
+
+    def _handle(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        self.processed += 1
+
+    def _flush(self):
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception as e:
+                print(f"Log pipeline flush failed for {handler!r}: {e}", file=sys.stderr)
+
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            stop = record is _STOP
+            batch = 0
+            while not stop:
+                self._handle(record)
+                batch += 1
+                if batch >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                stop = record is _STOP
+            self._flush()
+            if stop:
+                return
+
+    def stop(self):
+        """Drains the queue, flushes and closes the handlers. Safe to call twice."""
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+
+def install(log_path: str, level: str = "INFO", json_lines: bool = False, console: bool = True,
+            batch_size: int = 256, flush_interval: float = 1.0, max_bytes: int = 0,
+            rotate_interval: float = 0, backup_count: int = 5, filters: list = None) -> LogPipeline:
+    """
+    Replaces the root logger's handlers with the queue pipeline and starts it.
+    `filters` run on the queue handler, i.e. before a record is enqueued.
+    """
+    formatter = JsonLinesFormatter() if json_lines else logging.Formatter(DEFAULT_FORMAT)
+    file_handler = BatchingFileHandler(log_path, max_bytes, rotate_interval, backup_count)
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        handlers.append(console_handler)
+
+    pipeline = LogPipeline(handlers, batch_size, flush_interval)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = DeferredQueueHandler(pipeline.queue)
+    for log_filter in filters or []:
+        queue_handler.addFilter(log_filter)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    pipeline.start()
+    atexit.register(pipeline.stop)
+    return pipeline
+
+
+def adopt_module(lib, level: str = None):
+    """
+    Removes the handlers a module attached to its own logger so its records
+    only travel through the queue, and optionally overrides its level.
+    """
+    logger = logging.getLogger(lib.__name__)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if level:
+        logger.setLevel(level)
@@ -0,0 +1,132 @@
+"""
+    Log Sampling and Rate Limiting
+    ------------------------------
+
+    Per-subsystem log policies, applied as a filter on the queue handler so
+    dropped records never reach the listener thread. Policies are matched
+    against logger names with shell-style patterns; the most specific
+    pattern wins, e.g. `Modules.Messages.*` over `Modules.*`.
+
+    A policy may set:
+
+    * `sample`: fraction of records kept, applied deterministically per
+      message template (every 4th record at 0.25);
+    * `rate_limit` / `window_seconds`: records per template per window;
+      once a window closes with drops, the next kept record is preceded by
+      a "suppressed N similar" summary.
+
+    A template is a logging call site (logger, file and line), since the
+    generated modules log f-strings whose text differs on every call.
+    Records at or above `exempt_level` always pass. Counters for seen and
+    dropped records are kept per template either way.
+    """
+
+import fnmatch
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class TemplateCounters:
+    """Counters and window state of one logging call site."""
+    __slots__ = ("seen", "emitted", "sampled_out", "rate_limited", "window_start", "window_count", "window_suppressed")
+
+    def __init__(self):
+        self.seen = self.emitted = self.sampled_out = self.rate_limited = 0
+        self.window_start = 0.0
+        self.window_count = self.window_suppressed = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.sampled_out + self.rate_limited
+
+
+class LogPolicyFilter(logging.Filter):
+    """
+    Applies sampling and rate-limit policies by logger name.
+
+    Attributes:
+        policies (dict): Logger name pattern -> policy dict.
+        exempt_level (int): Records at or above this level bypass all policies.
+        templates (dict): (logger, pathname, lineno) -> TemplateCounters.
+    """
+    def __init__(self, policies: dict, exempt_level=logging.WARNING, clock=time.monotonic):
+        super().__init__()
+        # Longest pattern first, so the most specific match wins.
+        self.policies = dict(sorted(policies.items(), key=lambda item: len(item[0]), reverse=True))
+        self.exempt_level = exempt_level if isinstance(exempt_level, int) else logging.getLevelName(exempt_level)
+        self.templates = {}
+        self._clock = clock
+        self._policy_cache = {}
+        self._lock = threading.Lock()
+
+    def policy_for(self, logger_name: str):
+        try:
+            return self._policy_cache[logger_name]
+        except KeyError:
+            pass
+        policy = next((policy for pattern, policy in self.policies.items() if fnmatch.fnmatchcase(logger_name, pattern)), None)
+        self._policy_cache[logger_name] = policy
+        return policy
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "log_policy_summary", False):
+            return True
+        policy = self.policy_for(record.name)
+        if policy is None:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        summary = 0
+        with self._lock:
+            counters = self.templates.get(key)
+            if counters is None:
+                counters = self.templates[key] = TemplateCounters()
+            counters.seen += 1
+            if record.levelno < self.exempt_level:
+                sample = policy.get("sample", 1.0)
+                if sample < 1.0 and int(counters.seen * sample) == int((counters.seen - 1) * sample):
+                    counters.sampled_out += 1
+                    return False
+                rate_limit = policy.get("rate_limit")
+                if rate_limit:
+                    now = self._clock()
+                    if now - counters.window_start >= policy.get("window_seconds", 60.0):
+                        summary = counters.window_suppressed
+                        counters.window_start, counters.window_count, counters.window_suppressed = now, 0, 0
+                    if counters.window_count >= rate_limit:
+                        counters.window_suppressed += 1
+                        counters.rate_limited += 1
+                        return False
+                    counters.window_count += 1
+            counters.emitted += 1
+        if summary:
+            logging.getLogger(record.name).log(
+                record.levelno, "Suppressed %d similar messages from %s:%d in the last window.",
+                summary, record.pathname, record.lineno, extra={"log_policy_summary": True})
+        return True
+
+    def stats(self) -> dict:
+        """Totals over all templates."""
+        with self._lock:
+            counters = list(self.templates.values())
+        return {
+            "templates": len(counters),
+            "seen": sum(c.seen for c in counters),
+            "emitted": sum(c.emitted for c in counters),
+            "sampled_out": sum(c.sampled_out for c in counters),
+            "rate_limited": sum(c.rate_limited for c in counters),
+        }
+
+    def format_report(self, limit: int = 10) -> str:
+        """Totals and the call sites with the most dropped records."""
+        totals = self.stats()
+        lines = [f"{totals['seen']} records from {totals['templates']} call sites: {totals['emitted']} emitted, "
+                 f"{totals['sampled_out']} sampled out, {totals['rate_limited']} rate limited."]
+        with self._lock:
+            noisy = sorted(self.templates.items(), key=lambda item: item[1].dropped, reverse=True)[:limit]
+        for (name, pathname, lineno), c in noisy:
+            if c.dropped:
+                lines.append(f"{name}:{lineno}: seen={c.seen} dropped={c.dropped}")
+        return "\n".join(lines)
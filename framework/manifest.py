@@ -0,0 +1,189 @@
+"""
+    Extension Manifest
+    ------------------
+
+    Persists the list of loadable extensions under the `Modules` tree,
+    keyed by a content hash of each source file.
+
+    A full scan only stats each file; the file is re-read and re-hashed
+    when its size or modification time changed since the last scan, so a
+    warm boot never opens the thousands of unchanged modules just to
+    decide what to load.
+    """
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+
+from .intents import read_declarations
+from .settings import write_atomic
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 4
+
+# A module is an extension when it defines a top-level setup entry point.
+_SETUP_RE = re.compile(rb"^(?:async\s+)?def\s+setup\s*\(", re.MULTILINE)
+_COG_RE = re.compile(rb"^class\s+(\w+)\(commands\.Cog\)", re.MULTILINE)
+# Decorator block of a prefix command, up to the coroutine it decorates.
+_COMMAND_RE = re.compile(rb"@commands\.command\((.*?)\)\s*\n(.*?)async\s+def\s+\w+", re.DOTALL)
+_COMMAND_NAME_RE = re.compile(rb"name\s*=\s*[\"']([^\"']+)[\"']")
+_ALIASES_RE = re.compile(rb"aliases\s*=\s*\[([^\]]*)\]")
+_COOLDOWN_RE = re.compile(rb"@commands\.cooldown\(\s*(\d+)\s*,\s*([\d.]+)\s*,\s*commands\.BucketType\.(\w+)\s*\)")
+_LISTENER_RE = re.compile(rb"@commands\.Cog\.listener\((.*?)\)\s*\n\s*async\s+def\s+(\w+)")
+# Legacy per-cog config file and the defaults `_load_config` falls back to.
+_CONFIG_FILE_RE = re.compile(rb"[\"'](\w+)_config\.json[\"']")
+_CONFIG_DEFAULTS_RE = re.compile(rb"except FileNotFoundError:.*?return (\{.*?\n\s*\})", re.DOTALL)
+
+
+def hash_source(source: bytes) -> str:
+    """Returns the content hash used to key manifest entries."""
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def index_source(source: bytes) -> dict:
+    """
+    Extracts the static command/listener index of an extension from its source.
+    This lets command stubs be registered without importing the module.
+    """
+    cog = _COG_RE.search(source)
+    index = {"cog": cog.group(1).decode() if cog else None, "commands": [], "listeners": []}
+    for match in _COMMAND_RE.finditer(source):
+        args, decorators = match.group(1), match.group(2)
+        name = _COMMAND_NAME_RE.search(args)
+        if not name:
+            continue
+        aliases = _ALIASES_RE.search(args)
+        cooldown = _COOLDOWN_RE.search(decorators)
+        index["commands"].append({
+            "name": name.group(1).decode(),
+            "aliases": re.findall(r"[\"']([^\"']+)[\"']", aliases.group(1).decode()) if aliases else [],
+            "cooldown": [int(cooldown.group(1)), float(cooldown.group(2)), cooldown.group(3).decode()] if cooldown else None,
+            "guild_only": b"@commands.guild_only()" in decorators,
+        })
+    for match in _LISTENER_RE.finditer(source):
+        explicit = _COMMAND_NAME_RE.search(match.group(1)) or re.search(rb"[\"']([^\"']+)[\"']", match.group(1))
+        index["listeners"].append(explicit.group(1).decode() if explicit else match.group(2).decode())
+    config_file = _CONFIG_FILE_RE.search(source)
+    if config_file:
+        index["config_file"] = config_file.group(1).decode()
+    defaults = _CONFIG_DEFAULTS_RE.search(source)
+    if defaults:
+        try:
+            index["config_defaults"] = ast.literal_eval(defaults.group(1).decode('utf-8'))
+        except (SyntaxError, ValueError):
+            pass
+    if b"REQUIRED_INTENTS" in source or b"MEMBER_CACHE_FLAGS" in source or b"CHUNK_GUILDS_AT_STARTUP" in source:
+        try:
+            index["gateway"] = read_declarations(source.decode('utf-8'))
+        except (SyntaxError, ValueError) as e:
+            log.warning(f"Ignoring unreadable gateway declarations in {index['cog']}: {e}")
+    return index
+
+
+class ExtensionManifest:
+    """
+    On-disk index of every module under `package`.
+
+    Attributes:
+        root_dir (str): Repository root the package lives in.
+        package (str): Top-level package to scan, e.g. "Modules".
+        path (str): Location of the persisted manifest file.
+        entries (dict): Relative file path -> entry dict with `module`,
+            `category`, `hash`, `size`, `mtime_ns` and `is_extension`.
+            Extension entries also carry the static index from `index_source`.
+    """
+    def __init__(self, root_dir: str, package: str = "Modules", path: str = None):
+        self.root_dir = root_dir
+        self.package = package
+        self.path = path or os.path.join(root_dir, "data", "extension_manifest.json")
+        self.entries = {}
+
+    def load(self) -> bool:
+        """Loads the persisted manifest. Returns False when it is missing or stale."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            log.info(f"No extension manifest at '{self.path}'. A full scan will be performed.")
+            return False
+        except json.JSONDecodeError as e:
+            log.warning(f"Extension manifest '{self.path}' is corrupt ({e}). Rebuilding.")
+            return False
+        if payload.get("version") != MANIFEST_VERSION or payload.get("package") != self.package:
+            log.info("Extension manifest version or package changed. Rebuilding.")
+            return False
+        self.entries = payload.get("entries", {})
+        return True
+
+    def save(self):
+        """Writes the manifest atomically (unique temp file + rename)."""
+        payload = {"version": MANIFEST_VERSION, "package": self.package, "entries": self.entries}
+        write_atomic(self.path, json.dumps(payload).encode('utf-8'))
+
+    def _iter_sources(self):
+        """Yields (relative_path, os.stat_result) for every module file in the package."""
+        stack = [os.path.join(self.root_dir, self.package)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '__pycache__':
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py") and not entry.name.startswith("__"):
+                        yield os.path.relpath(entry.path, self.root_dir), entry.stat()
+
+    def refresh(self) -> dict:
+        """
+        Rescans the package and updates entries in place.
+
+        Returns:
+            dict: `added`, `changed` and `removed` lists of module names.
+        """
+        changes = {"added": [], "changed": [], "removed": []}
+        seen = set()
+        for rel_path, st in self._iter_sources():
+            seen.add(rel_path)
+            previous = self.entries.get(rel_path)
+            if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+                continue
+            with open(os.path.join(self.root_dir, rel_path), 'rb') as f:
+                source = f.read()
+            digest = hash_source(source)
+            module_name = rel_path[:-3].replace(os.sep, ".")
+            self.entries[rel_path] = {
+                "module": module_name,
+                "category": rel_path.split(os.sep)[1] if rel_path.count(os.sep) > 1 else None,
+                "hash": digest,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "is_extension": bool(_SETUP_RE.search(source)),
+            }
+            if self.entries[rel_path]["is_extension"]:
+                self.entries[rel_path].update(index_source(source))
+            if previous is None:
+                changes["added"].append(module_name)
+            elif previous["hash"] != digest:
+                changes["changed"].append(module_name)
+        for rel_path in set(self.entries) - seen:
+            changes["removed"].append(self.entries.pop(rel_path)["module"])
+        return changes
+
+    def extensions(self, categories=None) -> list:
+        """Returns extension module names in deterministic order, optionally filtered by category."""
+        return sorted(
+            entry["module"] for entry in self.entries.values()
+            if entry["is_extension"] and (categories is None or entry["category"] in categories)
+        )
+
+    def get(self, module_name: str):
+        """Returns the manifest entry for `module_name`, or None."""
+        return self.entries.get(module_name.replace(".", os.sep) + ".py")
+
+    def category_of(self, module_name: str):
+        """Returns the `Modules` category a module belongs to, or None."""
+        parts = module_name.split(".")
+        return parts[1] if len(parts) > 2 and parts[0] == self.package else None
@@ -0,0 +1,249 @@
+"""
+    Outbound Message Dispatcher
+    ---------------------------
+
+    Routes outgoing messages through per-channel queues paced to the
+    channel's message route bucket (`POST /channels/{id}/messages`, by
+    default 5 messages per 5 seconds) and a global request budget, instead
+    of letting bursts run into 429s.
+
+    * Interactive replies (command responses and their error messages)
+      are sent before background announcements queued on the same channel.
+    * Consecutive short plain-text messages to one channel that queued up
+      within `coalesce_window` of each other are merged into a single
+      message while the channel waits for its bucket. Merging only
+      happens under pressure; an idle channel sends immediately.
+    * 429s that discord.py reports (it logs every rate-limited retry on
+      the `discord.http` logger) are counted per route and pause the
+      affected channel's queue for the advertised retry delay.
+
+    Queue depths, merges and 429 counts are kept for `stats()`.
+    """
+
+import asyncio
+import collections
+import heapq
+import itertools
+import logging
+import re
+import time
+
+log = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+MESSAGE_ROUTE = "POST /channels/{id}/messages"
+
+_CHANNEL_RE = re.compile(r"/channels/(\d+)/")
+_API_PREFIX_RE = re.compile(r"^.*?/api(?:/v\d+)?")
+_SNOWFLAKE_RE = re.compile(r"/\d{15,}")
+
+
+class TokenBucket:
+    """Continuously refilling bucket of `rate` tokens per `per` seconds."""
+    __slots__ = ("rate", "per", "tokens", "updated")
+
+    def __init__(self, rate: int, per: float, now: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.per / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate / self.per >= self.rate
+
+
+class OutboundMessage:
+    __slots__ = ("send", "content", "kwargs", "queued_at", "future")
+
+    def __init__(self, send, content, kwargs: dict, queued_at: float, future: asyncio.Future):
+        self.send = send
+        self.content = content
+        self.kwargs = kwargs
+        self.queued_at = queued_at
+        self.future = future
+
+    @property
+    def plain(self) -> bool:
+        return isinstance(self.content, str) and not self.kwargs
+
+
+class ChannelQueue:
+    """Pending messages and route bucket of one channel."""
+    __slots__ = ("channel_id", "heap", "bucket", "blocked_until", "task")
+
+    def __init__(self, channel_id: int, bucket: TokenBucket):
+        self.channel_id = channel_id
+        self.heap = []  # (priority, sequence, OutboundMessage)
+        self.bucket = bucket
+        self.blocked_until = 0.0
+        self.task = None
+
+
+class OutboundDispatcher:
+    """
+    Per-channel, rate-limit-aware message queue.
+
+    Attributes:
+        rate (int), per (float): Channel message route bucket.
+        global_rate (int): Requests per second across all channels.
+        coalesce_window (float): Max spread in seconds of merged messages.
+        max_length (int): Max length of a merged message.
+        channels (dict): Channel id -> ChannelQueue.
+        rate_limits (Counter): Route -> 429s reported by discord.py.
+    """
+    def __init__(self, rate: int = 5, per: float = 5.0, global_rate: int = 50, coalesce_window: float = 0.5,
+                 max_length: int = 2000, clock=time.monotonic):
+        self.rate = rate
+        self.per = per
+        self.coalesce_window = coalesce_window
+        self.max_length = max_length
+        self.global_rate = global_rate
+        self.channels = {}
+        self.rate_limits = collections.Counter()
+        self.sent = 0
+        self.merged = 0
+        self.max_depth = 0
+        self._clock = clock
+        self._global = TokenBucket(global_rate, 1.0, clock())
+        self._sequence = itertools.count()
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue.heap) for queue in self.channels.values())
+
+    def _queue(self, channel_id: int) -> ChannelQueue:
+        queue = self.channels.get(channel_id)
+        if queue is None:
+            queue = self.channels[channel_id] = ChannelQueue(channel_id, TokenBucket(self.rate, self.per, self._clock()))
+        return queue
+
+    async def submit(self, channel_id: int, send, content=None, priority: int = INTERACTIVE, **kwargs):
+        """
+        Queues `send(content, **kwargs)` for `channel_id` and returns its
+        result once sent. Callers whose messages were merged all receive
+        the merged message.
+        """
+        queue = self._queue(channel_id)
+        message = OutboundMessage(send, content, kwargs, self._clock(), asyncio.get_running_loop().create_future())
+        heapq.heappush(queue.heap, (priority, next(self._sequence), message))
+        self.max_depth = max(self.max_depth, len(queue.heap))
+        if queue.task is None:
+            queue.task = asyncio.ensure_future(self._drain(queue))
+        return await message.future
+
+    def _take_batch(self, queue: ChannelQueue) -> list:
+        priority, _, first = heapq.heappop(queue.heap)
+        batch = [first]
+        if not first.plain:
+            return batch
+        length = len(first.content)
+        while queue.heap:
+            next_priority, _, candidate = queue.heap[0]
+            if (next_priority != priority or not candidate.plain
+                    or candidate.queued_at - first.queued_at > self.coalesce_window
+                    or length + 1 + len(candidate.content) > self.max_length):
+                break
+            heapq.heappop(queue.heap)
+            batch.append(candidate)
+            length += 1 + len(candidate.content)
+        return batch
+
+    async def _wait_for_slot(self, queue: ChannelQueue):
+        while True:
+            now = self._clock()
+            delay = max(queue.blocked_until - now, queue.bucket.delay(now), self._global.delay(now))
+            if delay <= 0:
+                queue.bucket.take()
+                self._global.take()
+                return
+            await asyncio.sleep(delay)
+
+    async def _drain(self, queue: ChannelQueue):
+        try:
+            while queue.heap:
+                await self._wait_for_slot(queue)
+                batch = self._take_batch(queue)
+                first = batch[0]
+                content = "\n".join(message.content for message in batch) if len(batch) > 1 else first.content
+                try:
+                    result = await first.send(content, **first.kwargs)
+                except Exception as e:
+                    if getattr(e, "status", None) == 429:
+                        self.rate_limits[MESSAGE_ROUTE] += 1
+                    for message in batch:
+                        if not message.future.done():
+                            message.future.set_exception(e)
+                    continue
+                self.sent += 1
+                self.merged += len(batch) - 1
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_result(result)
+        finally:
+            queue.task = None
+
+    def rate_limited(self, route: str, retry_after: float, channel_id: int = None):
+        """Records a 429 for `route` and pauses `channel_id`'s queue for `retry_after` seconds."""
+        self.rate_limits[route] += 1
+        if channel_id is not None:
+            queue = self._queue(channel_id)
+            queue.blocked_until = max(queue.blocked_until, self._clock() + retry_after)
+
+    def prune(self) -> int:
+        """Drops idle channel queues whose bucket has refilled. Returns how many were dropped."""
+        now = self._clock()
+        idle = [channel_id for channel_id, queue in self.channels.items()
+                if queue.task is None and not queue.heap and queue.blocked_until <= now and queue.bucket.full(now)]
+        for channel_id in idle:
+            del self.channels[channel_id]
+        return len(idle)
+
+    def stats(self) -> dict:
+        depths = [len(queue.heap) for queue in self.channels.values()]
+        return {"channels": len(self.channels), "queued": sum(depths), "deepest": max(depths, default=0),
+                "max_depth": self.max_depth, "sent": self.sent, "merged": self.merged,
+                "rate_limited": sum(self.rate_limits.values())}
+
+    def format_report(self, limit: int = 5) -> str:
+        stats = self.stats()
+        lines = [f"Outbound: {stats['queued']} queued over {stats['channels']} channels (deepest {stats['deepest']}, "
+                 f"peak {stats['max_depth']}), {stats['sent']} sent, {stats['merged']} merged, "
+                 f"{stats['rate_limited']} rate limited."]
+        for route, count in self.rate_limits.most_common(limit):
+            lines.append(f"- 429 x{count}: {route}")
+        return "\n".join(lines)
+
+
+class RateLimitObserver(logging.Filter):
+    """
+    Logging filter for the `discord.http` logger that forwards the 429s it
+    reports to a dispatcher. Records are never suppressed.
+    """
+    def __init__(self, dispatcher: OutboundDispatcher):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING and "rate limit" in str(record.msg).lower():
+            args = record.args if isinstance(record.args, tuple) else ()
+            url = next((arg for arg in args if isinstance(arg, str) and "/" in arg), None)
+            delay = next((arg for arg in args if isinstance(arg, float)), 0.0)
+            method = next((arg for arg in args if isinstance(arg, str) and arg.isupper()), "")
+            if url is None:
+                self.dispatcher.rate_limited("global", delay)
+            else:
+                channel = _CHANNEL_RE.search(url)
+                route = f"{method} {_SNOWFLAKE_RE.sub('/{id}', _API_PREFIX_RE.sub('', url))}".strip()
+                self.dispatcher.rate_limited(route, delay, int(channel.group(1)) if channel else None)
+        return True
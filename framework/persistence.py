@@ -0,0 +1,126 @@
+"""
+    Write-Behind Persistence
+    ------------------------
+
+    Takes config saves off the event loop. `enqueue()` only marks a key
+    dirty; repeated saves of the same key within `window` seconds coalesce
+    into one write. Dirty entries are snapshotted on the loop and written in
+    a single transaction by a dedicated worker thread, so writes keep their
+    order and never block gateway handling.
+    """
+
+import asyncio
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehindWriter:
+    """
+    Coalescing write-behind queue in front of a sink with `write_many(items)`.
+
+    Attributes:
+        sink: Object persisting a dict of key -> value in one transaction.
+        window (float): Seconds to collect saves before flushing.
+        writes (int): Entries persisted so far.
+        batches (int): Transactions issued so far.
+        coalesced (int): Saves absorbed by an already pending save of the same key.
+        failures (int): Failed flushes (entries are retried on the next window).
+    """
+    def __init__(self, sink, window: float = 2.0):
+        self.sink = sink
+        self.window = window
+        self.writes = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._dirty = {}
+        self._in_flight = {}
+        self._timer = None
+        self._flush_lock = None
+        self._closed = False
+        # A single worker keeps writes ordered.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write-behind")
+
+    @property
+    def queue_depth(self) -> int:
+        """Entries waiting to be persisted, including the batch being written."""
+        return len(self._dirty) + len(self._in_flight)
+
+    def pending(self, key: str) -> bool:
+        """Whether a save of `key` has not been persisted yet."""
+        return key in self._dirty or key in self._in_flight
+
+    def stats(self) -> dict:
+        return {"queue_depth": self.queue_depth, "writes": self.writes, "batches": self.batches,
+                "coalesced": self.coalesced, "failures": self.failures}
+
+    def enqueue(self, key: str, value):
+        """Marks `key` dirty. Falls back to a synchronous write outside an event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.sink.write_many({key: value})
+            self.writes += 1
+            self.batches += 1
+            return
+        if self._closed:
+            log.warning(f"Write-behind queue is closed; writing {key} synchronously.")
+            self.sink.write_many({key: value})
+            return
+        if key in self._dirty:
+            self.coalesced += 1
+        self._dirty[key] = value
+        if self._timer is None:
+            self._timer = loop.call_later(self.window, self._schedule_flush)
+
+    def _schedule_flush(self):
+        self._timer = None
+        asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> int:
+        """Persists every dirty entry now. Returns the number of entries written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch, self._dirty = self._dirty, {}
+            # Snapshot on the loop so cogs can keep mutating their live dicts.
+            snapshot = {key: copy.deepcopy(value) for key, value in batch.items()}
+            self._in_flight = snapshot
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._executor, self.sink.write_many, snapshot)
+            except Exception as e:
+                self.failures += 1
+                log.error(f"Write-behind flush of {len(snapshot)} entries failed: {type(e).__name__}: {e}. Retrying later.")
+                for key, value in batch.items():
+                    self._dirty.setdefault(key, value)
+                if self._timer is None and not self._closed:
+                    self._timer = asyncio.get_running_loop().call_later(self.window, self._schedule_flush)
+                return 0
+            finally:
+                self._in_flight = {}
+            self.writes += len(snapshot)
+            self.batches += 1
+            return len(snapshot)
+
+    async def close(self):
+        """Flushes pending entries and stops the worker. Call on shutdown."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        written = await self.flush()
+        self._closed = True
+        if self._dirty:
+            # Last resort: the retry window will never come after shutdown.
+            try:
+                self.sink.write_many(self._dirty)
+                written += len(self._dirty)
+                self._dirty = {}
+            except Exception as e:
+                log.critical(f"Lost {len(self._dirty)} pending writes on shutdown: {type(e).__name__}: {e}")
+        self._executor.shutdown(wait=True)
+        log.info(f"Write-behind queue flushed {written} entries on shutdown. Stats: {self.stats()}")
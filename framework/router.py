@@ -0,0 +1,214 @@
+"""
+    Command Router
+    --------------
+
+    Keeps the bot's command table collision-free. The table itself is
+    discord.py's `all_commands` dict, so lookup cost does not depend on the
+    number of loaded cogs. What breaks it is ambiguity: every generated
+    handler registers `aliases=["h"]`, and `add_cog` refuses the second
+    claimant of any name.
+
+    The router builds a claim index from the manifest's static command
+    index before anything is loaded, so conflict resolution does not
+    depend on load order:
+
+    * a command name claimed by one extension is kept as is;
+    * a name claimed by several extensions is registered only under its
+      category namespace, e.g. `mod.handlerimadibeq2`;
+    * an alias claimed more than once (or shadowing a name) is dropped;
+    * every command additionally answers to its namespaced form.
+
+    Each conflict is recorded for the report. Per-guild prefixes are
+    resolved from an in-memory cache backed by the config store.
+    """
+
+import asyncio
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+CATEGORY_NAMESPACES = {
+    "AI_Integrations": "ai",
+    "Advanced_Framework": "fw",
+    "Community_Engagement": "community",
+    "Core": "core",
+    "Customization": "custom",
+    "Dashboard_Backend": "dash",
+    "Data_Analytics": "analytics",
+    "Fun_Features": "fun",
+    "Game_Integrations": "game",
+    "Internal_Services": "internal",
+    "Messages": "msg",
+    "Moderation": "mod",
+    "Security_Suite": "sec",
+    "Social_Integrations": "social",
+    "Utilities": "util",
+}
+
+
+class CommandRouter:
+    """
+    Resolves command names and aliases deterministically across all extensions.
+
+    Attributes:
+        manifest (ExtensionManifest): Source of the static command index.
+        namespaces (dict): Category -> namespace prefix.
+        conflicts (list): (kind, token, claimants, resolution) tuples.
+    """
+    def __init__(self, manifest, namespaces: dict = None):
+        self.manifest = manifest
+        self.namespaces = dict(CATEGORY_NAMESPACES)
+        self.namespaces.update(namespaces or {})
+        self.conflicts = []
+        self._name_claims = {}
+        self._alias_claims = {}
+        self._reported = set()
+
+    def build_index(self):
+        """Indexes every command name and alias declared in the manifest."""
+        self._name_claims, self._alias_claims = {}, {}
+        for entry in self.manifest.entries.values():
+            if not entry.get("is_extension"):
+                continue
+            for meta in entry.get("commands", []):
+                self._name_claims.setdefault(meta["name"], set()).add(entry["module"])
+                for alias in meta["aliases"]:
+                    self._alias_claims.setdefault(alias, set()).add(entry["module"])
+        ambiguous_names = sum(1 for owners in self._name_claims.values() if len(owners) > 1)
+        ambiguous_aliases = sum(1 for alias, owners in self._alias_claims.items() if len(owners) > 1 or alias in self._name_claims)
+        log.info(f"Command index built: {len(self._name_claims)} names, {len(self._alias_claims)} aliases, "
+                 f"{ambiguous_names} ambiguous names, {ambiguous_aliases} ambiguous aliases.")
+
+    def namespace_of(self, module: str) -> str:
+        category = self.manifest.category_of(module)
+        return self.namespaces.get(category, (category or "bot").lower())
+
+    def _record(self, kind: str, token: str, claimants, resolution: str):
+        key = (kind, token, resolution)
+        if key not in self._reported:
+            self._reported.add(key)
+            self.conflicts.append((kind, token, sorted(claimants), resolution))
+
+    def plan(self, module: str, name: str, aliases: list, taken=()) -> tuple:
+        """
+        Returns the `(name, aliases)` a command of `module` is registered under.
+
+        `taken` holds tokens already registered live (e.g. commands defined in
+        bot.py), which are not part of the manifest index.
+        """
+        namespaced = f"{self.namespace_of(module)}.{name}"
+        name_owners = self._name_claims.get(name, {module})
+        if len(name_owners) > 1 or name in taken:
+            self._record("name", name, name_owners | ({"<live>"} if name in taken else set()), f"registered as {namespaced}")
+            final_name, final_aliases = namespaced, []
+        else:
+            final_name, final_aliases = name, [namespaced]
+
+        for alias in aliases:
+            owners = self._alias_claims.get(alias, {module})
+            if len(owners) > 1 or alias in self._name_claims or alias in taken:
+                self._record("alias", alias, owners, "dropped")
+                continue
+            final_aliases.append(alias)
+        return final_name, final_aliases
+
+    def prepare_cog(self, bot, cog):
+        """Renames the cog's commands in place before `add_cog` registers them."""
+        module = type(cog).__module__
+        if self.manifest.category_of(module) is None:
+            return
+        for command in cog.get_commands():
+            command.name, command.aliases = self.plan(module, command.name, list(command.aliases), bot.all_commands)
+
+    def format_report(self, limit: int = 20) -> str:
+        if not self.conflicts:
+            return "No command name or alias conflicts."
+        lines = [f"{len(self.conflicts)} command routing conflicts:"]
+        for kind, token, claimants, resolution in self.conflicts[:limit]:
+            lines.append(f"- {kind} '{token}' claimed by {len(claimants)} modules: {resolution}")
+        if len(self.conflicts) > limit:
+            lines.append(f"... and {len(self.conflicts) - limit} more.")
+        return "\n".join(lines)
+
+
+class PrefixCache:
+    """
+    Per-guild command prefixes held in memory and persisted in the config
+    store, one row per guild, so cluster workers never overwrite each
+    other's changes. Saves go through the store's write-behind writer;
+    `sync()` picks up prefixes that other workers changed.
+
+    Attributes:
+        default (str): Prefix for guilds without an override and for DMs.
+        store (ConfigStore): Loaded config store holding the overrides.
+        sync_overlap (float): Seconds re-read before the newest row seen,
+            so a write committed late by another process is not missed.
+    """
+    NAMESPACE = "bot.prefixes."
+
+    def __init__(self, default: str, store, sync_overlap: float = 5.0):
+        self.default = default
+        self.store = store
+        self.sync_overlap = sync_overlap
+        self._prefixes = {}
+        self._synced_until = 0.0
+
+    def _apply(self, rows: list, keys=None) -> int:
+        """Merges `rows` into the store and mirrors `keys` (default: the changed ones) here."""
+        if rows:
+            self._synced_until = max(self._synced_until, max(updated_at for _, _, updated_at in rows))
+        changed = self.store.merge_rows(rows)
+        for key in changed if keys is None else keys:
+            guild_id, prefix = int(key[len(self.NAMESPACE):]), self.store.get(key)
+            if prefix is None:
+                self._prefixes.pop(guild_id, None)
+            else:
+                self._prefixes[guild_id] = prefix
+        return len(changed)
+
+    def load(self) -> int:
+        """Reads every override from the store. Blocking; call it before the event loop starts."""
+        self._prefixes = {}
+        self._synced_until = 0.0
+        rows = self.store.read_changed(self.NAMESPACE)
+        self._apply(rows, keys=[key for key, _, _ in rows])
+        return len(self._prefixes)
+
+    async def sync(self) -> int:
+        """Applies overrides saved by other processes since the last sync. Returns how many changed."""
+        since = self._synced_until - self.sync_overlap
+        rows = await asyncio.get_running_loop().run_in_executor(None, self.store.read_changed, self.NAMESPACE, since)
+        return self._apply(rows)
+
+    def import_legacy_file(self, path: str) -> int:
+        """Migrates the overrides of the former `guild_prefixes.json` file; existing rows win."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except json.JSONDecodeError as e:
+            log.error(f"Skipping corrupt guild prefix file '{path}': {e}")
+            return 0
+        imported = self.store.import_all({f"{self.NAMESPACE}{guild_id}": prefix for guild_id, prefix in legacy.items()},
+                                         overwrite=False)
+        if imported:
+            log.info(f"Migrated {imported} guild prefixes from '{path}' into the config store.")
+        return imported
+
+    def get(self, guild_id) -> str:
+        return self._prefixes.get(guild_id, self.default)
+
+    def set(self, guild_id: int, prefix: str):
+        """Updates the override in memory and queues its save; None is stored for the default."""
+        if prefix == self.default:
+            self._prefixes.pop(guild_id, None)
+            self.store.set(f"{self.NAMESPACE}{guild_id}", None)
+        else:
+            self._prefixes[guild_id] = prefix
+            self.store.set(f"{self.NAMESPACE}{guild_id}", prefix)
+
+    def __call__(self, bot, message) -> str:
+        """`command_prefix` callable: a single dict lookup per message."""
+        return self.get(message.guild.id) if message.guild else self.default
@@ -0,0 +1,259 @@
+"""
+    Central Periodic Scheduler
+    --------------------------
+
+    Replaces the thousands of independent `@tasks.loop` timers of the
+    handler cogs with one dispatcher driven by a hierarchical timing wheel.
+
+    A loader hook swaps each cog class's `tasks.Loop` attributes for a
+    `ScheduledLoop` descriptor with the same `start()`/`cancel()` surface,
+    so `periodic_update_task.start()` in the generated cogs registers a job
+    with the scheduler instead of spawning a task. Jobs get a deterministic
+    phase offset within their interval (no thundering herd after a
+    restart), never overlap themselves, and run under a global concurrency
+    cap. Per-job run time and overrun statistics are kept.
+
+    Scheduled runs and on-demand refreshes (`run_coarsely()`, used by the
+    cogs' `refresh` subcommand) share a single-flight layer keyed by job,
+    so they never execute the same update concurrently.
+    """
+
+import asyncio
+import logging
+import time
+import zlib
+
+from .singleflight import SingleFlight
+from .timing_wheel import TimingWheel
+
+log = logging.getLogger(__name__)
+
+
+class JobStats:
+    """Run-time statistics of one periodic job."""
+    __slots__ = ("runs", "failures", "overruns", "skipped", "total_seconds", "max_seconds", "last_seconds")
+
+    def __init__(self):
+        self.runs = self.failures = self.overruns = self.skipped = 0
+        self.total_seconds = self.max_seconds = self.last_seconds = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.runs if self.runs else 0.0
+
+
+class PeriodicJob:
+    """A registered job. `func` and `before` are zero-argument coroutine functions."""
+    def __init__(self, name: str, interval: float, func, before=None):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.before = before
+        self.stats = JobStats()
+        self.running = False
+        self.active = True
+
+
+class CentralScheduler:
+    """
+    Dispatches periodic jobs from a single timing wheel.
+
+    Attributes:
+        tick_seconds (float): Wheel resolution.
+        max_concurrency (int): Jobs allowed to run at the same time.
+        refresh_min_interval (float): On-demand refreshes within this many
+            seconds of a finished run reuse it instead of running again.
+        single_flight (SingleFlight): Deduplicates runs of the same job.
+        run_observers (list): Callables `observer(job, seconds)` called after each run.
+    """
+    def __init__(self, tick_seconds: float = 1.0, max_concurrency: int = 32, slots: int = 64, levels: int = 4,
+                 refresh_min_interval: float = 0.0):
+        self.tick_seconds = tick_seconds
+        self.max_concurrency = max_concurrency
+        self.refresh_min_interval = refresh_min_interval
+        self.single_flight = SingleFlight()
+        self.jobs = {}
+        self.run_observers = []
+        self._wheel = TimingWheel(slots, levels)
+        self._semaphore = None
+        self._task = None
+
+    def _ticks(self, seconds: float) -> int:
+        return max(1, round(seconds / self.tick_seconds))
+
+    def register(self, name: str, interval: float, func, before=None) -> PeriodicJob:
+        """Registers (or replaces) job `name`; its first run is phase-shifted within one interval."""
+        if name in self.jobs:
+            self.jobs[name].active = False
+        job = PeriodicJob(name, interval, func, before)
+        self.jobs[name] = job
+        interval_ticks = self._ticks(interval)
+        # Stable across restarts and processes, unlike hash().
+        phase = zlib.crc32(name.encode()) % interval_ticks
+        self._wheel.schedule(job, phase + 1)
+        return job
+
+    def unregister(self, job: PeriodicJob):
+        job.active = False
+        if self.jobs.get(job.name) is job:
+            del self.jobs[job.name]
+            self.single_flight.forget(job.name)
+
+    async def refresh(self, name: str, func):
+        """Runs job `name` on demand, joining (or reusing) any run of the same job."""
+        return await self.single_flight.do(name, func, self.refresh_min_interval)
+
+    def start(self, wait_until=None):
+        """Starts dispatching. `wait_until` is awaited first (e.g. `bot.wait_until_ready`)."""
+        if self._task is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._task = asyncio.create_task(self._run(wait_until))
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, wait_until):
+        if wait_until is not None:
+            await wait_until()
+        log.info(f"Central scheduler started with {len(self.jobs)} jobs.")
+        next_tick = time.monotonic()
+        while True:
+            next_tick += self.tick_seconds
+            # A stalled loop gets a zero sleep here, so missed ticks are caught up in order.
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            for job in self._wheel.advance():
+                if job.active:
+                    self._dispatch(job)
+
+    def _dispatch(self, job: PeriodicJob):
+        # Fixed-rate: the next run is scheduled before this one starts.
+        self._wheel.schedule(job, self._ticks(job.interval))
+        if job.running:
+            job.stats.skipped += 1
+            return
+        job.running = True
+        asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: PeriodicJob):
+        try:
+            async with self._semaphore:
+                if job.before is not None:
+                    before, job.before = job.before, None
+                    await before()
+                started = time.perf_counter()
+                try:
+                    await self.single_flight.do(job.name, job.func)
+                except Exception as e:
+                    job.stats.failures += 1
+                    log.error(f"Scheduled job {job.name} failed: {type(e).__name__}: {e}", exc_info=True)
+                elapsed = time.perf_counter() - started
+                stats = job.stats
+                stats.runs += 1
+                stats.last_seconds = elapsed
+                stats.total_seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                if elapsed > job.interval:
+                    stats.overruns += 1
+                for observer in self.run_observers:
+                    observer(job, elapsed)
+        finally:
+            job.running = False
+
+    def format_stats(self, limit: int = 10) -> str:
+        """Summary of the most expensive jobs by total run time."""
+        running = sum(1 for job in self.jobs.values() if job.running)
+        flights = self.single_flight.stats()
+        lines = [f"{len(self.jobs)} jobs, {running} running, {len(self._wheel)} pending timers.",
+                 f"Refreshes: {flights['executions']} executed, {flights['shared']} joined in flight, "
+                 f"{flights['suppressed']} within the minimum interval."]
+        top = sorted(self.jobs.values(), key=lambda job: job.stats.total_seconds, reverse=True)[:limit]
+        for job in top:
+            s = job.stats
+            lines.append(f"{job.name}: runs={s.runs} mean={s.mean_seconds * 1000:.0f}ms max={s.max_seconds * 1000:.0f}ms "
+                         f"overruns={s.overruns} skipped={s.skipped} failures={s.failures}")
+        return "\n".join(lines)
+
+
+class ScheduledJobHandle:
+    """Per-cog stand-in for a bound `tasks.Loop`, backed by the central scheduler."""
+    def __init__(self, scheduler: CentralScheduler, loop, cog, name: str):
+        self._scheduler = scheduler
+        self._loop = loop
+        self._cog = cog
+        self._name = name
+        self._job = None
+
+    @property
+    def seconds(self) -> float:
+        return self._loop.seconds
+
+    def _interval(self) -> float:
+        return (self._loop.seconds or 0) + (self._loop.minutes or 0) * 60 + (self._loop.hours or 0) * 3600
+
+    def start(self, *args, **kwargs):
+        if self._job is not None and self._job.active:
+            raise RuntimeError(f"Scheduled job {self._name} is already running.")
+        before = self._loop._before_loop
+        self._job = self._scheduler.register(
+            self._name, self._interval(),
+            lambda: self._loop.coro(self._cog, *args, **kwargs),
+            (lambda: before(self._cog)) if before is not None else None,
+        )
+        return self._job
+
+    def cancel(self):
+        if self._job is not None:
+            self._scheduler.unregister(self._job)
+            self._job = None
+
+    stop = cancel
+
+    def is_running(self) -> bool:
+        return self._job is not None and self._job.active
+
+    def restart(self, *args, **kwargs):
+        self.cancel()
+        self.start(*args, **kwargs)
+
+    async def run_coarsely(self, *args, **kwargs):
+        """Runs the loop body now, deduplicated against concurrent refreshes and the scheduled run."""
+        return await self._scheduler.refresh(self._name, lambda: self._loop.coro(self._cog, *args, **kwargs))
+
+    async def __call__(self, *args, **kwargs):
+        """Runs the loop body once, like awaiting a `tasks.Loop`."""
+        return await self._loop.coro(self._cog, *args, **kwargs)
+
+
+class ScheduledLoop:
+    """Class-level replacement for a `tasks.Loop` attribute."""
+    def __init__(self, scheduler: CentralScheduler, loop, attr: str):
+        self.scheduler = scheduler
+        self.loop = loop
+        self.attr = attr
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        handle = ScheduledJobHandle(self.scheduler, self.loop, obj, f"{type(obj).__module__}.{type(obj).__name__}.{self.attr}")
+        # Cache on the instance; this non-data descriptor is not consulted again.
+        obj.__dict__[self.attr] = handle
+        return handle
+
+    def cancel_for(self, obj):
+        handle = obj.__dict__.get(self.attr)
+        if handle is not None:
+            handle.cancel()
+
+
+def adopt_module(lib, scheduler: CentralScheduler):
+    """Moves every `tasks.Loop` of the classes defined in `lib` onto the scheduler."""
+    from discord.ext import tasks
+
+    for obj in list(vars(lib).values()):
+        if not isinstance(obj, type) or obj.__module__ != lib.__name__:
+            continue
+        for attr, value in list(vars(obj).items()):
+            if isinstance(value, tasks.Loop):
+                setattr(obj, attr, ScheduledLoop(scheduler, value, attr))
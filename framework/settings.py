@@ -0,0 +1,68 @@
+"""
+    Settings Loader
+    ---------------
+
+    Reads `config/default_settings.json` once per process and hands out
+    individual sections merged over the caller's defaults, so framework
+    services never have to touch the file system themselves.
+    """
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+
+log = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETTINGS_PATH = os.path.join(REPO_ROOT, "config", "default_settings.json")
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+
+_settings = None
+
+
+def load_settings(path: str = SETTINGS_PATH) -> dict:
+    """Returns the parsed settings file, reading it only on the first call."""
+    global _settings
+    if _settings is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _settings = json.load(f)
+        except FileNotFoundError:
+            log.warning(f"No settings file found at '{path}'. Using built-in defaults.")
+            _settings = {}
+        except json.JSONDecodeError as e:
+            log.error(f"Failed to decode settings file '{path}': {e}. Using built-in defaults.")
+            _settings = {}
+    return _settings
+
+
+def get_section(name: str, defaults: dict = None) -> dict:
+    """Returns settings section `name` layered over `defaults`."""
+    section = dict(defaults or {})
+    section.update(load_settings().get(name, {}))
+    return section
+
+
+def resolve_path(path: str) -> str:
+    """Resolves a settings-relative path against the repository root."""
+    return path if os.path.isabs(path) else os.path.join(REPO_ROOT, path)
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Replaces `path` with `data` through a uniquely named temp file in the same
+    directory, so concurrent writers (e.g. cluster workers) never share one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,77 @@
+"""
+    Single-Flight Execution
+    -----------------------
+
+    Collapses concurrent calls for the same key into one execution. The
+    first caller starts the work; everyone arriving while it is in flight
+    awaits the same result. An optional minimum interval also answers calls
+    arriving shortly after a completed run with that run's result, so a
+    burst of `!<handler> refresh` commands, or a refresh racing the
+    scheduled update, hits the upstream API once.
+    """
+
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of coroutine executions.
+
+    Attributes:
+        executions (int): Calls that actually ran their function.
+        shared (int): Calls that joined an in-flight execution.
+        suppressed (int): Calls answered from a run within `min_interval`.
+    """
+    def __init__(self):
+        self.executions = 0
+        self.shared = 0
+        self.suppressed = 0
+        self._in_flight = {}
+        self._completed = {}  # key -> (monotonic finish time, result)
+
+    def is_in_flight(self, key) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key, func, min_interval: float = 0.0):
+        """
+        Runs `func()` for `key` unless a run is already in flight (joined) or
+        finished less than `min_interval` seconds ago (its result is returned).
+        Exceptions propagate to every caller sharing the run.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.shared += 1
+            # Shielded so one cancelled caller does not cancel the shared run.
+            return await asyncio.shield(future)
+        if min_interval > 0 and key in self._completed:
+            finished, result = self._completed[key]
+            if time.monotonic() - finished < min_interval:
+                self.suppressed += 1
+                return result
+
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+        self.executions += 1
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future):
+        self._in_flight.pop(key, None)
+        if future.cancelled():
+            return
+        if future.exception() is None:
+            self._completed[key] = (time.monotonic(), future.result())
+        else:
+            self._completed.pop(key, None)
+
+    def forget(self, key):
+        """Drops the remembered result of `key`, e.g. when its cog is unloaded."""
+        self._completed.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"executions": self.executions, "shared": self.shared, "suppressed": self.suppressed,
+                "in_flight": len(self._in_flight)}
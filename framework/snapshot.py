@@ -0,0 +1,141 @@
+"""
+    Warm-Restart Snapshots
+    ----------------------
+
+    Persists the cog `_cache` and component `_local_cache` contents across
+    restarts, so `status` and friends have data before the first
+    `periodic_update_task` run.
+
+    The snapshot is a small binary file: a fixed header (magic, format
+    version, creation time) followed by zlib-compressed JSON. Every entry
+    records the manifest hash of the module it came from; an entry whose
+    module changed since is discarded, as is a whole snapshot older than
+    `max_age` seconds. Entries are kept in memory after `load()` and
+    handed out one by one as cogs and components are created, so a module
+    that is loaded lazily is restored when it is loaded. Values that are
+    not JSON-serialisable are skipped. Cluster workers each keep their own
+    snapshot file, since their caches hold different guilds.
+    """
+
+import json
+import logging
+import struct
+import time
+import zlib
+
+from .settings import write_atomic
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"VYNOSNAP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHd")
+
+
+def cache_items(cache) -> dict:
+    """JSON-serialisable entries of a cache dict or BoundedCache."""
+    items = cache.export() if hasattr(cache, "export") else dict(cache)
+    serialisable = {}
+    for key, value in items.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        serialisable[str(key)] = value
+    return serialisable
+
+
+class SnapshotStore:
+    """
+    Reads and writes warm-restart snapshots.
+
+    Attributes:
+        path (str): Snapshot file.
+        max_age (float): Snapshots older than this many seconds are ignored.
+        restored (int): Entries handed out by `take()`.
+        discarded (int): Entries dropped because their module changed.
+    """
+    def __init__(self, path: str, max_age: float = 900.0):
+        self.path = path
+        self.max_age = max_age
+        self.restored = 0
+        self.discarded = 0
+        self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, entries: dict) -> int:
+        """Writes `entries` (key -> {"hash", "state"}) atomically via a unique temp file. Returns the file size."""
+        payload = zlib.compress(json.dumps(entries, separators=(",", ":")).encode(), 6)
+        write_atomic(self.path, _HEADER.pack(MAGIC, FORMAT_VERSION, time.time()) + payload)
+        size = _HEADER.size + len(payload)
+        log.info(f"Saved warm-restart snapshot of {len(entries)} entries ({size / 1024:.1f} KiB) to '{self.path}'.")
+        return size
+
+    def load(self) -> int:
+        """Reads the snapshot into memory. Returns the number of usable entries."""
+        self._entries = {}
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                payload = f.read()
+        except FileNotFoundError:
+            return 0
+        try:
+            magic, version, created = _HEADER.unpack(header)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                log.warning(f"Ignoring warm-restart snapshot '{self.path}' with unknown format.")
+                return 0
+            age = time.time() - created
+            if age > self.max_age:
+                log.info(f"Ignoring warm-restart snapshot taken {age:.0f}s ago (limit {self.max_age:.0f}s).")
+                return 0
+            self._entries = json.loads(zlib.decompress(payload))
+        except (struct.error, zlib.error, ValueError) as e:
+            log.error(f"Failed to read warm-restart snapshot '{self.path}': {type(e).__name__}: {e}")
+            return 0
+        log.info(f"Loaded warm-restart snapshot of {len(self._entries)} entries taken {age:.0f}s ago.")
+        return len(self._entries)
+
+    def stash(self, entries: dict):
+        """Keeps `entries` in memory for this process, e.g. across `reload_all_modules`."""
+        self._entries.update(entries)
+
+    def take(self, key: str, source_hash: str):
+        """Returns and forgets the state saved for `key`, or None if missing or from another version."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if entry.get("hash") != source_hash:
+            self.discarded += 1
+            return None
+        self.restored += 1
+        return entry["state"]
+
+    def restore_into(self, cache, key: str, source_hash: str) -> bool:
+        """Merges the saved state of `key` into `cache` without overwriting newer values."""
+        state = self.take(key, source_hash)
+        if not state or cache is None:
+            return False
+        for item_key, value in state.items():
+            if item_key not in cache:
+                cache[item_key] = value
+        return True
+
+
+def collect_state(objects: dict, attribute: str, manifest) -> dict:
+    """
+    Builds snapshot entries from `objects` (snapshot key -> cog or component),
+    reading each object's `attribute` cache.
+    """
+    entries = {}
+    for key, obj in objects.items():
+        source = manifest.get(type(obj).__module__)
+        cache = getattr(obj, attribute, None)
+        if source is None or not cache:
+            continue
+        state = cache_items(cache)
+        if state:
+            entries[key] = {"hash": source["hash"], "state": state}
+    return entries
@@ -0,0 +1,124 @@
+"""
+    Staged Startup Pipeline
+    -----------------------
+
+    Runs once from `setup_hook`, before the gateway connects:
+
+    Phase 1 loads the core categories and is awaited, so the bot never
+    connects without them. Phase 2 runs the registered cache warmers and
+    phase 3 loads the optional categories one by one, both in a background
+    task. Each category gets a readiness event; the bot does not invoke
+    commands of a category until it is live (`command_ready`). Gateway reconnects never
+    re-enter the pipeline.
+    """
+
+import asyncio
+import logging
+import time
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+
+class StartupPipeline:
+    """
+    Orchestrates the staged extension loading.
+
+    Attributes:
+        bot (commands.Bot): The bot being started.
+        manifest (ExtensionManifest): Provides the category of each module.
+        load_categories (callable): Coroutine function loading a set of categories.
+        core_categories (list): Categories loaded in phase 1.
+        optional_categories (list): Categories loaded in phase 3. None means
+            every manifest category that is not a core category.
+        enabled_categories (list): Categories this deployment runs at all.
+            None means every category.
+    """
+    def __init__(self, bot: commands.Bot, manifest, load_categories, core_categories: list, optional_categories: list = None,
+                 enabled_categories: list = None):
+        self.bot = bot
+        self.manifest = manifest
+        self.load_categories = load_categories
+        self.enabled_categories = set(enabled_categories) if enabled_categories is not None else None
+        self.core_categories = [c for c in core_categories if self._enabled(c)]
+        self.optional_categories = optional_categories
+        self.fully_loaded = asyncio.Event()
+        self._ready = {}
+        self._warmers = []
+        self._background = None
+        self._started = False
+
+    def _enabled(self, category: str) -> bool:
+        return self.enabled_categories is None or category in self.enabled_categories
+
+    def _event(self, category: str) -> asyncio.Event:
+        if category not in self._ready:
+            self._ready[category] = asyncio.Event()
+        return self._ready[category]
+
+    def is_category_ready(self, category: str) -> bool:
+        return category is None or self._event(category).is_set()
+
+    async def wait_category(self, category: str):
+        """Waits until `category` is live."""
+        await self._event(category).wait()
+
+    def add_warmer(self, coro_func):
+        """Registers a zero-argument coroutine function run in phase 2."""
+        self._warmers.append(coro_func)
+        return coro_func
+
+    async def start(self):
+        """Runs phase 1 and schedules phases 2 and 3. Safe to call more than once."""
+        if self._started:
+            return
+        self._started = True
+        started = time.perf_counter()
+        await self._load_phase("core", self.core_categories)
+        log.info(f"Startup phase 1 (core) finished in {time.perf_counter() - started:.2f}s.")
+        self._background = asyncio.create_task(self._run_background())
+
+    async def _run_background(self):
+        started = time.perf_counter()
+        for warmer in self._warmers:
+            try:
+                await warmer()
+            except Exception as e:
+                log.error(f"Cache warmer {getattr(warmer, '__name__', warmer)} failed: {type(e).__name__}: {e}", exc_info=True)
+        log.info(f"Startup phase 2 (cache warm-up) finished in {time.perf_counter() - started:.2f}s.")
+
+        optional = self.optional_categories
+        if optional is None:
+            known = {entry["category"] for entry in self.manifest.entries.values() if entry["category"]}
+            optional = sorted(known - set(self.core_categories))
+        optional = [category for category in optional if self._enabled(category)]
+        started = time.perf_counter()
+        for category in optional:
+            await self._load_phase(category, [category])
+        log.info(f"Startup phase 3 (optional categories) finished in {time.perf_counter() - started:.2f}s.")
+        self.fully_loaded.set()
+
+    async def _load_phase(self, label: str, categories: list):
+        try:
+            await self.load_categories(set(categories))
+        except Exception as e:
+            log.error(f"Loading {label} categories failed: {type(e).__name__}: {e}", exc_info=True)
+        # A category is routed even if some of its extensions failed; those simply have no commands.
+        for category in categories:
+            self._event(category).set()
+
+    def command_category(self, ctx: commands.Context):
+        """Returns the `Modules` category that owns the invoked command, or None."""
+        if ctx.cog is not None:
+            return self.manifest.category_of(type(ctx.cog).__module__)
+        lazy_module = ctx.command.extras.get("lazy_module") if ctx.command else None
+        return self.manifest.category_of(lazy_module) if lazy_module else None
+
+    def command_ready(self, ctx: commands.Context) -> bool:
+        """
+        Whether the invoked command's category is live. Consulted by the bot
+        before invoking rather than raised from a check, so the cogs' own
+        error handlers never treat a loading category as a failure.
+        """
+        return self.is_category_ready(self.command_category(ctx))
@@ -0,0 +1,72 @@
+"""
+    Hierarchical Timing Wheel
+    -------------------------
+
+    O(1) insertion and amortised O(1) expiry for large numbers of timers.
+    Level 0 has one slot per tick; each higher level covers `slots` times
+    the span of the level below it. Entries far in the future sit in a
+    coarse slot and are cascaded down as the wheel turns, so advancing one
+    tick only touches the entries that are actually due (plus the
+    occasional cascade).
+    """
+
+
+class TimingWheel:
+    """
+    Tick-driven timer wheel.
+
+    Attributes:
+        slots (int): Slots per level.
+        levels (int): Number of levels. Delays beyond slots ** levels ticks
+            wrap around on the top level and are re-placed when reached.
+        current_tick (int): Ticks advanced so far.
+    """
+    def __init__(self, slots: int = 64, levels: int = 4):
+        self.slots = slots
+        self.levels = levels
+        self.current_tick = 0
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item, delay_ticks: int) -> int:
+        """Schedules `item` to expire after `delay_ticks` (at least 1). Returns the deadline tick."""
+        deadline = self.current_tick + max(1, int(delay_ticks))
+        self._place(item, deadline)
+        self._size += 1
+        return deadline
+
+    def _place(self, item, deadline: int):
+        delta = deadline - self.current_tick
+        for level in range(self.levels):
+            if delta < self.slots ** (level + 1) or level == self.levels - 1:
+                slot = (deadline // self.slots ** level) % self.slots
+                self._wheels[level][slot].append((deadline, item))
+                return
+
+    def advance(self) -> list:
+        """Moves the wheel forward one tick and returns the items that expired."""
+        self.current_tick += 1
+        tick = self.current_tick
+        # Cascade coarse slots whose span starts at this tick down to finer levels.
+        for level in range(1, self.levels):
+            granularity = self.slots ** level
+            if tick % granularity:
+                break
+            slot = (tick // granularity) % self.slots
+            bucket, self._wheels[level][slot] = self._wheels[level][slot], []
+            for deadline, item in bucket:
+                self._place(item, deadline)
+
+        slot = tick % self.slots
+        bucket, self._wheels[0][slot] = self._wheels[0][slot], []
+        expired = []
+        for deadline, item in bucket:
+            if deadline <= tick:
+                expired.append(item)
+            else:
+                self._place(item, deadline)
+        self._size -= len(expired)
+        return expired
@@ -0,0 +1,228 @@
+"""
+    Request Tracing
+    ---------------
+
+    In-process spans for following one message from the gateway through
+    prefix parsing and the command to the components it reaches.
+
+    The active span lives in a `contextvars.ContextVar`, so it follows
+    the code across awaits and into tasks created while it is active;
+    hand-offs that outlive the creating task (event bus deliveries) carry
+    the span along and `resume()` it. Timestamps are `perf_counter_ns()`
+    integers. Outside a trace, `span()` returns a shared no-op scope.
+
+    Every trace records its spans; when the root span ends the trace is
+    kept if it was head-sampled (`sample_rate`) or if it took at least
+    `slow_threshold` seconds (tail sampling). Kept traces go to a ring
+    buffer that `export()` writes in the Chrome trace event JSON format,
+    which chrome://tracing and Perfetto open offline.
+    """
+
+import collections
+import contextvars
+import itertools
+import json
+import logging
+import os
+import random
+import time
+
+from .settings import write_atomic
+
+log = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("vyno_trace_span", default=None)
+
+
+class Trace:
+    """Spans of one request."""
+    __slots__ = ("trace_id", "name", "spans", "sampled", "dropped", "duration_ns")
+
+    def __init__(self, trace_id: int, name: str, sampled: bool):
+        self.trace_id = trace_id
+        self.name = name
+        self.spans = []
+        self.sampled = sampled
+        self.dropped = False
+        self.duration_ns = 0
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, trace: Trace, name: str, span_id: int, parent_id: int, start_ns: int, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = 0
+        self.attributes = attributes
+
+
+class _SpanScope:
+    __slots__ = ("tracer", "span", "token", "root")
+
+    def __init__(self, tracer, span: Span, root: bool):
+        self.tracer = tracer
+        self.span = span
+        self.root = root
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end_ns = self.tracer.clock()
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        _current.reset(self.token)
+        if self.root:
+            self.tracer._finish(self.span.trace, self.span.end_ns - self.span.start_ns)
+        return False
+
+
+class _ResumeScope:
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self.token)
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SCOPE = _NullScope()
+
+
+class Tracer:
+    """
+    Span factory and ring buffer of kept traces.
+
+    Attributes:
+        enabled (bool): When False, `trace()` and `span()` are no-ops.
+        sample_rate (float): Fraction of traces kept regardless of duration.
+        slow_threshold (float): Traces at least this many seconds long are always kept.
+        traces (deque): Most recent kept traces.
+        started (int), kept_sampled (int), kept_slow (int): Trace counters.
+    """
+    def __init__(self, enabled: bool = True, sample_rate: float = 0.01, slow_threshold: float = 1.0,
+                 capacity: int = 256, clock=time.perf_counter_ns):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.traces = collections.deque(maxlen=capacity)
+        self.clock = clock
+        self.started = self.kept_sampled = self.kept_slow = 0
+        self._ids = itertools.count(1)
+
+    def configure(self, enabled: bool = None, sample_rate: float = None, slow_threshold: float = None,
+                  capacity: int = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if slow_threshold is not None:
+            self.slow_threshold = slow_threshold
+        if capacity is not None and capacity != self.traces.maxlen:
+            self.traces = collections.deque(self.traces, maxlen=capacity)
+
+    def current(self) -> Span:
+        return _current.get()
+
+    def trace(self, name: str, **attributes):
+        """Starts a new trace, or a child span when one is already active."""
+        if not self.enabled:
+            return NULL_SCOPE
+        if _current.get() is not None:
+            return self.span(name, **attributes)
+        self.started += 1
+        trace = Trace(next(self._ids), name, random.random() < self.sample_rate)
+        span = Span(trace, name, next(self._ids), 0, self.clock(), attributes)
+        trace.spans.append(span)
+        return _SpanScope(self, span, root=True)
+
+    def span(self, name: str, **attributes):
+        """Child span of the active span; a no-op outside a trace."""
+        parent = _current.get()
+        if parent is None or parent.trace.dropped:
+            return NULL_SCOPE
+        span = Span(parent.trace, name, next(self._ids), parent.span_id, self.clock(), attributes)
+        parent.trace.spans.append(span)
+        return _SpanScope(self, span, root=False)
+
+    def resume(self, span: Span):
+        """
+        Makes `span` the active span again, e.g. in a task that handles a
+        hand-off. With None, clears whatever span the task inherited.
+        """
+        return _ResumeScope(span)
+
+    def drop(self):
+        """Discards the active trace (e.g. a message that turned out not to be a command)."""
+        span = _current.get()
+        if span is not None:
+            span.trace.dropped = True
+
+    def _finish(self, trace: Trace, duration_ns: int):
+        trace.duration_ns = duration_ns
+        if trace.dropped:
+            return
+        if trace.sampled:
+            self.kept_sampled += 1
+        elif duration_ns >= self.slow_threshold * 1e9:
+            self.kept_slow += 1
+        else:
+            return
+        self.traces.append(trace)
+
+    def export(self, path: str) -> int:
+        """Writes the kept traces as Chrome trace events. Returns the number of traces written."""
+        traces = list(self.traces)
+        pid = os.getpid()
+        events = []
+        for row, trace in enumerate(traces, 1):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": row,
+                           "args": {"name": f"{trace.name} #{trace.trace_id}"}})
+            for span in list(trace.spans):
+                if not span.end_ns:
+                    continue
+                events.append({
+                    "name": span.name, "ph": "X", "pid": pid, "tid": row,
+                    "ts": span.start_ns / 1000, "dur": (span.end_ns - span.start_ns) / 1000,
+                    "args": {"trace_id": trace.trace_id, "span_id": span.span_id, "parent_id": span.parent_id,
+                             **{key: str(value) for key, value in span.attributes.items()}},
+                })
+        write_atomic(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}).encode('utf-8'))
+        log.info(f"Exported {len(traces)} traces ({len(events)} events) to '{path}'.")
+        return len(traces)
+
+    def format_report(self, limit: int = 5) -> str:
+        lines = [f"Traces: {self.started} started, {self.kept_sampled} head-sampled, {self.kept_slow} kept as slow, "
+                 f"{len(self.traces)}/{self.traces.maxlen} buffered."]
+        slowest = sorted(self.traces, key=lambda trace: trace.duration_ns, reverse=True)[:limit]
+        for trace in slowest:
+            spans = sorted((span for span in trace.spans[1:] if span.end_ns),
+                           key=lambda span: span.end_ns - span.start_ns, reverse=True)[:3]
+            detail = ", ".join(f"{span.name} {(span.end_ns - span.start_ns) / 1e6:.1f}ms" for span in spans)
+            lines.append(f"- {trace.name} #{trace.trace_id}: {trace.duration_ns / 1e6:.1f}ms ({detail or 'no child spans'})")
+        return "\n".join(lines)
+
+
+# Process-wide tracer; bot.py configures it from the `tracing` settings section.
+tracer = Tracer(enabled=False)
@@ -0,0 +1,176 @@
+"""
+    Event-Loop Stall Watchdog
+    -------------------------
+
+    A callback on the event loop beats every `interval` seconds and
+    records how late it ran (loop lag) in a histogram. A daemon thread
+    watches the beat; when none has arrived for `threshold` seconds, it
+    grabs the loop thread's current stack through `sys._current_frames()`
+    while the loop is still stuck, and attributes the stall to the
+    innermost frame under `Modules` (module and cog class), falling back
+    to the innermost frame of the repository and then to any frame.
+
+    The last stalls and per-module totals are kept for the rolling report.
+    """
+
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from .settings import REPO_ROOT
+
+log = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+
+
+class Stall:
+    """A detected stall and where the loop thread was when it was caught."""
+    __slots__ = ("started", "duration", "module", "cog", "location", "stack")
+
+    def __init__(self, started: float, module: str, cog: str, location: str, stack: list):
+        self.started = started
+        self.duration = 0.0
+        self.module = module
+        self.cog = cog
+        self.location = location
+        self.stack = stack
+
+
+def _module_name(filename: str) -> str:
+    path = os.path.relpath(filename, REPO_ROOT)
+    if path.startswith(".."):
+        return None
+    return os.path.splitext(path)[0].replace(os.sep, ".")
+
+
+def attribute_frame(frame) -> tuple:
+    """Returns (module, cog, location, stack) for the stack ending at `frame`."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    chosen = None
+    # Innermost first: prefer the extension code, then any repository code.
+    for wanted in ("Modules.", ""):
+        for candidate in frames:
+            module = _module_name(candidate.f_code.co_filename)
+            if module is not None and module.startswith(wanted):
+                chosen = (candidate, module)
+                break
+        if chosen:
+            break
+    if chosen is None and frames:
+        chosen = (frames[0], frames[0].f_globals.get("__name__", "?"))
+    if chosen is None:
+        return "?", None, "?", []
+    candidate, module = chosen
+    owner = candidate.f_locals.get("self")
+    cog = type(owner).__name__ if owner is not None else None
+    location = f"{candidate.f_code.co_filename}:{candidate.f_lineno} in {candidate.f_code.co_name}"
+    stack = traceback.format_list(traceback.extract_stack(frames[0], limit=15))
+    return module, cog, location, stack
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag and captures the stack of stalls.
+
+    Attributes:
+        threshold (float): Seconds without a beat that count as a stall.
+        interval (float): Beat period.
+        histogram (list): Beat lag counts per LAG_BUCKETS bucket.
+        stalls (deque): Most recent stalls.
+        totals (dict): Module -> [stall count, total seconds].
+        lag_observers (list): Callables `observer(lag_seconds)` called on every beat.
+    """
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1, history: int = 100):
+        self.threshold = threshold
+        self.interval = interval
+        self.histogram = [0] * len(LAG_BUCKETS)
+        self.max_lag = 0.0
+        self.stalls = collections.deque(maxlen=history)
+        self.totals = {}
+        self.lag_observers = []
+        self._loop = None
+        self._loop_thread = None
+        self._last_beat = 0.0
+        self._expected = 0.0
+        self._current = None
+        self._handle = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, loop):
+        """Starts beating on `loop`; must be called from the loop thread."""
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._last_beat = self._expected = time.monotonic()
+        self._handle = loop.call_soon(self._beat)
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def _beat(self):
+        now = time.monotonic()
+        lag = max(0.0, now - self._expected)
+        self.max_lag = max(self.max_lag, lag)
+        for index, bound in enumerate(LAG_BUCKETS):
+            if lag <= bound:
+                self.histogram[index] += 1
+                break
+        for observer in self.lag_observers:
+            observer(lag)
+        with self._lock:
+            stall, self._current = self._current, None
+            self._last_beat = now
+        if stall is not None:
+            stall.duration = now - stall.started
+            totals = self.totals.setdefault(stall.module, [0, 0.0])
+            totals[0] += 1
+            totals[1] += stall.duration
+            log.warning(f"Event loop stalled for {stall.duration:.2f}s in {stall.module}"
+                        f"{f' ({stall.cog})' if stall.cog else ''} at {stall.location}.")
+        self._expected = now + self.interval
+        self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval / 2):
+            with self._lock:
+                since = self._last_beat
+                if self._current is not None or time.monotonic() - since < self.threshold + self.interval:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is None:
+                    continue
+                module, cog, location, stack = attribute_frame(frame)
+                del frame
+                stall = Stall(since + self.interval, module, cog, location, stack)
+                self._current = stall
+                self.stalls.append(stall)
+
+    def format_histogram(self) -> str:
+        labels = [f"<={bound * 1000:.0f}ms" if bound != float("inf") else ">5000ms" for bound in LAG_BUCKETS]
+        return "Loop lag: " + ", ".join(f"{label}: {count}" for label, count in zip(labels, self.histogram) if count)
+
+    def format_report(self, limit: int = 5) -> str:
+        lines = [self.format_histogram() or "Loop lag: no samples yet.", f"Max lag: {self.max_lag * 1000:.0f}ms."]
+        if not self.stalls:
+            lines.append(f"No stalls over {self.threshold * 1000:.0f}ms.")
+            return "\n".join(lines)
+        lines.append("Top stalling modules:")
+        top = sorted(self.totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        for module, (count, seconds) in top:
+            lines.append(f"- {module}: {count} stalls, {seconds:.2f}s total")
+        lines.append("Recent stalls:")
+        for stall in list(self.stalls)[-limit:]:
+            duration = f"{stall.duration:.2f}s" if stall.duration else "ongoing"
+            lines.append(f"- {duration} {stall.module}{f' ({stall.cog})' if stall.cog else ''} at {stall.location}")
+        return "\n".join(lines)
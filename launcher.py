@@ -0,0 +1,51 @@
+"""
+    Cluster Launcher
+    ----------------
+
+    Starts one bot.py worker process per contiguous shard range, honouring
+    `shard_count` and the `cluster` section of config/default_settings.json.
+    Run `python bot.py` directly for a single, unsharded process.
+    """
+
+import argparse
+import logging
+import os
+import sys
+
+from framework import ExtensionManifest, get_section, load_settings, resolve_path
+from framework.cluster import ClusterLauncher, default_worker_command
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+                    handlers=[logging.StreamHandler(sys.stdout)])
+log = logging.getLogger('bot.launcher')
+
+
+def main():
+    cluster_settings = get_section("cluster", {"cluster_count": 2, "ipc_base_port": 20000, "max_restart_backoff": 60})
+    parser = argparse.ArgumentParser(description="Run the bot as a multi-process shard cluster.")
+    parser.add_argument("--shards", type=int, default=load_settings().get("shard_count", 1), help="Total shard count.")
+    parser.add_argument("--clusters", type=int, default=cluster_settings["cluster_count"], help="Number of worker processes.")
+    args = parser.parse_args()
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+
+    if not os.getenv("VYNO_IPC_SECRET"):
+        log.warning("VYNO_IPC_SECRET is not set. Cross-cluster IPC requests will be unauthenticated.")
+
+    # Workers only read the manifest; writing it here once avoids every worker rescanning on boot.
+    loader_settings = get_section("extension_loader", {"package": "Modules", "manifest_path": "data/extension_manifest.json"})
+    manifest = ExtensionManifest(repo_root, loader_settings["package"], resolve_path(loader_settings["manifest_path"]))
+    manifest.load()
+    changes = manifest.refresh()
+    if any(changes.values()):
+        manifest.save()
+        log.info(f"Extension manifest updated. Added: {len(changes['added'])}, Changed: {len(changes['changed'])}, Removed: {len(changes['removed'])}.")
+
+    launcher = ClusterLauncher(args.shards, args.clusters, cluster_settings["ipc_base_port"],
+                               default_worker_command(repo_root),
+                               max_backoff=cluster_settings["max_restart_backoff"])
+    log.info(f"Launching {len(launcher.contexts)} clusters for {args.shards} shards.")
+    launcher.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import unittest
+
+from framework.cache import BoundedCache, CacheBudget, CacheGroup, adopt_class
+
+
+class TestBoundedCache(unittest.TestCase):
+    def test_lru_eviction_keeps_recently_used_entries(self):
+        cache = BoundedCache(max_entries=2)
+        cache["a"], cache["b"] = 1, 2
+        self.assertEqual(cache["a"], 1)
+        cache["c"] = 3
+        self.assertEqual(sorted(cache), ["a", "c"])
+        self.assertEqual(cache.get("b", "missing"), "missing")
+        self.assertEqual((cache.stats.hits, cache.stats.misses, cache.stats.evictions), (1, 1, 1))
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = BoundedCache(ttl=10, clock=lambda: now[0])
+        cache["a"] = 1
+        now[0] = 9.9
+        self.assertIn("a", cache)
+        now[0] = 10.0
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_category_byte_budget_and_dict_compatible_adoption(self):
+        budget = CacheBudget(2000, ["Core", "Messages"], shares={"Core": 1.0, "Messages": 1.0})
+
+        class Component:
+            def __init__(self):
+                self._local_cache = {"seed": 1}
+                self._config = {"enabled": True}
+
+        adopt_class(Component, budget, "Core")
+        component = Component()
+        self.assertIsInstance(component._local_cache, BoundedCache)
+        self.assertIs(type(component._config), dict)
+        for index in range(100):
+            component._local_cache[f"key{index}"] = "x" * 50
+        group = budget.groups["Core"]
+        self.assertLessEqual(group.used_bytes, group.max_bytes)
+        self.assertIn("key99", component._local_cache)
+        self.assertNotIn("seed", component._local_cache)
+
+    def test_oversized_entries_are_rejected_and_new_entries_survive_reclaim(self):
+        group = CacheGroup("Core", max_bytes=100)
+        sizes = {"small": 30, "big": 80, "huge": 150}
+        first = BoundedCache("first", group=group, sizeof=lambda obj: sizes.get(obj, 0))
+        second = BoundedCache("second", group=group, sizeof=lambda obj: sizes.get(obj, 0))
+        first["a"] = "small"
+        first["b"] = "small"
+        with self.assertLogs("framework.cache", "WARNING"):
+            second["x"] = "huge"
+        self.assertNotIn("x", second)
+        self.assertEqual(second.stats.rejected, 1)
+        # Over budget with `second` holding only the new entry: the other cache pays.
+        second["y"] = "big"
+        self.assertEqual(second["y"], "big")
+        self.assertEqual(len(first), 0)
+        self.assertEqual(group.used_bytes, 80)
+        self.assertEqual(group.stats()["rejected"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from framework.cluster import ClusterContext, compute_shard_ranges
+
+
+class TestShardRanges(unittest.TestCase):
+    def test_ranges_are_contiguous_and_cover_all_shards(self):
+        ranges = compute_shard_ranges(10, 3)
+        self.assertEqual(ranges, [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+    def test_more_clusters_than_shards(self):
+        self.assertEqual(compute_shard_ranges(2, 5), [[0], [1]])
+
+    def test_context_round_trips_through_environment(self):
+        context = ClusterContext(1, 3, [4, 5, 6], 10, 20000)
+        restored = ClusterContext.from_env(context.to_env())
+        self.assertEqual((restored.cluster_id, restored.shard_ids, restored.ipc_port()), (1, [4, 5, 6], 20001))
+        self.assertIsNone(ClusterContext.from_env({}))
+
+    def test_per_cluster_paths_and_shared_file_owner(self):
+        first, second = (ClusterContext(cluster_id, 2, [cluster_id], 2, 20000) for cluster_id in range(2))
+        self.assertEqual(second.scoped_path("data/traces.json"), "data/traces.cluster1.json")
+        self.assertEqual((first.owns_shared_files, second.owns_shared_files), (True, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
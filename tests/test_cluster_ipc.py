@@ -0,0 +1,87 @@
+import asyncio
+import importlib.util
+import socket
+import unittest
+
+from framework.cluster import ClusterContext
+
+HAS_IPC = all(importlib.util.find_spec(name) for name in ("discord", "aiohttp")) and \
+    importlib.util.find_spec("discord.ext.ipc") is not None
+
+
+def free_port_pair() -> int:
+    """Base port of two consecutive free ports."""
+    for _ in range(50):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            base = probe.getsockname()[1]
+        try:
+            with socket.socket() as first, socket.socket() as second:
+                first.bind(("127.0.0.1", base))
+                second.bind(("127.0.0.1", base + 1))
+            return base
+        except OSError:
+            continue
+    raise RuntimeError("No two consecutive free ports.")
+
+
+class FakeGuild:
+    def __init__(self, member_count: int):
+        self.member_count = member_count
+
+
+class FakeBot:
+    """Just the attributes discord-ext-ipc's Server and the cog read."""
+    def __init__(self, guilds: int):
+        self.guilds = [FakeGuild(10) for _ in range(guilds)]
+        self.latency = 0.05
+        self.cogs = {}
+        self.loop = None
+        self.dispatched = []
+
+    def dispatch(self, event, *args):
+        self.dispatched.append(event)
+
+
+@unittest.skipUnless(HAS_IPC, "discord.py and discord-ext-ipc are not installed")
+class TestClusterIPC(unittest.TestCase):
+    def test_stats_round_trip_between_clusters(self):
+        from framework.cluster_ipc import ClusterIPCCog
+
+        base = free_port_pair()
+
+        async def scenario():
+            cogs = []
+            for cluster_id, guilds in ((0, 3), (1, 4)):
+                bot = FakeBot(guilds)
+                bot.loop = asyncio.get_running_loop()
+                context = ClusterContext(cluster_id, 2, [cluster_id], 2, base)
+                cogs.append(ClusterIPCCog(bot, context, secret_key="secret", timeout=2.0))
+            for cog in cogs:
+                await cog.cog_load()
+            try:
+                merged = await cogs[0].gather_stats()
+                cogs[0].secret_key = "wrong"
+                unauthorized = await cogs[0].gather_stats()
+            finally:
+                for cog in cogs:
+                    await cog.cog_unload()
+            return merged, unauthorized
+
+        merged, unauthorized = asyncio.run(scenario())
+        self.assertEqual(merged["guilds"], 7)
+        self.assertEqual(merged["reachable"], 2)
+        self.assertEqual(merged["clusters"][1]["shards"], [1])
+        self.assertEqual((unauthorized["reachable"], unauthorized["clusters"][1]), (1, None))
+
+    def test_unreachable_peer_is_reported_as_missing(self):
+        from framework.cluster_ipc import ClusterIPCCog
+
+        base = free_port_pair()
+        cog = ClusterIPCCog(FakeBot(2), ClusterContext(0, 2, [0], 2, base), secret_key="secret", timeout=1.0)
+        stats = asyncio.run(cog.gather_stats())
+        self.assertEqual((stats["guilds"], stats["reachable"], stats["clusters"][1]), (2, 1, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
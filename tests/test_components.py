@@ -0,0 +1,132 @@
+import asyncio
+import json
+import types
+import unittest
+from unittest import mock
+
+from framework import components
+from framework.cache import BoundedCache, CacheBudget, adopt_class
+from framework.components import ComponentRegistry, benchmark, stable_checksum
+
+
+class SampleComponent:
+    """Mirrors the shape of the generated components."""
+    legacy_calls = 0
+
+    def __init__(self, parent_config: dict = None):
+        self._parent_config = parent_config if parent_config else {}
+        self._local_cache = {}
+        self._initialized = False
+
+    async def initialize(self):
+        self._local_cache['init_timestamp'] = "now"
+        self._initialized = True
+
+    def get_setting(self, key, default=None):
+        return self._parent_config.get(key, default)
+
+    async def process_data_stream(self, data: dict):
+        SampleComponent.legacy_calls += 1
+        return {"component_id": "samplecomponent-42", "data_checksum": hash(json.dumps(data, sort_keys=True)),
+                "meta": {"version": "1.2.3"}}
+
+
+class TestComponentRegistry(unittest.TestCase):
+    def test_adopted_class_is_slotted_and_behaves_the_same(self):
+        registry = ComponentRegistry()
+        cls = registry.adopt(SampleComponent)
+        self.assertIs(registry.adopt(SampleComponent), cls)
+        self.assertEqual(cls.__qualname__, SampleComponent.__qualname__)
+        first, second = cls({"threshold": 0.75}), cls({"threshold": 0.75})
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first._parent_config, second._parent_config)
+        self.assertIsInstance(first._parent_config, types.MappingProxyType)
+        self.assertEqual(first.get_setting("threshold"), 0.75)
+        self.assertIsNone(cls().get_setting("threshold"))
+
+        asyncio.run(first.initialize())
+        self.assertTrue(first._initialized)
+        self.assertFalse(second._initialized)
+        self.assertEqual(first._local_cache, {"init_timestamp": "now"})
+
+    def test_flag_slots_are_reused(self):
+        registry = ComponentRegistry()
+        cls = registry.adopt(SampleComponent)
+        component = cls()
+        component._initialized = True
+        del component
+        self.assertEqual(registry.live, 0)
+        self.assertFalse(cls()._initialized)
+        self.assertEqual(registry.stats()["flag_bytes"], 1)
+
+    def test_bounded_cache_adoption_and_footprint(self):
+        registry = ComponentRegistry()
+        cls = registry.adopt(SampleComponent)
+        adopt_class(cls, CacheBudget(0, ["Core"], max_entries=2), "Core")
+        self.assertIsInstance(cls()._local_cache, BoundedCache)
+        result = benchmark([SampleComponent], instances=50)
+        self.assertLess(result["new_bytes"], result["old_bytes"])
+
+
+class TestBatchProcessing(unittest.TestCase):
+    def test_checksum_is_canonical(self):
+        self.assertEqual(stable_checksum({"a": 1, "b": [1, 2]}), stable_checksum({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(stable_checksum({"a": 1}), stable_checksum({"a": 2}))
+
+    def test_process_batch_memoizes_repeated_records(self):
+        cls = ComponentRegistry().adopt(SampleComponent)
+        self.assertEqual((cls.component_id, cls.component_version), ("samplecomponent-42", "1.2.3"))
+        component = cls()
+
+        async def scenario():
+            self.assertEqual(await component.process_batch([{"a": 1}]), [])
+            await component.initialize()
+            records = [{"event": index % 3} for index in range(10)]
+            results = await component.process_batch(records, chunk_size=4)
+            streamed = [result async for result in component.stream_batch(records[:3])]
+            single = await component.process_data_stream({"event": 0})
+            return records, results, streamed, single
+
+        records, results, streamed, single = asyncio.run(scenario())
+        self.assertEqual(len(results), 10)
+        self.assertIsNot(results[0], results[3])
+        self.assertEqual([result["data_checksum"] for result in results], [stable_checksum(r) for r in records])
+        self.assertEqual([result["data_checksum"] for result in streamed], [r["data_checksum"] for r in results[:3]])
+        self.assertEqual(single["data_checksum"], results[0]["data_checksum"])
+        self.assertEqual(single["meta"], {"version": "1.2.3"})
+        self.assertEqual(len(component._batch_memo), 3)
+
+    def test_status_is_not_memoized_and_results_are_not_shared(self):
+        component = ComponentRegistry().adopt(SampleComponent)()
+
+        async def scenario():
+            await component.initialize()
+            with mock.patch.object(components.random, "random", side_effect=[0.05, 0.5, 0.5]):
+                results = await component.process_batch([{"event": 1}, {"event": 1}])
+                single = await component.process_data_stream({"event": 1})
+            return results, single
+
+        (first, second), single = asyncio.run(scenario())
+        self.assertEqual([first["operation_status"], second["operation_status"]], ["FAILURE", "SUCCESS"])
+        first["meta"]["version"] = "mutated"
+        self.assertEqual((second["meta"], single["meta"]), ({"version": "1.2.3"}, {"version": "1.2.3"}))
+
+    def test_single_record_path_serialises_once(self):
+        SampleComponent.legacy_calls = 0
+        component = ComponentRegistry().adopt(SampleComponent)()
+
+        async def scenario():
+            await component.initialize()
+            with mock.patch.object(components, "canonical_bytes", wraps=components.canonical_bytes) as serialise:
+                result = await component.process_data_stream({"event": 1})
+            return result, serialise.call_count
+
+        result, serialisations = asyncio.run(scenario())
+        self.assertEqual(serialisations, 1)
+        self.assertEqual(SampleComponent.legacy_calls, 0)
+        self.assertEqual(result["data_checksum"], stable_checksum({"event": 1}))
+        self.assertEqual(component._local_cache["last_processed"], result["received_at"])
+
+
+if __name__ == '__main__':
+    unittest.main()
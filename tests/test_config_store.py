@@ -0,0 +1,73 @@
+import asyncio
+import json
+import os
+import tempfile
+import types
+import unittest
+
+from framework.config_store import ConfigStore, adopt_module, config_namespace
+
+
+class TestConfigStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "config_store.sqlite3")
+        self.store = ConfigStore(self.path)
+        self.store.load()
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def _reopen(self):
+        self.store.close()
+        self.store = ConfigStore(self.path)
+        return self.store.load()
+
+    def test_defaults_are_served_but_only_saved_entries_persist(self):
+        config = self.store.namespace("Moderation.a.b.handler_X_0", {"enabled": True})
+        self.assertEqual(config, {"enabled": True})
+        self.store.set("Utilities.a.b.handler_Y_0", {"enabled": False})
+        self.assertEqual(self._reopen(), 1)
+        self.assertEqual(self.store.get("Utilities.a.b.handler_Y_0"), {"enabled": False})
+
+    def test_prefix_export_and_import(self):
+        self.store.import_all({"Moderation.x": {"a": 1}, "Utilities.y": {"b": 2}})
+        self.assertEqual(self.store.export_all("Moderation"), {"Moderation.x": {"a": 1}})
+        self.assertEqual(self.store.import_all({"Moderation.x": {"a": 5}}, overwrite=False), 0)
+
+    def test_legacy_files_are_migrated_once(self):
+        data_dir = os.path.join(self._tmp.name, "data")
+        os.makedirs(data_dir)
+        with open(os.path.join(data_dir, "handlerx0_config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"enabled": False}, f)
+        file_keys = {"handlerx0": "Moderation.m.handler_X_0", "handlery0": "Moderation.m.handler_Y_0"}
+        self.assertEqual(self.store.import_legacy_files(data_dir, file_keys), 1)
+        self.assertEqual(self.store.import_legacy_files(data_dir, file_keys), 0)
+        self.assertEqual(self.store.get("Moderation.m.handler_X_0"), {"enabled": False})
+
+    def test_adopted_cog_reads_and_saves_through_the_store(self):
+        lib = types.ModuleType("Modules.Moderation.m.handler_X_0")
+
+        class HandlerX0Cog:
+            def _load_config(self):
+                raise AssertionError("legacy loader must not run when defaults are indexed")
+
+            async def _save_config(self):
+                raise AssertionError("legacy saver must not run")
+
+        HandlerX0Cog.__module__ = lib.__name__
+        lib.HandlerX0Cog = HandlerX0Cog
+        key = config_namespace(lib.__name__)
+        adopt_module(lib, self.store, key, {"enabled": True})
+
+        cog = HandlerX0Cog()
+        cog._config = cog._load_config()
+        cog._config["enabled"] = False
+        asyncio.run(cog._save_config())
+        self._reopen()
+        self.assertEqual(self.store.get("Moderation.m.handler_X_0"), {"enabled": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
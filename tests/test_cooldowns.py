@@ -0,0 +1,94 @@
+import importlib.util
+import unittest
+
+from framework.cooldowns import CooldownEngine, adopt_cog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCooldownEngine(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_fixed_window_per_command_and_key(self):
+        engine = CooldownEngine(clock=self.clock)
+        command = engine.register("handlera0", 1, 10.0)
+        self.assertEqual(engine.acquire(command, 42), (0.0, None))
+        self.clock.now = 4.0
+        self.assertEqual(engine.acquire(command, 42), (6.0, command))
+        self.assertEqual(engine.acquire(command, 43), (0.0, None))
+        self.clock.now = 10.0
+        self.assertEqual(engine.acquire(command, 42), (0.0, None))
+
+    def test_rate_above_one_counts_uses(self):
+        engine = CooldownEngine(clock=self.clock)
+        command = engine.register("burst", 3, 5.0, "member")
+        for _ in range(3):
+            self.assertEqual(engine.acquire(command, (1, 2))[0], 0.0)
+        self.assertEqual(engine.acquire(command, (1, 2)), (5.0, command))
+
+    def test_budget_refusal_does_not_consume_the_command_cooldown(self):
+        engine = CooldownEngine(user_budget=(2, 60.0), clock=self.clock)
+        a, b, c = (engine.register(name, 1, 5.0) for name in "abc")
+        self.assertEqual(engine.acquire(a, 7, user_id=7)[0], 0.0)
+        self.assertEqual(engine.acquire(b, 7, user_id=7)[0], 0.0)
+        self.assertEqual(engine.acquire(c, 7, user_id=7), (60.0, engine.user_budget))
+        self.assertEqual(engine.acquire(c, 8, user_id=8)[0], 0.0)
+        self.assertEqual(engine.rejected, 1)
+
+    def test_expired_windows_are_dropped_by_the_wheel(self):
+        engine = CooldownEngine(tick=1.0, clock=self.clock)
+        command = engine.register("handlera0", 1, 30.0)
+        for user in range(1000):
+            engine.acquire(command, user)
+        self.assertEqual(len(engine), 1000)
+        full = engine.memory_bytes()
+        self.clock.now = 29.5
+        self.assertEqual(engine.expire(), 0)
+        self.clock.now = 30.0
+        self.assertEqual(engine.expire(), 1000)
+        self.assertEqual(len(engine), 0)
+        self.assertLess(engine.memory_bytes(), full)
+
+    def test_expire_on_acquire_without_a_scheduler(self):
+        engine = CooldownEngine(tick=1.0, clock=self.clock, expire_on_acquire=True)
+        command = engine.register("handlera0", 1, 30.0)
+        for user in range(100):
+            engine.acquire(command, user)
+        self.clock.now = 31.0
+        self.assertEqual(engine.acquire(command, 1000), (0.0, None))
+        self.assertEqual(len(engine), 1)
+
+
+@unittest.skipUnless(importlib.util.find_spec("discord"), "discord.py is not installed")
+class TestAdoptCog(unittest.TestCase):
+    def test_readoption_does_not_stack_checks(self):
+        from discord.ext import commands
+
+        class HandlerA0Cog(commands.Cog):
+            @commands.command(name="handlera0")
+            @commands.cooldown(1, 30, commands.BucketType.user)
+            @commands.guild_only()
+            async def main_command(self, ctx):
+                pass
+
+        engine = CooldownEngine()
+        cog = HandlerA0Cog()
+        callback_checks = HandlerA0Cog.main_command.callback.__commands_checks__
+        self.assertEqual(adopt_cog(cog, engine), 1)
+        copied = cog.main_command.copy()
+        copied._buckets = commands.CooldownMapping(commands.Cooldown(1, 30), commands.BucketType.user)
+        adopt_cog(type("Holder", (), {"walk_commands": lambda self: [copied]})(), engine)
+        self.assertEqual(len(cog.main_command.checks), 2)
+        self.assertEqual(len(copied.checks), 2)
+        self.assertEqual(len(callback_checks), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
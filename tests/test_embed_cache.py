@@ -0,0 +1,64 @@
+import asyncio
+import types
+import unittest
+
+from framework.embed_cache import COLOR_GREEN, COLOR_RED, EmbedCache, cached_main_command, command_version
+
+
+class HandlerA0Cog:
+    def __init__(self):
+        self._config = {"enabled": True}
+        self._cache = {}
+
+
+class FakeContext:
+    def __init__(self):
+        self.sent = []
+        self.command = types.SimpleNamespace(name="handlera0")
+        self.author = types.SimpleNamespace(guild_permissions=types.SimpleNamespace(manage_guild=False))
+
+    async def send(self, content=None, *, embed=None):
+        self.sent.append(embed if embed is not None else content)
+
+
+async def original_main_command(self, ctx, *, args: str = None):
+    version = "v1.2.3"
+    await ctx.send(f"original {args} {version}")
+
+
+class TestEmbedCache(unittest.TestCase):
+    def test_status_is_rebuilt_only_when_latest_data_is_replaced(self):
+        cache, cog = EmbedCache(freeze=lambda payload: payload), HandlerA0Cog()
+        first = cache.embed(cog, "status", "handlera0", "v1")
+        self.assertEqual(first["description"], "Current module health: **UNKNOWN**")
+        cog._cache['latest_data'] = {"status": "HEALTHY", "timestamp": "t", "metric_value": 1.5}
+        second = cache.embed(cog, "status", "handlera0", "v1")
+        self.assertEqual(second["color"], COLOR_GREEN)
+        self.assertEqual(second["fields"][1]["value"], "1.5")
+        self.assertIs(cache.embed(cog, "status", "handlera0", "v1"), second)
+        cog._cache['latest_data'] = {"status": "OFFLINE"}
+        self.assertEqual(cache.embed(cog, "status", "handlera0", "v1")["color"], COLOR_RED)
+        self.assertEqual((cache.hits, cache.builds), (1, 3))
+
+    def test_info_is_shared_between_instances(self):
+        cache = EmbedCache(freeze=lambda payload: payload)
+        info = cache.embed(HandlerA0Cog(), "info", "handlera0", "v1.2.3")
+        self.assertIs(cache.embed(HandlerA0Cog(), "info", "handlera0", "v1.2.3"), info)
+        self.assertEqual(info["footer"]["text"], "Powered by the Advanced Bot Framework - ID: handlera0")
+        self.assertEqual(info["title"], "HandlerA0Cog Information")
+
+    def test_wrapped_command_falls_through_for_other_arguments(self):
+        self.assertEqual(command_version(original_main_command), "v1.2.3")
+        command = cached_main_command(original_main_command, EmbedCache(freeze=lambda payload: payload))
+        cog, ctx = HandlerA0Cog(), FakeContext()
+        asyncio.run(command(cog, ctx, args=" INFO "))
+        asyncio.run(command(cog, ctx, args="refresh"))
+        self.assertEqual(ctx.sent[0]["fields"][0]["value"], "v1.2.3")
+        self.assertEqual(ctx.sent[1], "original refresh v1.2.3")
+        cog._config["enabled"] = False
+        asyncio.run(command(cog, ctx, args="status"))
+        self.assertEqual(ctx.sent[2], "original status v1.2.3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import datetime
+import json
+import types
+import unittest
+
+from framework.components import ComponentRegistry
+from framework.eventbus import EventBus, command_module, connect_components, forward_message, owner_module
+
+
+class TestEventBus(unittest.TestCase):
+    def test_fan_out_shares_payload_and_batches(self):
+        bus = EventBus()
+        single, batches = [], []
+
+        async def on_single(payload):
+            single.append(payload)
+
+        async def on_batch(payloads):
+            batches.append(payloads)
+
+        async def scenario():
+            bus.subscribe("events", on_single)
+            bus.subscribe("events", on_batch, batch_size=10)
+            payloads = [{"n": index} for index in range(5)]
+            for payload in payloads:
+                self.assertEqual(bus.publish_nowait("events", payload), 2)
+            await asyncio.sleep(0.01)
+            return payloads
+
+        payloads = asyncio.run(scenario())
+        self.assertEqual(single, payloads)
+        self.assertIs(single[0], payloads[0])
+        self.assertEqual(batches, [payloads])
+        self.assertEqual(bus.stats()["events"]["delivered"], 10)
+
+    def test_typed_topics_and_drop_policies(self):
+        bus = EventBus()
+
+        async def slow(payload):
+            await asyncio.sleep(1)
+
+        async def scenario():
+            bus.topic("numbers", int)
+            with self.assertRaises(TypeError):
+                bus.publish_nowait("numbers", "one")
+            newest = bus.subscribe("numbers", slow, maxsize=2, policy="drop_newest")
+            oldest = bus.subscribe("numbers", slow, maxsize=2, policy="drop_oldest")
+            for number in range(5):
+                bus.publish_nowait("numbers", number)
+            depths = ([item[1] for item in newest._queue], [item[1] for item in oldest._queue])
+            bus.close()
+            return depths, newest.dropped, oldest.dropped
+
+        (newest_queue, oldest_queue), newest_dropped, oldest_dropped = asyncio.run(scenario())
+        self.assertEqual(newest_queue, [0, 1])
+        self.assertEqual(oldest_queue, [3, 4])
+        self.assertEqual((newest_dropped, oldest_dropped), (3, 0))
+
+    def test_block_policy_applies_backpressure(self):
+        bus = EventBus()
+        received = []
+
+        async def consumer(payload):
+            await asyncio.sleep(0.01)
+            received.append(payload)
+
+        async def scenario():
+            bus.subscribe("work", consumer, maxsize=1, policy="block")
+            for number in range(4):
+                await bus.publish("work", number)
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+        self.assertEqual(received, [0, 1, 2, 3])
+
+    def test_components_subscribe_to_their_owning_cog(self):
+        cog = "Modules.Core.core_A_1.module_B_2.handler_Abc_0"
+        self.assertEqual(owner_module("Modules.Core.core_A_1.module_B_2.handler_abc_0_components.utility_X_0", [cog]), cog)
+
+        class Component:
+            async def process_batch(self, records):
+                pass
+
+        bus = EventBus()
+        components = {"Modules.Core.core_A_1.module_B_2.handler_abc_0_components.utility_X_0.UtilityXComponent": Component(),
+                      "Modules.Core.core_A_1.module_B_2.handler_Def_1.HandlerDefComponent": Component()}
+        self.assertEqual(connect_components(bus, components, [cog]), 1)
+        self.assertTrue(bus.has_subscribers(f"cog.{cog}"))
+
+    def test_gateway_message_reaches_the_owning_cogs_components(self):
+        cog_module = "Modules.Core.core_A_1.module_B_2.handler_Abc_0"
+        batches = []
+
+        class UtilityComponent:
+            def __init__(self, parent_config: dict = None):
+                self._parent_config = parent_config if parent_config else {}
+                self._local_cache = {}
+                self._initialized = False
+
+            async def initialize(self):
+                self._initialized = True
+
+            async def process_data_stream(self, data: dict):
+                return {"data_checksum": hash(json.dumps(data, sort_keys=True))}
+
+        component = ComponentRegistry().adopt(UtilityComponent)()
+        process_batch = component.process_batch
+
+        async def recording_batch(records):
+            batches.append(list(records))
+            return await process_batch(batches[-1])
+
+        handler_cog = type("HandlerAbc0Cog", (), {"__module__": cog_module})()
+        command = types.SimpleNamespace(cog=handler_cog, extras={})
+        stub = types.SimpleNamespace(cog=None, extras={"lazy_module": cog_module})
+        self.assertEqual((command_module(command), command_module(stub)), (cog_module, cog_module))
+
+        message = types.SimpleNamespace(id=1, channel=types.SimpleNamespace(id=2), guild=types.SimpleNamespace(id=3),
+                                        author=types.SimpleNamespace(id=4), content="!handlerabc0 status",
+                                        created_at=datetime.datetime(2024, 1, 1))
+        bus = EventBus()
+
+        async def scenario():
+            await component.initialize()
+            key = "Modules.Core.core_A_1.module_B_2.handler_abc_0_components.utility_X_0.UtilityComponent"
+            connect_components(bus, {key: component}, [cog_module])
+            bus.topics[f"cog.{cog_module}"].subscriptions[0].handler = recording_batch
+            self.assertEqual(forward_message(bus, "Modules.Other.handler_Xyz_0", message), 0)
+            self.assertEqual(forward_message(bus, command_module(command), message), 1)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0][0]["content"], "!handlerabc0 status")
+        self.assertEqual(batches[0][0]["guild_id"], 3)
+        self.assertIn("last_processed", component._local_cache)
+        self.assertEqual(bus.stats()[f"cog.{cog_module}"]["delivered"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
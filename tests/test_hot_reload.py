@@ -0,0 +1,72 @@
+import unittest
+
+from framework.hot_reload import ReloadPlan, ReloadReport
+
+
+class FakeManifest:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get(self, module_name):
+        return self.entries.get(module_name)
+
+
+def _entry(is_extension, category="Core"):
+    return {"is_extension": is_extension, "category": category}
+
+
+class TestReloadPlan(unittest.TestCase):
+    def test_only_changed_modules_are_touched(self):
+        manifest = FakeManifest({
+            "Modules.Core.a.handler_A_0": _entry(True),
+            "Modules.Core.a.handler_B_1": _entry(True),
+            "Modules.Core.a.handler_c_2_components.utility_D_0": _entry(False),
+            "Modules.Core.a.handler_E_3": _entry(True),
+            "Modules.Games.a.handler_F_4": _entry(True, "Games"),
+        })
+        changes = {
+            "changed": ["Modules.Core.a.handler_A_0", "Modules.Core.a.handler_B_1",
+                        "Modules.Core.a.handler_c_2_components.utility_D_0"],
+            "added": ["Modules.Core.a.handler_E_3", "Modules.Games.a.handler_F_4"],
+            "removed": ["Modules.Core.a.handler_G_5", "Modules.Core.a.handler_H_6"],
+        }
+        loaded = {"Modules.Core.a.handler_A_0", "Modules.Core.a.handler_G_5", "Modules.Core.a.handler_Z_9"}
+        stubbed = {"Modules.Core.a.handler_B_1", "Modules.Core.a.handler_H_6"}
+        plan = ReloadPlan.from_changes(manifest, changes, loaded, categories={"Core"}, stubbed=stubbed)
+
+        self.assertEqual(plan.reload, ["Modules.Core.a.handler_A_0"])
+        self.assertEqual(plan.restub, ["Modules.Core.a.handler_B_1", "Modules.Core.a.handler_H_6"])
+        self.assertEqual(plan.load, ["Modules.Core.a.handler_E_3"])
+        self.assertEqual(plan.unload, ["Modules.Core.a.handler_G_5"])
+        self.assertEqual(plan.components, ["Modules.Core.a.handler_c_2_components.utility_D_0"])
+        self.assertEqual(plan.dropped_components, ["Modules.Core.a.handler_H_6"])
+
+    def test_fixed_extension_that_failed_to_load_is_loaded(self):
+        manifest = FakeManifest({
+            "Modules.Core.a.handler_B_1": _entry(True),
+            "Modules.Games.a.handler_F_4": _entry(True, "Games"),
+        })
+        changes = {"changed": ["Modules.Core.a.handler_B_1", "Modules.Games.a.handler_F_4"], "added": [],
+                   "removed": ["Modules.Core.a.handler_H_6"]}
+        plan = ReloadPlan.from_changes(manifest, changes, set(), categories={"Core"})
+
+        self.assertEqual(plan.load, ["Modules.Core.a.handler_B_1"])
+        self.assertEqual(plan.restub, [])
+        self.assertEqual(plan.dropped_components, ["Modules.Core.a.handler_H_6"])
+
+    def test_no_changes_means_empty_plan(self):
+        plan = ReloadPlan.from_changes(FakeManifest({}), {"added": [], "changed": [], "removed": []}, set())
+        self.assertFalse(plan)
+
+    def test_summary_lists_slowest_first(self):
+        report = ReloadReport()
+        report.record("fast", "reload", 0.001)
+        report.record("slow", "component", 0.2, "FAILED: 1 components")
+        lines = report.format_summary().splitlines()
+        self.assertTrue(lines[0].startswith("slow"))
+        self.assertIn("1 failed", lines[-1])
+        self.assertEqual(ReloadReport().format_summary(), "No changed modules; nothing was reloaded.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from framework.components import ComponentRegistry
+from framework.initializer import ComponentInitializer
+
+
+class _Component:
+    """Template for the generated component classes, which have no base class."""
+    order = []
+
+    def __init__(self, parent_config: dict = None):
+        self._parent_config = parent_config if parent_config else {}
+        self._local_cache = {}
+        self._initialized = False
+
+    async def initialize(self):
+        await asyncio.sleep(0.01)
+        _Component.order.append(type(self).__name__)
+        self._initialized = True
+
+    async def process_data_stream(self, data: dict):
+        if not self._initialized:
+            return None
+        return {"component_id": "x-1", "data_checksum": 0}
+
+
+def _initializer(names, dependencies, max_concurrency=8):
+    registry = ComponentRegistry(ready_timeout=5)
+    initializer = ComponentInitializer(registry, max_concurrency)
+    for name in names:
+        namespace = {key: value for key, value in vars(_Component).items() if key not in ("__dict__", "__weakref__")}
+        cls = registry.adopt(type(name, (), dict(namespace, __module__="tests.components")))
+        initializer.components[name] = cls()
+        initializer.dependencies[name] = dependencies.get(name, [])
+    return initializer
+
+
+class TestComponentInitializer(unittest.TestCase):
+    def setUp(self):
+        _Component.order = []
+
+    def test_dependencies_initialize_first_and_independent_ones_run_concurrently(self):
+        initializer = _initializer(["A", "B", "C", "D"], {"A": ["B"], "B": ["C"]})
+
+        async def scenario():
+            started = asyncio.get_running_loop().time()
+            report = await initializer.initialize_all()
+            return report, asyncio.get_running_loop().time() - started
+
+        report, elapsed = asyncio.run(scenario())
+        self.assertEqual(report.ready, 4)
+        self.assertLess(_Component.order.index("C"), _Component.order.index("B"))
+        self.assertLess(_Component.order.index("B"), _Component.order.index("A"))
+        self.assertLess(elapsed, 0.1)
+
+    def test_cycles_and_failed_dependencies_are_reported(self):
+        initializer = _initializer(["A", "B", "C"], {"A": ["B"], "B": ["A"], "C": ["A"]})
+        report = asyncio.run(initializer.initialize_all())
+        self.assertEqual(report.ready, 0)
+        self.assertEqual(report.failed["A"], "dependency cycle")
+        self.assertIn("C", report.failed)
+
+    def test_processing_waits_for_readiness_instead_of_dropping(self):
+        initializer = _initializer(["A"], {})
+
+        async def scenario():
+            pending = asyncio.ensure_future(initializer.get("A").process_data_stream({"a": 1}))
+            await asyncio.sleep(0)
+            self.assertFalse(pending.done())
+            await initializer.initialize_all()
+            return await pending
+
+        self.assertIsNotNone(asyncio.run(scenario()))
+
+    def test_forget_drops_a_modules_components_and_adopted_classes(self):
+        initializer = _initializer(["tests.components.A", "tests.other.B"], {"tests.other.B": ["tests.components.A"]})
+        removed = initializer.forget(["tests.components"])
+        self.assertEqual(removed, ["tests.components.A"])
+        self.assertEqual(list(initializer.components), ["tests.other.B"])
+        self.assertEqual(initializer.registry.classes, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
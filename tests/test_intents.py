@@ -0,0 +1,34 @@
+import unittest
+
+from framework.intents import BASELINE_INTENTS, GatewayPlan, format_savings_report, read_declarations
+
+
+class TestGatewayPlan(unittest.TestCase):
+    def test_read_declarations_ignores_other_assignments(self):
+        source = 'OTHER = 1\nREQUIRED_INTENTS = ["members"]\nMEMBER_CACHE_FLAGS = ["joined", "voice"]\n'
+        self.assertEqual(read_declarations(source), {"REQUIRED_INTENTS": ["members"], "MEMBER_CACHE_FLAGS": ["joined", "voice"]})
+
+    def test_union_keeps_baseline_and_drops_unbacked_cache_flags(self):
+        plan = GatewayPlan()
+        plan.add({"REQUIRED_INTENTS": ["members", "moderation"], "MEMBER_CACHE_FLAGS": ["joined", "voice"]}, "Moderation")
+        plan.add({"REQUIRED_INTENTS": ["members"], "CHUNK_GUILDS_AT_STARTUP": True}, "Security_Suite")
+        self.assertEqual(plan.intents, BASELINE_INTENTS | {"members", "moderation"})
+        self.assertEqual(plan.effective_member_cache(), {"joined"})
+        self.assertTrue(plan.chunk_guilds)
+        self.assertEqual(plan.sources["members"], ["Moderation", "Security_Suite"])
+
+    def test_report_lists_disabled_presences(self):
+        report = format_savings_report(GatewayPlan())
+        self.assertIn("presences", report.splitlines()[1])
+
+    def test_report_labels_guild_chunking(self):
+        plan = GatewayPlan()
+        self.assertTrue(format_savings_report(plan).splitlines()[2].endswith("chunk guilds at startup: off"))
+        plan.add({"CHUNK_GUILDS_AT_STARTUP": True}, "Security_Suite")
+        self.assertIn("off (requested, but 'members' is disabled)", format_savings_report(plan).splitlines()[2])
+        plan.add({"REQUIRED_INTENTS": ["members"]}, "Moderation")
+        self.assertTrue(format_savings_report(plan).splitlines()[2].endswith("chunk guilds at startup: on"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+from framework.manifest import ExtensionManifest
+
+PACKAGE = "LazyFixtures"
+
+COG_SOURCE = """
+from discord.ext import commands
+
+
+class {cog}(commands.Cog):
+    @commands.command(name="{command}")
+    @commands.cooldown(1, 30, commands.BucketType.user)
+    async def main_command(self, ctx):
+        pass
+
+
+async def setup(bot):
+    await bot.add_cog({cog}())
+"""
+
+
+class RecordingBot:
+    """Stands in for `ctx.bot` when a stub re-dispatches the message."""
+    def __init__(self):
+        self.invoked = []
+
+    async def get_context(self, message):
+        return ("context", message)
+
+    async def invoke(self, ctx):
+        self.invoked.append(ctx)
+
+
+@unittest.skipUnless(importlib.util.find_spec("discord"), "discord.py is not installed")
+class TestLazyExtensionRegistry(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.module_dir = os.path.join(self.root, PACKAGE, "Core", "core_A_0")
+        os.makedirs(self.module_dir)
+        for directory in (os.path.join(self.root, PACKAGE), os.path.join(self.root, PACKAGE, "Core"), self.module_dir):
+            self._write(os.path.join(directory, "__init__.py"), "")
+        sys.path.insert(0, self.root)
+
+    def tearDown(self):
+        sys.path.remove(self.root)
+        for name in [name for name in sys.modules if name.split(".")[0] == PACKAGE]:
+            del sys.modules[name]
+        self._tmp.cleanup()
+
+    def _write(self, path, source):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    def _module(self, name, cog, command):
+        self._write(os.path.join(self.module_dir, f"{name}.py"), COG_SOURCE.format(cog=cog, command=command))
+        return f"{PACKAGE}.Core.core_A_0.{name}"
+
+    def _registry(self, manifest):
+        import discord
+        from discord.ext import commands
+
+        from framework.lazy import LazyExtensionRegistry
+        from framework.loader import ParallelExtensionLoader
+
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+        loader = ParallelExtensionLoader(bot, manifest)
+        loads = []
+        load = loader.load
+
+        async def counting_load(names):
+            loads.append(list(names))
+            return await load(names)
+
+        loader.load = counting_load
+        return bot, LazyExtensionRegistry(bot, manifest, loader, idle_unload_seconds=0), loads
+
+    def test_stub_loads_the_extension_on_first_use(self):
+        name = self._module("handler_A_0", "HandlerA0Cog", "a0")
+        manifest = ExtensionManifest(self.root, package=PACKAGE)
+        manifest.refresh()
+
+        async def scenario():
+            bot, registry, loads = self._registry(manifest)
+            registry.register(manifest.extensions())
+            stub = bot.get_command("a0")
+            state = (stub.extras.get("lazy_module"), stub.cog, registry.is_stubbed(name), name in bot.extensions)
+            ctx = types.SimpleNamespace(bot=RecordingBot(), message="!a0")
+            await asyncio.gather(*(stub.callback(ctx) for _ in range(3)))
+            return bot, registry, loads, stub, state, ctx
+
+        bot, registry, loads, stub, state, ctx = asyncio.run(scenario())
+        self.assertEqual(state, (name, None, True, False))
+        self.assertEqual(loads, [[name]])
+        self.assertIn(name, bot.extensions)
+        self.assertIn(name, registry.lazy_loaded)
+        self.assertFalse(registry.is_stubbed(name))
+        self.assertIsNot(bot.get_command("a0"), stub)
+        self.assertEqual(type(bot.get_command("a0").cog).__name__, "HandlerA0Cog")
+        self.assertEqual(ctx.bot.invoked, [("context", "!a0")] * 3)
+
+    def test_refresh_rebuilds_stubs_from_the_manifest(self):
+        changed = self._module("handler_B_1", "HandlerB1Cog", "b1")
+        removed = self._module("handler_C_2", "HandlerC2Cog", "c2")
+        manifest = ExtensionManifest(self.root, package=PACKAGE)
+        manifest.refresh()
+
+        async def scenario():
+            bot, registry, loads = self._registry(manifest)
+            registry.register(manifest.extensions())
+            self._module("handler_B_1", "HandlerB1Cog", "b1renamed")
+            os.remove(os.path.join(self.module_dir, "handler_C_2.py"))
+            changes = manifest.refresh()
+            registry.refresh(changes["changed"] + changes["removed"] + ["not.stubbed"])
+            return bot, registry, loads, changes
+
+        bot, registry, loads, changes = asyncio.run(scenario())
+        self.assertEqual((changes["changed"], changes["removed"]), ([changed], [removed]))
+        self.assertIsNone(bot.get_command("b1"))
+        self.assertEqual(bot.get_command("b1renamed").extras["lazy_module"], changed)
+        self.assertIsNone(bot.get_command("c2"))
+        self.assertEqual(sorted(registry.stubbed), [changed])
+        self.assertEqual(loads, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+from framework.manifest import ExtensionManifest
+
+PACKAGE = "LoaderFixtures"
+
+COG_SOURCE = """
+import threading
+
+from discord.ext import commands
+
+IMPORTED_IN = threading.current_thread().name
+
+
+class {cog}(commands.Cog):
+    @commands.command(name="{command}")
+    async def main_command(self, ctx):
+        pass
+
+
+async def setup(bot):
+    await bot.add_cog({cog}())
+"""
+
+
+@unittest.skipUnless(importlib.util.find_spec("discord"), "discord.py is not installed")
+class TestParallelExtensionLoader(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.module_dir = os.path.join(self.root, PACKAGE, "Core", "core_A_0")
+        os.makedirs(self.module_dir)
+        for directory in (os.path.join(self.root, PACKAGE), os.path.join(self.root, PACKAGE, "Core"), self.module_dir):
+            self._write(os.path.join(directory, "__init__.py"), "")
+        sys.path.insert(0, self.root)
+
+    def tearDown(self):
+        sys.path.remove(self.root)
+        for name in [name for name in sys.modules if name.split(".")[0] == PACKAGE]:
+            del sys.modules[name]
+        self._tmp.cleanup()
+
+    def _write(self, path, source):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    def _module(self, name, source):
+        self._write(os.path.join(self.module_dir, f"{name}.py"), source)
+        return f"{PACKAGE}.Core.core_A_0.{name}"
+
+    def _bot(self):
+        import discord
+        from discord.ext import commands
+
+        return commands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+    def test_manifest_extensions_are_imported_in_the_pool_and_set_up_in_order(self):
+        from framework.loader import ParallelExtensionLoader
+
+        for index in range(4):
+            self._module(f"handler_H{index}_{index}", COG_SOURCE.format(cog=f"HandlerH{index}Cog", command=f"h{index}"))
+        self._module("handler_c_0_components", "")
+        manifest = ExtensionManifest(self.root, package=PACKAGE)
+        manifest.refresh()
+        names = manifest.extensions()
+        hooked = []
+
+        async def scenario():
+            bot = self._bot()
+            loader = ParallelExtensionLoader(bot, manifest, max_workers=4,
+                                             module_hooks=[lambda name, lib: hooked.append(name)])
+            return bot, await loader.load(names)
+
+        bot, report = asyncio.run(scenario())
+        self.assertEqual(len(names), 4)
+        self.assertEqual((report.loaded, report.failed), (4, 0))
+        self.assertEqual(hooked, names)
+        # activate_extension writes discord.py's private extension mapping; the
+        # public view must reflect it or a discord.py upgrade renamed it.
+        self.assertEqual(list(bot.extensions), names)
+        self.assertEqual(list(bot.cogs), [f"HandlerH{index}Cog" for index in range(4)])
+        for name in names:
+            self.assertTrue(sys.modules[name].IMPORTED_IN.startswith("ext-import"))
+
+    def test_failures_are_reported_per_extension(self):
+        from discord.ext import commands
+        from framework.loader import ParallelExtensionLoader, activate_extension
+
+        good = self._module("handler_A_0", COG_SOURCE.format(cog="HandlerA0Cog", command="a0"))
+        broken_import = self._module("handler_B_1", "raise RuntimeError('boom')\n\nasync def setup(bot):\n    pass\n")
+        broken_setup = self._module("handler_C_2", "async def setup(bot):\n    raise ValueError('bad setup')\n")
+        manifest = ExtensionManifest(self.root, package=PACKAGE)
+        manifest.refresh()
+
+        async def scenario():
+            bot = self._bot()
+            report = await ParallelExtensionLoader(bot, manifest).load([good, broken_import, broken_setup])
+            again = await ParallelExtensionLoader(bot, manifest).load([good])
+            with self.assertRaises(commands.ExtensionAlreadyLoaded):
+                await activate_extension(bot, good, sys.modules[good])
+            return bot, report, again
+
+        bot, report, again = asyncio.run(scenario())
+        statuses = {module: status for module, _, _, status in report.rows}
+        self.assertEqual(statuses[good], "OK")
+        self.assertEqual(statuses[broken_import], "IMPORT FAILED: ExtensionFailed")
+        self.assertEqual(statuses[broken_setup], "SETUP FAILED: ExtensionFailed")
+        self.assertEqual((report.loaded, report.failed), (1, 2))
+        self.assertIn("Loaded: 1, Failed: 2.", report.format_table())
+        self.assertEqual(again.rows[0][3], "SKIPPED")
+        self.assertEqual(list(bot.extensions), [good])
+        self.assertNotIn(broken_import, sys.modules)
+        self.assertNotIn(broken_setup, sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
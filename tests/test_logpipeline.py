@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from framework.logpipeline import BatchingFileHandler, DeferredQueueHandler, JsonLinesFormatter, LogPipeline
+
+
+class TestLogPipeline(unittest.TestCase):
+    def test_records_are_formatted_on_the_listener_as_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bot.log")
+            file_handler = BatchingFileHandler(path)
+            file_handler.setFormatter(JsonLinesFormatter())
+            pipeline = LogPipeline([file_handler], batch_size=2, flush_interval=0.05)
+            pipeline.start()
+            logger = logging.getLogger("tests.logpipeline")
+            logger.propagate = False
+            logger.addHandler(DeferredQueueHandler(pipeline.queue))
+            try:
+                for index in range(5):
+                    logger.warning("tick %d", index)
+            finally:
+                pipeline.stop()
+                logger.handlers.clear()
+            with open(path, encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f]
+        self.assertEqual([entry["message"] for entry in entries], [f"tick {index}" for index in range(5)])
+        self.assertEqual(pipeline.processed, 5)
+
+    def test_size_rotation_keeps_backup_count_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bot.log")
+            handler = BatchingFileHandler(path, max_bytes=50, backup_count=2)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            for index in range(6):
+                handler.handle(logging.makeLogRecord({"msg": f"line {index} " + "x" * 30}))
+                handler.flush()
+            handler.close()
+            self.assertEqual(sorted(os.listdir(tmp)), ["bot.log", "bot.log.1", "bot.log.2"])
+            with open(path, encoding='utf-8') as f:
+                self.assertTrue(f.read().startswith("line 5"))
+
+    def test_size_budget_counts_encoded_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bot.log")
+            handler = BatchingFileHandler(path, max_bytes=50, backup_count=1)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            for _ in range(2):
+                # 21 characters, 41 bytes in UTF-8.
+                handler.handle(logging.makeLogRecord({"msg": "\u00e9" * 20}))
+                handler.flush()
+            handler.close()
+            self.assertEqual(sorted(os.listdir(tmp)), ["bot.log", "bot.log.1"])
+            self.assertEqual(os.path.getsize(path), 41)
+
+    def test_age_counts_from_when_the_handler_opened_the_file(self):
+        now = [1000.0]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bot.log")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("from the previous run\n")
+            handler = BatchingFileHandler(path, rotate_interval=60, backup_count=1, clock=lambda: now[0])
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            def write(message):
+                handler.handle(logging.makeLogRecord({"msg": message}))
+                handler.flush()
+
+            write("opened")
+            now[0] = 1030.0
+            os.chmod(path, 0o600)  # Metadata changes must not restart the clock.
+            write("still young")
+            self.assertEqual(os.listdir(tmp), ["bot.log"])
+            now[0] = 1061.0
+            write("rotated")
+            handler.close()
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), "rotated\n")
+            with open(f"{path}.1", encoding='utf-8') as f:
+                self.assertEqual(f.read().splitlines(), ["from the previous run", "opened", "still young"])
+
+
+if __name__ == '__main__':
+    unittest.main()
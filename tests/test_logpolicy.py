@@ -0,0 +1,45 @@
+import logging
+import unittest
+
+from framework.logpolicy import LogPolicyFilter
+
+
+def _record(name, level=logging.INFO, lineno=10):
+    return logging.LogRecord(name, level, "handler.py", lineno, "update", (), None)
+
+
+class TestLogPolicyFilter(unittest.TestCase):
+    def test_most_specific_pattern_wins_and_sampling_is_deterministic(self):
+        log_filter = LogPolicyFilter({"Modules.*": {"sample": 1.0}, "Modules.Messages.*": {"sample": 0.25}})
+        kept = [log_filter.filter(_record("Modules.Messages.a.b")) for _ in range(8)]
+        self.assertEqual(kept.count(True), 2)
+        self.assertTrue(all(log_filter.filter(_record("Modules.Core.a")) for _ in range(8)))
+        self.assertTrue(log_filter.filter(_record("bot.main")))
+        self.assertEqual(log_filter.stats()["sampled_out"], 6)
+
+    def test_rate_limit_summarises_suppressed_records(self):
+        now = [100.0]
+        log_filter = LogPolicyFilter({"Modules.*": {"rate_limit": 2, "window_seconds": 10}}, clock=lambda: now[0])
+        summaries = []
+        logger = logging.getLogger("Modules.Core.x")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.Handler()
+        handler.emit = summaries.append
+        logger.addHandler(handler)
+        try:
+            kept = [log_filter.filter(_record("Modules.Core.x")) for _ in range(5)]
+            self.assertTrue(log_filter.filter(_record("Modules.Core.x", logging.ERROR)))
+            now[0] += 10
+            self.assertTrue(log_filter.filter(_record("Modules.Core.x")))
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+        self.assertEqual(kept, [True, True, False, False, False])
+        self.assertEqual(len(summaries), 1)
+        self.assertIn("Suppressed 3 similar", summaries[0].getMessage())
+        self.assertEqual(log_filter.stats()["rate_limited"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
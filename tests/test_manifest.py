@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from framework.manifest import ExtensionManifest, index_source
+
+
+class TestExtensionManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.module_dir = os.path.join(self.root, "Modules", "Utilities", "utilities_A_0", "module_B_0")
+        os.makedirs(os.path.join(self.module_dir, "__pycache__"))
+        self._write("handler_A_0.py", "async def setup(bot):\n    pass\n")
+        self._write("handler_B_1.py", "class HandlerB1Component:\n    pass\n")
+        self._write("__init__.py", "")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, source):
+        with open(os.path.join(self.module_dir, name), 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    def test_only_modules_with_setup_are_extensions(self):
+        manifest = ExtensionManifest(self.root)
+        changes = manifest.refresh()
+        self.assertEqual(len(changes["added"]), 2)
+        self.assertEqual(manifest.extensions(), ["Modules.Utilities.utilities_A_0.module_B_0.handler_A_0"])
+        self.assertEqual(manifest.extensions(categories={"Moderation"}), [])
+
+    def test_round_trip_and_change_detection(self):
+        manifest = ExtensionManifest(self.root)
+        manifest.refresh()
+        manifest.save()
+
+        reloaded = ExtensionManifest(self.root)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.refresh(), {"added": [], "changed": [], "removed": []})
+
+        self._write("handler_A_0.py", "async def setup(bot):\n    return None\n")
+        os.remove(os.path.join(self.module_dir, "handler_B_1.py"))
+        changes = reloaded.refresh()
+        self.assertEqual(changes["changed"], ["Modules.Utilities.utilities_A_0.module_B_0.handler_A_0"])
+        self.assertEqual(changes["removed"], ["Modules.Utilities.utilities_A_0.module_B_0.handler_B_1"])
+
+    def test_concurrent_saves_do_not_share_a_temp_file(self):
+        manifest = ExtensionManifest(self.root)
+        manifest.refresh()
+        errors = []
+
+        def save_repeatedly():
+            try:
+                for _ in range(50):
+                    manifest.save()
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save_repeatedly) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(ExtensionManifest(self.root).load())
+        self.assertEqual(os.listdir(os.path.dirname(manifest.path)), ["extension_manifest.json"])
+
+    def test_static_command_index(self):
+        source = (
+            b"class HandlerA0Cog(commands.Cog):\n"
+            b"    @commands.command(name=\"handlera0\", aliases=[\"h\"])\n"
+            b"    @commands.cooldown(1, 23, commands.BucketType.user)\n"
+            b"    @commands.guild_only()\n"
+            b"    async def main_command(self, ctx, *, args: str = None):\n"
+            b"        pass\n"
+        )
+        index = index_source(source)
+        self.assertEqual(index["cog"], "HandlerA0Cog")
+        self.assertEqual(index["commands"], [{"name": "handlera0", "aliases": ["h"], "cooldown": [1, 23.0, "user"], "guild_only": True}])
+        self.assertEqual(index["listeners"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from framework.metrics import MetricsRegistry, MetricsServer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_text_exposition(self):
+        registry = MetricsRegistry("vynobot")
+        latency = registry.histogram("command_latency_seconds", "Latency.", ("category", "command"), buckets=(0.1, 1.0))
+        errors = registry.counter("command_errors_total", "Errors.", ("category",))
+        child = latency.labels("Games", "roll")
+        for value in (0.05, 0.1, 0.5, 3.0):
+            child.observe(value)
+        errors.labels('say "hi"').inc()
+        text = registry.render()
+        self.assertIn("# TYPE vynobot_command_latency_seconds histogram", text)
+        self.assertIn('vynobot_command_latency_seconds_bucket{category="Games",command="roll",le="0.1"} 2', text)
+        self.assertIn('vynobot_command_latency_seconds_bucket{category="Games",command="roll",le="1.0"} 3', text)
+        self.assertIn('vynobot_command_latency_seconds_bucket{category="Games",command="roll",le="+Inf"} 4', text)
+        self.assertIn('vynobot_command_latency_seconds_count{category="Games",command="roll"} 4', text)
+        self.assertIn('vynobot_command_errors_total{category="say \\"hi\\""} 1', text)
+
+    def test_collectors_run_before_each_render_and_kinds_do_not_clash(self):
+        registry = MetricsRegistry()
+        depth = registry.gauge("queue_depth", "Depth.")
+        registry.add_collector(lambda: depth.labels().set(7))
+        self.assertIn("queue_depth 7", registry.render())
+        self.assertIs(registry.gauge("queue_depth", "Depth."), depth)
+        with self.assertRaises(ValueError):
+            registry.counter("queue_depth", "Depth.")
+        with self.assertRaises(ValueError):
+            registry.counter("labelled", "x", ("a",)).labels()
+
+    def test_http_endpoint(self):
+        registry = MetricsRegistry()
+        registry.counter("up_total", "Up.").labels().inc()
+
+        async def scenario():
+            server = MetricsServer(registry, port=0)
+            await server.start()
+            responses = []
+            for path in ("/metrics", "/other"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                await writer.drain()
+                responses.append((await reader.read()).decode())
+                writer.close()
+            server.stop()
+            return responses
+
+        metrics, missing = asyncio.run(scenario())
+        self.assertTrue(metrics.startswith("HTTP/1.1 200 OK"))
+        self.assertIn("up_total 1", metrics)
+        self.assertTrue(missing.startswith("HTTP/1.1 404"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import unittest
+
+from framework.outbound import BACKGROUND, OutboundDispatcher, RateLimitObserver
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+        return len(self.sent)
+
+
+class TestOutboundDispatcher(unittest.TestCase):
+    def test_idle_channel_sends_immediately_and_bursts_are_merged(self):
+        dispatcher = OutboundDispatcher(rate=1, per=0.1)
+        channel = FakeChannel()
+
+        async def scenario():
+            first = await dispatcher.submit(1, channel.send, "hello")
+            return first, await asyncio.gather(*(dispatcher.submit(1, channel.send, f"line {i}") for i in range(3)))
+
+        first, rest = asyncio.run(scenario())
+        self.assertEqual(first, 1)
+        self.assertEqual(rest, [2, 2, 2])
+        self.assertEqual(channel.sent[1], ("line 0\nline 1\nline 2", {}))
+        self.assertEqual(dispatcher.stats()["merged"], 2)
+
+    def test_interactive_replies_overtake_background_messages(self):
+        dispatcher = OutboundDispatcher(rate=1, per=0.05)
+        channel = FakeChannel()
+
+        async def scenario():
+            await dispatcher.submit(1, channel.send, "warm up")
+            background = asyncio.ensure_future(dispatcher.submit(1, channel.send, embed="news", priority=BACKGROUND))
+            await asyncio.sleep(0)
+            reply = asyncio.ensure_future(dispatcher.submit(1, channel.send, embed="reply"))
+            await asyncio.gather(background, reply)
+
+        asyncio.run(scenario())
+        self.assertEqual([kwargs["embed"] for _, kwargs in channel.sent[1:]], ["reply", "news"])
+
+    def test_reported_429s_are_counted_and_pause_the_channel(self):
+        dispatcher = OutboundDispatcher()
+        observer = RateLimitObserver(dispatcher)
+        record = logging.LogRecord("discord.http", logging.WARNING, __file__, 1,
+                                   "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.",
+                                   ("POST", "https://discord.com/api/v10/channels/123456789012345678/messages", 2.5), None)
+        self.assertTrue(observer.filter(record))
+        self.assertEqual(dict(dispatcher.rate_limits), {"POST /channels/{id}/messages": 1})
+        self.assertGreater(dispatcher.channels[123456789012345678].blocked_until, 0)
+        self.assertEqual(dispatcher.prune(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from framework.persistence import WriteBehindWriter
+
+
+class _RecordingSink:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def write_many(self, items):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise IOError("disk full")
+        self.batches.append(dict(items))
+
+
+class TestWriteBehindWriter(unittest.TestCase):
+    def test_saves_within_window_coalesce_into_one_batch(self):
+        sink = _RecordingSink()
+
+        async def scenario():
+            writer = WriteBehindWriter(sink, window=0.01)
+            config = {"enabled": True}
+            writer.enqueue("a", config)
+            config["enabled"] = False
+            writer.enqueue("a", config)
+            writer.enqueue("b", {"x": 1})
+            self.assertEqual(writer.queue_depth, 2)
+            await asyncio.sleep(0.05)
+            await writer.close()
+            return writer
+
+        writer = asyncio.run(scenario())
+        self.assertEqual(sink.batches, [{"a": {"enabled": False}, "b": {"x": 1}}])
+        self.assertEqual((writer.coalesced, writer.queue_depth), (1, 0))
+
+    def test_failed_flush_is_retried_and_close_drains(self):
+        sink = _RecordingSink(fail_times=1)
+
+        async def scenario():
+            writer = WriteBehindWriter(sink, window=60)
+            writer.enqueue("a", {"v": 1})
+            self.assertEqual(await writer.flush(), 0)
+            self.assertEqual(writer.queue_depth, 1)
+            await writer.close()
+            return writer
+
+        writer = asyncio.run(scenario())
+        self.assertEqual(sink.batches, [{"a": {"v": 1}}])
+        self.assertEqual(writer.failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from framework.config_store import ConfigStore
+from framework.manifest import ExtensionManifest
+from framework.persistence import WriteBehindWriter
+from framework.router import CommandRouter, PrefixCache
+
+
+def _entry(module, name, aliases):
+    return {"module": module, "category": module.split(".")[1], "is_extension": True,
+            "commands": [{"name": name, "aliases": aliases, "cooldown": None, "guild_only": True}]}
+
+
+class TestCommandRouter(unittest.TestCase):
+    def setUp(self):
+        manifest = ExtensionManifest("/nonexistent")
+        manifest.entries = {
+            "a": _entry("Modules.Moderation.x.m.handler_A_0", "handlera0", ["h"]),
+            "b": _entry("Modules.Utilities.x.m.handler_B_0", "handlerb0", ["h", "hb"]),
+            "c": _entry("Modules.Utilities.y.m.handler_A_0", "handlera0", ["h"]),
+        }
+        self.router = CommandRouter(manifest)
+        self.router.build_index()
+
+    def test_shared_alias_is_dropped_everywhere(self):
+        name, aliases = self.router.plan("Modules.Utilities.x.m.handler_B_0", "handlerb0", ["h", "hb"])
+        self.assertEqual(name, "handlerb0")
+        self.assertEqual(aliases, ["util.handlerb0", "hb"])
+
+    def test_duplicate_name_is_namespaced_per_category(self):
+        first = self.router.plan("Modules.Moderation.x.m.handler_A_0", "handlera0", ["h"])
+        second = self.router.plan("Modules.Utilities.y.m.handler_A_0", "handlera0", ["h"])
+        self.assertEqual(first, ("mod.handlera0", []))
+        self.assertEqual(second, ("util.handlera0", []))
+        kinds = {(kind, token) for kind, token, _, _ in self.router.conflicts}
+        self.assertEqual(kinds, {("name", "handlera0"), ("alias", "h")})
+
+    def test_live_commands_take_precedence(self):
+        name, _ = self.router.plan("Modules.Utilities.x.m.handler_B_0", "handlerb0", [], taken={"handlerb0"})
+        self.assertEqual(name, "util.handlerb0")
+
+
+
+class TestPrefixCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "config_store.sqlite3")
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self._tmp.cleanup()
+
+    def _worker(self):
+        """One cluster worker's view: its own store connection and prefix cache."""
+        store = ConfigStore(self.path)
+        store.load()
+        self.stores.append(store)
+        cache = PrefixCache("!", store)
+        cache.load()
+        return cache
+
+    def test_workers_see_each_others_prefixes_after_sync(self):
+        first, second = self._worker(), self._worker()
+        first.set(1, "?")
+        second.set(2, "$")
+        self.assertEqual((second.get(1), second.get(2)), ("!", "$"))
+        self.assertEqual(asyncio.run(second.sync()), 1)
+        self.assertEqual(asyncio.run(first.sync()), 1)
+        self.assertEqual([(cache.get(1), cache.get(2)) for cache in (first, second)], [("?", "$")] * 2)
+
+        first.set(1, "!")  # Back to the default.
+        asyncio.run(second.sync())
+        self.assertEqual(second.get(1), "!")
+        self.assertEqual(self._worker().get(2), "$")
+
+    def test_queued_local_save_is_not_replaced_by_an_older_row(self):
+        other = self._worker()
+        cache = self._worker()
+        other.set(1, "?")
+
+        async def scenario():
+            writer = WriteBehindWriter(cache.store, window=60)
+            cache.store.attach_writer(writer)
+            cache.set(1, "$")
+            await cache.sync()
+            prefix = cache.get(1)
+            await writer.close()
+            return prefix
+
+        self.assertEqual(asyncio.run(scenario()), "$")
+        self.assertEqual(self._worker().get(1), "$")
+
+    def test_legacy_file_is_migrated_once(self):
+        legacy = os.path.join(self._tmp.name, "guild_prefixes.json")
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({"1": "?", "2": "$"}, f)
+        cache = self._worker()
+        cache.set(2, "%")
+        self.assertEqual(cache.import_legacy_file(legacy), 1)
+        cache.load()
+        self.assertEqual((cache.get(1), cache.get(2), cache.get(3)), ("?", "%", "!"))
+
+
+if __name__ == '__main__':
+    unittest.main()
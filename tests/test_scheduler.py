@@ -0,0 +1,174 @@
+import asyncio
+import importlib.util
+import types
+import unittest
+import zlib
+
+from framework.scheduler import CentralScheduler, ScheduledJobHandle, ScheduledLoop
+
+
+class FakeLoop:
+    """The parts of `tasks.Loop` the scheduler reads."""
+    def __init__(self, coro, seconds: float):
+        self.coro = coro
+        self.seconds = seconds
+        self.minutes = self.hours = 0
+        self._before_loop = None
+
+
+def first_run_tick(scheduler: CentralScheduler, job) -> int:
+    tick = 0
+    while True:
+        tick += 1
+        if job in scheduler._wheel.advance():
+            return tick
+
+
+class TestCentralScheduler(unittest.TestCase):
+    def test_phase_is_spread_by_crc32_and_stable(self):
+        names = [f"Modules.Core.handler_{index}.Cog.periodic_update_task" for index in range(20)]
+        ticks = []
+        for name in names:
+            scheduler = CentralScheduler(tick_seconds=1.0)
+            job = scheduler.register(name, 60, lambda: None)
+            tick = first_run_tick(scheduler, job)
+            self.assertEqual(tick, zlib.crc32(name.encode()) % 60 + 1)
+            ticks.append(tick)
+        again = CentralScheduler(tick_seconds=1.0)
+        self.assertEqual(first_run_tick(again, again.register(names[0], 60, lambda: None)), ticks[0])
+        self.assertGreater(len(set(ticks)), 10)
+        self.assertTrue(all(1 <= tick <= 60 for tick in ticks))
+
+    def test_max_concurrency_caps_running_jobs(self):
+        scheduler = CentralScheduler(tick_seconds=0.01, max_concurrency=2)
+        running, peak = [0], [0]
+
+        async def job():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.05)
+            running[0] -= 1
+
+        async def scenario():
+            for index in range(6):
+                scheduler.register(f"job{index}", 0.01, job)
+            scheduler.start()
+            await asyncio.sleep(0.3)
+            scheduler.stop()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(scenario())
+        self.assertEqual(peak[0], 2)
+        self.assertGreater(sum(job.stats.runs for job in scheduler.jobs.values()), 6)
+
+    def test_overrunning_job_never_overlaps_and_is_counted(self):
+        scheduler = CentralScheduler(tick_seconds=0.01)
+        running, overlapped = [0], [False]
+
+        async def slow():
+            running[0] += 1
+            overlapped[0] |= running[0] > 1
+            await asyncio.sleep(0.05)
+            running[0] -= 1
+
+        async def scenario():
+            job = scheduler.register("slow", 0.02, slow)
+            scheduler.start()
+            await asyncio.sleep(0.3)
+            scheduler.stop()
+            await asyncio.sleep(0.1)
+            return job
+
+        job = asyncio.run(scenario())
+        self.assertFalse(overlapped[0])
+        self.assertGreaterEqual(job.stats.runs, 2)
+        self.assertEqual(job.stats.overruns, job.stats.runs)
+        self.assertGreater(job.stats.skipped, 0)
+        self.assertIn("overruns=", scheduler.format_stats())
+
+    def test_run_coarsely_joins_the_run_in_flight(self):
+        scheduler = CentralScheduler(refresh_min_interval=60)
+        calls = []
+
+        async def periodic_update_task(cog):
+            calls.append(cog)
+            await asyncio.sleep(0.02)
+            return len(calls)
+
+        cog = object()
+        handle = ScheduledJobHandle(scheduler, FakeLoop(periodic_update_task, 30), cog, "cog.periodic_update_task")
+
+        async def scenario():
+            burst = await asyncio.gather(*(handle.run_coarsely() for _ in range(5)))
+            return burst, await handle.run_coarsely()
+
+        burst, later = asyncio.run(scenario())
+        self.assertEqual(calls, [cog])
+        self.assertEqual((burst, later), ([1] * 5, 1))
+        self.assertEqual(scheduler.single_flight.stats()["shared"], 4)
+        self.assertEqual(scheduler.single_flight.stats()["suppressed"], 1)
+
+    def test_descriptor_handle_starts_and_cancels_a_job(self):
+        scheduler = CentralScheduler()
+
+        async def periodic_update_task(cog):
+            pass
+
+        cog_class = type("HandlerA0Cog", (), {"periodic_update_task": ScheduledLoop(
+            scheduler, FakeLoop(periodic_update_task, 455), "periodic_update_task")})
+        cog = cog_class()
+        job = cog.periodic_update_task.start()
+        self.assertIs(cog.periodic_update_task, cog.__dict__["periodic_update_task"])
+        self.assertEqual(job.interval, 455)
+        with self.assertRaises(RuntimeError):
+            cog.periodic_update_task.start()
+        cog_class.periodic_update_task.cancel_for(cog)
+        self.assertFalse(job.active)
+        self.assertEqual(scheduler.jobs, {})
+
+
+@unittest.skipUnless(importlib.util.find_spec("discord"), "discord.py is not installed")
+class TestExtensionUnload(unittest.TestCase):
+    def test_unloading_the_extension_stops_its_jobs(self):
+        import discord
+        from discord.ext import commands, tasks
+
+        from framework.loader import activate_extension, deactivate_extension
+        from framework.scheduler import adopt_module
+
+        name = "tests.fake_extension_handler_A_0"
+        lib = types.ModuleType(name)
+
+        class HandlerA0Cog(commands.Cog):
+            def __init__(self, bot):
+                self.bot = bot
+                self.periodic_update_task.start()
+
+            @tasks.loop(seconds=455)
+            async def periodic_update_task(self):
+                pass
+
+        HandlerA0Cog.__module__ = name
+
+        async def setup(bot):
+            await bot.add_cog(HandlerA0Cog(bot))
+
+        lib.HandlerA0Cog, lib.setup = HandlerA0Cog, setup
+        scheduler = CentralScheduler()
+        adopt_module(lib, scheduler)
+
+        async def scenario():
+            bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+            await activate_extension(bot, name, lib)
+            job = scheduler.jobs[f"{name}.HandlerA0Cog.periodic_update_task"]
+            await deactivate_extension(bot, name)
+            return bot, job
+
+        bot, job = asyncio.run(scenario())
+        self.assertFalse(job.active)
+        self.assertEqual(scheduler.jobs, {})
+        self.assertNotIn(name, bot.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from framework.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def scenario():
+            return await asyncio.gather(*(flight.do("cog", refresh) for _ in range(10)))
+
+        self.assertEqual(asyncio.run(scenario()), [1] * 10)
+        self.assertEqual(flight.executions, 1)
+        self.assertEqual(flight.shared, 9)
+
+    def test_min_interval_reuses_recent_result_and_errors_are_not_cached(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("upstream down")
+            return len(calls)
+
+        async def scenario():
+            with self.assertRaises(ConnectionError):
+                await flight.do("cog", refresh, min_interval=60)
+            first = await flight.do("cog", refresh, min_interval=60)
+            second = await flight.do("cog", refresh, min_interval=60)
+            third = await flight.do("cog", refresh)
+            return first, second, third
+
+        self.assertEqual(asyncio.run(scenario()), (2, 2, 3))
+        self.assertEqual(flight.suppressed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+import unittest
+
+from framework.cache import BoundedCache
+from framework.snapshot import MAGIC, SnapshotStore, collect_state
+
+
+class FakeCog:
+    def __init__(self, cache):
+        self._cache = cache
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "data", "snap.bin")
+        self.manifest = {FakeCog.__module__: {"hash": "abc"}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_restores_without_overwriting(self):
+        cache = BoundedCache(max_entries=10)
+        cache["status"] = {"ok": True}
+        cache["handle"] = object()  # Not serialisable; skipped.
+        entries = collect_state({"cog:x": FakeCog(cache)}, "_cache", self.manifest)
+        SnapshotStore(self.path).save(entries)
+
+        store = SnapshotStore(self.path)
+        self.assertEqual(store.load(), 1)
+        fresh = {"status": "newer"}
+        self.assertTrue(store.restore_into(fresh, "cog:x", "abc"))
+        self.assertEqual(fresh, {"status": "newer"})
+        self.assertEqual(store.restored, 1)
+        self.assertEqual(len(store), 0)
+
+    def test_changed_module_is_discarded(self):
+        SnapshotStore(self.path).save({"cog:x": {"hash": "abc", "state": {"k": 1}}})
+        store = SnapshotStore(self.path)
+        store.load()
+        target = {}
+        self.assertFalse(store.restore_into(target, "cog:x", "def"))
+        self.assertEqual(target, {})
+        self.assertEqual(store.discarded, 1)
+
+    def test_stale_and_foreign_files_are_ignored(self):
+        SnapshotStore(self.path).save({"cog:x": {"hash": "abc", "state": {"k": 1}}})
+        with open(self.path, "r+b") as f:
+            f.write(struct.pack("<8sHd", MAGIC, 1, time.time() - 3600))
+        self.assertEqual(SnapshotStore(self.path, max_age=900).load(), 0)
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all")
+        self.assertEqual(SnapshotStore(self.path).load(), 0)
+        self.assertEqual(SnapshotStore(os.path.join(self.tmp.name, "missing.bin")).load(), 0)
+
+    def test_concurrent_saves_do_not_share_a_temp_file(self):
+        errors = []
+
+        def save_repeatedly(worker):
+            try:
+                for _ in range(50):
+                    SnapshotStore(self.path).save({"cog:x": {"hash": "abc", "state": {"worker": worker}}})
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save_repeatedly, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["snap.bin"])
+        self.assertEqual(SnapshotStore(self.path).load(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import importlib.util
+import types
+import unittest
+
+
+class FakeManifest:
+    def __init__(self, categories):
+        self.entries = {f"Modules.{category}.handler_{index}": {"category": category}
+                        for index, category in enumerate(categories)}
+
+    def category_of(self, module_name):
+        parts = module_name.split(".")
+        return parts[1] if len(parts) > 1 and parts[0] == "Modules" else None
+
+
+@unittest.skipUnless(importlib.util.find_spec("discord"), "discord.py is not installed")
+class TestStartupPipeline(unittest.TestCase):
+    def test_core_first_then_warmers_and_optional_categories(self):
+        from framework.startup import StartupPipeline
+
+        calls = []
+
+        async def load_categories(categories):
+            calls.append(sorted(categories))
+
+        async def warmer():
+            calls.append("warm")
+
+        pipeline = StartupPipeline(None, FakeManifest(["Core", "Games", "Music", "Admin"]), load_categories,
+                                   core_categories=["Core", "Admin"], enabled_categories=["Core", "Admin", "Games"])
+        pipeline.add_warmer(warmer)
+
+        async def scenario():
+            await pipeline.start()
+            after_start = (list(calls), pipeline.is_category_ready("Core"), pipeline.fully_loaded.is_set())
+            await pipeline.start()  # Re-entry from a reconnect is a no-op.
+            await asyncio.wait_for(pipeline.fully_loaded.wait(), 1)
+            return after_start
+
+        after_start = asyncio.run(scenario())
+        self.assertEqual(after_start, ([["Admin", "Core"]], True, False))
+        self.assertEqual(calls, [["Admin", "Core"], "warm", ["Games"]])
+        self.assertTrue(pipeline.is_category_ready("Games"))
+        self.assertFalse(pipeline.is_category_ready("Music"))
+
+    def test_failed_background_category_does_not_block_core(self):
+        from framework.startup import StartupPipeline
+
+        release = None
+        loaded = []
+
+        async def load_categories(categories):
+            if categories == {"Games"}:
+                await release.wait()
+                raise RuntimeError("Games failed to load")
+            loaded.append(sorted(categories))
+
+        async def broken_warmer():
+            raise ValueError("cold cache")
+
+        pipeline = StartupPipeline(None, FakeManifest(["Core", "Games", "Music"]), load_categories,
+                                   core_categories=["Core"], optional_categories=["Games", "Music"])
+        pipeline.add_warmer(broken_warmer)
+
+        def ctx(category):
+            cog = type("HandlerCog", (), {"__module__": f"Modules.{category}.handler_0"})()
+            return types.SimpleNamespace(cog=cog, command=None)
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            await pipeline.start()
+            await asyncio.sleep(0.01)
+            core_open = pipeline.command_ready(ctx("Core"))
+            games_open = pipeline.command_ready(ctx("Games"))
+            fully_loaded_early = pipeline.fully_loaded.is_set()
+            release.set()
+            await asyncio.wait_for(pipeline.fully_loaded.wait(), 1)
+            return core_open, games_open, fully_loaded_early
+
+        core_open, games_open, fully_loaded_early = asyncio.run(scenario())
+        self.assertEqual((core_open, games_open), (True, False))
+        self.assertFalse(fully_loaded_early)
+        self.assertEqual(loaded, [["Core"], ["Music"]])
+        # A failed category is still routed; its extensions simply have no commands.
+        self.assertTrue(pipeline.is_category_ready("Games"))
+        self.assertTrue(pipeline.fully_loaded.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from framework.timing_wheel import TimingWheel
+
+
+class TestTimingWheel(unittest.TestCase):
+    def test_items_expire_exactly_at_their_deadline(self):
+        wheel = TimingWheel(slots=8, levels=3)
+        rng = random.Random(7)
+        expected = {}
+        for item in range(500):
+            # Spans every level, including delays beyond the wheel's range.
+            expected[item] = wheel.schedule(item, rng.randint(1, 700))
+        seen = {}
+        while len(wheel):
+            for item in wheel.advance():
+                seen[item] = wheel.current_tick
+        self.assertEqual(seen, expected)
+
+    def test_schedule_during_advance_keeps_fixed_rate(self):
+        wheel = TimingWheel(slots=4, levels=2)
+        wheel.schedule("job", 3)
+        fired = []
+        for _ in range(30):
+            for item in wheel.advance():
+                fired.append(wheel.current_tick)
+                wheel.schedule(item, 10)
+        self.assertEqual(fired, [3, 13, 23])
+        self.assertEqual(len(wheel), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from framework.eventbus import EventBus
+from framework.tracing import NULL_SCOPE, Tracer, tracer as default_tracer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1_000_000  # 1ms per reading
+        return self.now
+
+
+class TestTracer(unittest.TestCase):
+    def test_head_and_tail_sampling(self):
+        tracer = Tracer(sample_rate=0.0, slow_threshold=0.0035, clock=FakeClock())
+        with tracer.trace("fast"):
+            pass
+        with tracer.trace("slow"):
+            with tracer.span("command x") as span:
+                with tracer.span("component y"):
+                    pass
+        self.assertEqual([trace.name for trace in tracer.traces], ["slow"])
+        slow = tracer.traces[0]
+        self.assertEqual([s.name for s in slow.spans], ["slow", "command x", "component y"])
+        self.assertEqual(slow.spans[2].parent_id, span.span_id)
+        self.assertEqual((tracer.started, tracer.kept_sampled, tracer.kept_slow), (2, 0, 1))
+
+        tracer.sample_rate = 1.0
+        with tracer.trace("sampled"):
+            pass
+        with tracer.trace("not a command"):
+            tracer.drop()
+            self.assertIs(tracer.span("ignored"), NULL_SCOPE)
+        self.assertEqual([trace.name for trace in tracer.traces], ["slow", "sampled"])
+
+    def test_spans_are_no_ops_outside_a_trace_and_follow_tasks(self):
+        tracer = Tracer(sample_rate=1.0)
+        self.assertIs(tracer.span("orphan"), NULL_SCOPE)
+
+        async def child():
+            with tracer.span("in task"):
+                await asyncio.sleep(0)
+
+        async def scenario():
+            with tracer.trace("root"):
+                await asyncio.gather(child(), child())
+
+        asyncio.run(scenario())
+        self.assertEqual(len(tracer.traces[0].spans), 3)
+
+    def test_bus_deliveries_continue_the_publishers_trace(self):
+        default_tracer.configure(enabled=True, sample_rate=1.0)
+        self.addCleanup(default_tracer.configure, enabled=False, sample_rate=0.01)
+        bus = EventBus()
+
+        async def handler(payload):
+            with default_tracer.span("component handler"):
+                pass
+
+        async def scenario():
+            bus.subscribe("cog.x", handler, subscriber="component")
+            with default_tracer.trace("root"):
+                bus.publish_nowait("cog.x", 1)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        names = [span.name for span in default_tracer.traces[-1].spans]
+        self.assertEqual(names, ["root", "bus.deliver cog.x", "component handler"])
+
+    def test_chrome_trace_export(self):
+        tracer = Tracer(sample_rate=1.0, clock=FakeClock())
+        with tracer.trace("gateway.message", guild=1):
+            with tracer.span("command roll"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces.json")
+            self.assertEqual(tracer.export(path), 1)
+            with open(path, encoding='utf-8') as f:
+                events = json.load(f)["traceEvents"]
+        complete = [event for event in events if event["ph"] == "X"]
+        self.assertEqual([event["name"] for event in complete], ["gateway.message", "command roll"])
+        self.assertEqual(complete[1]["dur"], 1000.0)
+        self.assertEqual(complete[0]["args"]["guild"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import asyncio
+import time
+import unittest
+
+from framework.watchdog import LoopWatchdog
+
+
+def _blocking_helper():
+    time.sleep(0.3)
+
+
+class TestLoopWatchdog(unittest.TestCase):
+    def test_stall_is_captured_and_attributed(self):
+        watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+
+        async def scenario():
+            watchdog.start(asyncio.get_running_loop())
+            await asyncio.sleep(0.05)
+            _blocking_helper()
+            await asyncio.sleep(0.05)
+            watchdog.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual(len(watchdog.stalls), 1)
+        stall = watchdog.stalls[0]
+        self.assertEqual(stall.module, "tests.test_watchdog")
+        self.assertIn("_blocking_helper", stall.location)
+        self.assertGreater(stall.duration, 0.1)
+        self.assertGreaterEqual(watchdog.max_lag, 0.25)
+        self.assertIn("tests.test_watchdog", watchdog.format_report())
+
+
+if __name__ == '__main__':
+    unittest.main()